@@ -0,0 +1,210 @@
+"""Fit ARIMA forecasts in a bounded pool of worker processes with per-item timeouts."""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import pickle
+import time
+from dataclasses import dataclass
+from multiprocessing.connection import Connection, wait
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+ARIMA_TRAIN_DAYS = 730  # auto_arima on long daily histories is slow; recent years carry the signal
+ARIMA_REFIT_DAYS = 30  # Refit from scratch once this many days were appended incrementally
+ARIMA_TIMEOUT_SECONDS = 120
+ARIMA_MAX_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+ARIMA_MODEL_FILE = "arima.pkl"
+
+
+@dataclass
+class ArimaFit:
+    forecast: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    metric: float | None
+    order: Tuple[int, int, int]
+    refreshed: bool  # True when a cached model was updated instead of refit
+
+
+def fit_arima(
+    series_df: pd.DataFrame,
+    cache_path: Path,
+    *,
+    horizon: int,
+    holdout_days: int,
+) -> ArimaFit:
+    """Forecast ``series_df`` (``ds``/``y`` columns) with a cached, warm-started ARIMA.
+
+    A model persisted at ``cache_path`` is updated with the days appended since it
+    was saved. It is refit from scratch when it is missing, older than
+    ``ARIMA_REFIT_DAYS`` of updates, or the history it was fit on was revised.
+    """
+    import pmdarima as pm
+
+    series = series_df.set_index("ds")["y"].astype(float).dropna()
+    if series.empty:
+        raise ValueError("Series has no observations to fit.")
+
+    cached = _load_cached_model(cache_path)
+    model = None
+    metric = None
+    refit_date = None
+    refreshed = False
+
+    if cached is not None and _can_refresh(cached, series):
+        new_values = series.loc[series.index > cached["last_date"]]
+        model = cached["model"]
+        if len(new_values):
+            model.update(new_values.to_numpy())
+        metric = cached["metric"]
+        refit_date = cached["refit_date"]
+        refreshed = True
+
+    if model is None:
+        train = series.iloc[-ARIMA_TRAIN_DAYS:].to_numpy()
+        if len(train) > holdout_days + 30:
+            # Score on the holdout first, then fold the holdout in without a second search
+            model = pm.auto_arima(
+                train[:-holdout_days], seasonal=False, suppress_warnings=True, error_action="ignore"
+            )
+            predictions = model.predict(n_periods=holdout_days)
+            actuals = train[-holdout_days:]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                mape = np.abs((actuals - predictions) / np.where(actuals != 0, actuals, np.nan))
+            if not np.isnan(mape).all():
+                metric = float(np.nanmean(mape) * 100)
+            model.update(actuals)
+        else:
+            model = pm.auto_arima(train, seasonal=False, suppress_warnings=True, error_action="ignore")
+        refit_date = series.index[-1]
+
+    forecast, conf_int = model.predict(n_periods=horizon, return_conf_int=True, alpha=0.05)
+    _save_cached_model(
+        cache_path,
+        {
+            "model": model,
+            "last_date": series.index[-1],
+            "last_value": float(series.iloc[-1]),
+            "refit_date": refit_date,
+            "metric": metric,
+        },
+    )
+    return ArimaFit(
+        forecast=np.asarray(forecast, dtype=float),
+        lower=np.asarray(conf_int[:, 0], dtype=float),
+        upper=np.asarray(conf_int[:, 1], dtype=float),
+        metric=metric,
+        order=tuple(int(part) for part in model.order),
+        refreshed=refreshed,
+    )
+
+
+def _can_refresh(cached: dict, series: pd.Series) -> bool:
+    last_date = cached["last_date"]
+    if last_date not in series.index or last_date > series.index[-1]:
+        return False
+    if (series.index[-1] - cached["refit_date"]).days > ARIMA_REFIT_DAYS:
+        return False
+    # Imputation may revise history; only warm-start when the seam still matches
+    return bool(np.isclose(series.loc[last_date], cached["last_value"]))
+
+
+def _load_cached_model(path: Path) -> Optional[dict]:
+    if not path.exists():
+        return None
+    try:
+        with path.open("rb") as stream:
+            return pickle.load(stream)
+    except Exception:
+        return None  # Corrupt or incompatible cache; refit
+
+
+def _save_cached_model(path: Path, payload: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with tmp_path.open("wb") as stream:
+        pickle.dump(payload, stream, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def _pool_worker(conn: Connection, func: Callable, args: tuple, kwargs: dict) -> None:
+    try:
+        outcome = (True, func(*args, **kwargs))
+    except Exception as exc:  # Reported to the parent, which falls back
+        outcome = (False, repr(exc))
+    try:
+        conn.send(outcome)
+    except Exception as exc:  # e.g. an unpicklable result; pickling fails before anything is sent
+        conn.send((False, repr(exc)))
+    finally:
+        conn.close()
+
+
+def run_bounded(
+    jobs: Iterable[Tuple[str, Callable, tuple, dict]],
+    *,
+    max_workers: int = ARIMA_MAX_WORKERS,
+    timeout: float = ARIMA_TIMEOUT_SECONDS,
+) -> Iterator[Tuple[str, object | None, str | None]]:
+    """Run ``(key, func, args, kwargs)`` jobs with at most ``max_workers`` processes.
+
+    Yields ``(key, result, error)`` in completion order. Each job runs in its own
+    process with its own pipe, so a fit that exceeds ``timeout`` seconds can be
+    killed without affecting the others; timed out or failed jobs yield ``None``
+    with the reason in ``error``. A result already sent is never timed out.
+    """
+    context = multiprocessing.get_context()
+    pending = list(jobs)[::-1]
+    running: Dict[str, Tuple[multiprocessing.Process, Connection, float]] = {}
+
+    def collect(key: str) -> Tuple[str, object | None, str | None]:
+        process, conn, _ = running.pop(key)
+        try:
+            ok, value = conn.recv()
+        except (EOFError, OSError):  # died without reporting
+            ok, value = False, None
+        finally:
+            conn.close()
+        process.join()
+        if ok:
+            return key, value, None
+        return key, None, str(value) if value is not None else f"worker exited with code {process.exitcode}"
+
+    try:
+        while pending or running:
+            while pending and len(running) < max_workers:
+                key, func, args, kwargs = pending.pop()
+                receiver, sender = context.Pipe(duplex=False)
+                process = context.Process(target=_pool_worker, args=(sender, func, args, kwargs), daemon=True)
+                process.start()
+                sender.close()  # the worker holds the only write end, so its exit reads as EOF
+                running[key] = (process, receiver, time.monotonic())
+
+            next_deadline = min(started for _, _, started in running.values()) + timeout
+            ready = wait(
+                [conn for _, conn, _ in running.values()], timeout=max(0.0, next_deadline - time.monotonic())
+            )
+            for key in [key for key, (_, conn, _) in running.items() if conn in ready]:
+                yield collect(key)
+
+            now = time.monotonic()
+            for key, (process, conn, started) in list(running.items()):
+                if now - started > timeout and not conn.poll():
+                    process.kill()
+                    process.join()
+                    conn.close()
+                    running.pop(key)
+                    yield key, None, f"timed out after {timeout:g}s"
+    finally:
+        for process, conn, _ in running.values():
+            process.kill()
+            conn.close()
+
+
+__all__ = ["ArimaFit", "fit_arima", "run_bounded"]
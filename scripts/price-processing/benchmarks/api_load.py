@@ -0,0 +1,201 @@
+"""
+Load-test the price API and report requests per second.
+
+Without ``--url`` a synthetic CLEAN_ROOT/FORECAST_ROOT tree is written to a
+temporary directory and served in-process on a free port. Each client thread
+cycles through item history, date-range, latest and forecast requests; with
+``--etag`` the clients revalidate with ``If-None-Match`` so most answers are
+``304``s.
+
+Usage
+-----
+    python -m src.price_manager.benchmarks.api_load
+
+Options
+-------
+    --url URL          Test a running API instead of a synthetic one.
+    --items N          Synthetic items. Defaults to 200.
+    --years Y          Synthetic years of daily history per item. Defaults to 5.
+    --clients C        Concurrent client threads. Defaults to 8.
+    --seconds S        Duration of the run. Defaults to 10.
+    --etag             Send If-None-Match with the last ETag seen per URL.
+    --output PATH      Also write the results as JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def write_synthetic_tree(root: Path, *, items: int, years: int, seed: int = 0) -> tuple[Path, Path]:
+    """Write cleaned yearly CSVs and forecast CSVs shaped like the pipeline's."""
+
+    rng = np.random.default_rng(seed)
+    clean_root, forecast_root = root / "cleaned", root / "forecast"
+    last_year = pd.Timestamp.today().year
+    for idx in range(items):
+        name = f"Item {idx:04d}"
+        for year in range(last_year - years + 1, last_year + 1):
+            dates = pd.date_range(f"{year}-01-01", f"{year}-12-31", freq="D")
+            (clean_root / name).mkdir(parents=True, exist_ok=True)
+            pd.DataFrame(
+                {"date": dates.strftime("%Y-%m-%d"), "price": rng.uniform(20, 400, len(dates)).round(2)}
+            ).to_csv(clean_root / name / f"{year}.csv", index=False)
+        dates = pd.date_range(pd.Timestamp.today().normalize(), periods=90, freq="D")
+        forecast = rng.uniform(20, 400, len(dates)).round(2)
+        (forecast_root / name).mkdir(parents=True, exist_ok=True)
+        pd.DataFrame(
+            {"date": dates.strftime("%Y-%m-%d"), "forecast": forecast, "lower": forecast * 0.9, "upper": forecast * 1.1}
+        ).to_csv(forecast_root / name / "forecast.csv", index=False)
+    return clean_root, forecast_root
+
+
+def _request_paths(names: List[str]) -> List[str]:
+    year = pd.Timestamp.today().year
+    paths = []
+    for name in names:
+        quoted = urllib.request.quote(name)
+        paths += [
+            f"/items/{quoted}/prices",
+            f"/items/{quoted}/prices?start={year}-01-01&end={year}-03-31",
+            f"/items/{quoted}/latest",
+            f"/items/{quoted}/forecast",
+        ]
+    return paths
+
+
+def _client(
+    base_url: str,
+    paths: List[str],
+    offset: int,
+    deadline: float,
+    use_etag: bool,
+    latencies: list,
+    statuses: Dict[int, int],
+    lock: threading.Lock,
+) -> None:
+    etags: Dict[str, str] = {}
+    local_latencies, local_statuses = [], {}
+    position = offset
+    while time.perf_counter() < deadline:
+        path = paths[position % len(paths)]
+        position += 1
+        request = urllib.request.Request(base_url + path)
+        if use_etag and path in etags:
+            request.add_header("If-None-Match", etags[path])
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(request) as response:
+                response.read()
+                status = response.status
+                etag = response.headers.get("ETag")
+        except urllib.error.HTTPError as exc:
+            status, etag = exc.code, exc.headers.get("ETag")
+        local_latencies.append(time.perf_counter() - start)
+        local_statuses[status] = local_statuses.get(status, 0) + 1
+        if etag:
+            etags[path] = etag
+    with lock:
+        latencies.extend(local_latencies)
+        for status, count in local_statuses.items():
+            statuses[status] = statuses.get(status, 0) + count
+
+
+def run(base_url: str, *, clients: int = 8, seconds: float = 10.0, use_etag: bool = False) -> dict:
+    with urllib.request.urlopen(base_url + "/items") as response:
+        names = [entry["name"] for entry in json.loads(response.read())["items"]]
+    if not names:
+        raise SystemExit("The API serves no items.")
+    paths = _request_paths(names)
+
+    latencies: list = []
+    statuses: Dict[int, int] = {}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+    threads = [
+        threading.Thread(
+            target=_client,
+            args=(base_url, paths, idx * len(paths) // clients, deadline, use_etag, latencies, statuses, lock),
+        )
+        for idx in range(clients)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "requests_per_second": len(latencies) / elapsed if elapsed else None,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else None,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else None,
+        "statuses": statuses,
+        "clients": clients,
+        "etag": use_etag,
+    }
+
+
+def _serve_synthetic(tmp: Path, items: int, years: int) -> tuple[str, object]:
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    from ..price_api import create_app
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs) -> None:  # one line per request would swamp the report
+            pass
+
+    clean_root, forecast_root = write_synthetic_tree(tmp, items=items, years=years)
+    app = create_app(clean_root, forecast_root, marker=tmp / "VERSION")
+    server = make_server("127.0.0.1", 0, app, threaded=True, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}", server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Base URL of a running API.")
+    parser.add_argument("--items", type=int, default=200, help="Synthetic items.")
+    parser.add_argument("--years", type=int, default=5, help="Synthetic years of history per item.")
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent client threads.")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Duration of the run.")
+    parser.add_argument("--etag", action="store_true", help="Revalidate with If-None-Match.")
+    parser.add_argument("--output", type=Path, help="Optional JSON output path.")
+    args = parser.parse_args()
+
+    server: Optional[object] = None
+    with tempfile.TemporaryDirectory() as tmp:
+        base_url = args.url
+        if base_url is None:
+            base_url, server = _serve_synthetic(Path(tmp), args.items, args.years)
+        try:
+            result = run(base_url.rstrip("/"), clients=args.clients, seconds=args.seconds, use_etag=args.etag)
+        finally:
+            if server is not None:
+                server.shutdown()
+
+    print(
+        f"{result['requests']} requests in {result['seconds']:.1f}s: {result['requests_per_second']:.0f} req/s, "
+        f"p50 {result['p50_ms']:.1f} ms, p95 {result['p95_ms']:.1f} ms, statuses {result['statuses']}"
+    )
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Time the ``current_prices.json`` payload build on synthetic daily observations.
+
+Compares the columnar ``_build_payload`` against the previous per-row
+``groupby`` + ``iterrows`` construction, kept here as the reference.
+
+Usage
+-----
+    python -m src.price_manager.benchmarks.current_prices
+
+Options
+-------
+    --items N [N ...]  Item counts to measure. Defaults to 1000 5000.
+    --days D           Days of observations per item. Defaults to 30.
+    --repeat R         Timed repetitions per measurement. Defaults to 3.
+    --output PATH      Also write the results as JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from ..export_current_prices import DAYS_TO_SHOW, _build_payload
+from .load_prices import _median_seconds
+
+
+def synthetic_observations(items: int, days: int, *, seed: int = 0) -> pd.DataFrame:
+    """One price per item and day, ending today."""
+
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(end=pd.Timestamp.today().normalize(), periods=days, freq="D")
+    return pd.DataFrame(
+        {
+            "item": np.repeat([f"Item {idx:05d}" for idx in range(items)], days),
+            "date": np.tile(dates, items),
+            "price": rng.uniform(10, 500, size=items * days),
+        }
+    )
+
+
+def _iterrows_payload(observed: pd.DataFrame) -> list:
+    latest_date = observed["date"].max()
+    recent = observed[observed["date"] >= latest_date - pd.Timedelta(days=DAYS_TO_SHOW)].copy()
+    items_payload = []
+    for item_name, item_group in recent.groupby("item"):
+        dates_payload = []
+        for _, row in item_group.sort_values("date").iterrows():
+            dates_payload.append({"date": row["date"].strftime("%Y-%m-%d"), "price": round(float(row["price"]), 2)})
+        if dates_payload:
+            items_payload.append({"name": item_name, "prices": dates_payload})
+    items_payload.sort(key=lambda entry: entry["name"].lower())
+    return items_payload
+
+
+def run(items_list: List[int], *, days: int = 30, repeat: int = 3) -> List[dict]:
+    results = []
+    for items in items_list:
+        observed = synthetic_observations(items, days)
+        if _build_payload(observed)["items"] != _iterrows_payload(observed):
+            raise AssertionError("columnar payload differs from the reference")
+        columnar = _median_seconds(lambda: _build_payload(observed), repeat)
+        reference = _median_seconds(lambda: _iterrows_payload(observed), repeat)
+        results.append(
+            {
+                "items": items,
+                "rows": len(observed),
+                "columnar_seconds": columnar,
+                "iterrows_seconds": reference,
+                "speedup": reference / columnar if columnar else None,
+            }
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, nargs="+", default=[1000, 5000], help="Item counts to measure.")
+    parser.add_argument("--days", type=int, default=30, help="Days of observations per item.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed repetitions per measurement.")
+    parser.add_argument("--output", type=Path, help="Optional JSON output path.")
+    args = parser.parse_args()
+
+    results = run(args.items, days=args.days, repeat=args.repeat)
+    print(f"{'items':>8} {'rows':>9} {'columnar (ms)':>14} {'iterrows (ms)':>14} {'speedup':>9}")
+    for entry in results:
+        print(
+            f"{entry['items']:>8} {entry['rows']:>9} {entry['columnar_seconds'] * 1000:>14.1f} "
+            f"{entry['iterrows_seconds'] * 1000:>14.1f} {entry['speedup']:>8.1f}x"
+        )
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Measure cold start: module import times and ``cli --help`` wall time.
+
+Each measurement runs in a fresh interpreter, so nothing is cached between
+repetitions except the OS file cache.
+
+Usage
+-----
+    python -m src.price_manager.benchmarks.import_time
+
+Options
+-------
+    --repeat R        Runs per measurement. Defaults to 5.
+    --output PATH     Also write the results as JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+PACKAGE = __package__.rpartition(".")[0]
+MODULES = [
+    "cli",
+    "query_server",
+    "data_store",
+    "clean_workbook",
+    "impute_prices",
+    "export_current_prices",
+    "forecast",
+]
+
+
+def _median_run(args: List[str], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def run(*, repeat: int = 5) -> List[dict]:
+    baseline = _median_run(["-c", "pass"], repeat)
+    results = [{"target": "python -c pass", "seconds": baseline}]
+    for module in MODULES:
+        seconds = _median_run(["-c", f"import {PACKAGE}.{module}"], repeat)
+        results.append({"target": f"import {module}", "seconds": seconds, "over_baseline": seconds - baseline})
+    seconds = _median_run(["-m", f"{PACKAGE}.cli", "--help"], repeat)
+    results.append({"target": "cli --help", "seconds": seconds, "over_baseline": seconds - baseline})
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement.")
+    parser.add_argument("--output", type=Path, help="Optional JSON output path.")
+    args = parser.parse_args()
+
+    results = run(repeat=args.repeat)
+    print(f"{'target':<32} {'wall (ms)':>10} {'over python (ms)':>17}")
+    for entry in results:
+        extra = entry.get("over_baseline")
+        extra_text = f"{extra * 1000:>17.1f}" if extra is not None else f"{'':>17}"
+        print(f"{entry['target']:<32} {entry['seconds'] * 1000:>10.1f} {extra_text}")
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
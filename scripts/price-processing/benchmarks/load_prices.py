@@ -0,0 +1,106 @@
+"""
+Measure cold and warm ``load_prices`` latency on synthetic workbooks.
+
+Cold reads parse the ``.xlsx`` (and rebuild the feather snapshot); warm reads
+are served from the snapshot.
+
+Usage
+-----
+    python -m src.price_manager.benchmarks.load_prices
+
+Options
+-------
+    --rows N [N ...]  Dataset sizes to measure. Defaults to 1000 10000 50000.
+    --repeat R        Timed repetitions per measurement. Defaults to 5.
+    --output PATH     Also write the results as JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+import numpy as np
+import pandas as pd
+
+from ..data_store import load_prices, save_prices
+from ..snapshot import snapshot_paths
+
+
+def synthetic_prices(rows: int, *, seed: int = 0) -> pd.DataFrame:
+    """Unique (item, year) rows spread over ``rows // 50`` items."""
+
+    rng = np.random.default_rng(seed)
+    years = 50
+    items = max(1, rows // years)
+    return pd.DataFrame(
+        {
+            "item": np.repeat([f"Item {idx:05d}" for idx in range(items)], years)[:rows],
+            "year": np.tile(np.arange(1975, 1975 + years), items)[:rows],
+            "currency": "PHP",
+            "price": rng.uniform(10, 500, size=min(rows, items * years)).round(2),
+        }
+    )
+
+
+def _median_seconds(func: Callable[[], object], repeat: int, *, before: Callable[[], None] | None = None) -> float:
+    timings = []
+    for _ in range(repeat):
+        if before is not None:
+            before()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def run(rows_list: List[int], *, repeat: int = 5) -> List[dict]:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in rows_list:
+            path = Path(tmp) / f"prices_{rows}.xlsx"
+            save_prices(synthetic_prices(rows), path)
+
+            def drop_snapshot() -> None:
+                for sidecar in snapshot_paths(path):
+                    sidecar.unlink(missing_ok=True)
+
+            cold = _median_seconds(lambda: load_prices(path), repeat, before=drop_snapshot)
+            load_prices(path)  # leave a valid snapshot behind
+            warm = _median_seconds(lambda: load_prices(path), repeat)
+            results.append(
+                {
+                    "rows": rows,
+                    "cold_seconds": cold,
+                    "warm_seconds": warm,
+                    "speedup": cold / warm if warm else None,
+                }
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 50000], help="Dataset sizes to measure.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed repetitions per measurement.")
+    parser.add_argument("--output", type=Path, help="Optional JSON output path.")
+    args = parser.parse_args()
+
+    results = run(args.rows, repeat=args.repeat)
+    print(f"{'rows':>10} {'cold (ms)':>12} {'warm (ms)':>12} {'speedup':>9}")
+    for entry in results:
+        print(
+            f"{entry['rows']:>10} {entry['cold_seconds'] * 1000:>12.1f} "
+            f"{entry['warm_seconds'] * 1000:>12.1f} {entry['speedup']:>8.1f}x"
+        )
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
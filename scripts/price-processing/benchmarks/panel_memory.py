@@ -0,0 +1,100 @@
+"""
+Compare the memory of a ``PricePanel`` with the imputation frame it replaces.
+
+The frame has the columns ``impute_prices`` carries between stages: ``item``,
+``date``, ``year``, ``day_of_year``, ``month``, ``price`` and the two flags.
+Frame sizes use ``memory_usage(deep=True)``; panel sizes use
+``PricePanel.nbytes``. The round trip back to pandas is checked and timed.
+
+Usage
+-----
+    python -m src.price_manager.benchmarks.panel_memory
+
+Options
+-------
+    --items N       Items in the synthetic panel. Defaults to 500.
+    --years Y       Years of daily rows per item. Defaults to 15.
+    --output PATH   Also write the results as JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from ..panel import PricePanel
+
+
+def imputation_frame(items: int, years: int, seed: int = 0) -> pd.DataFrame:
+    """A frame shaped like ``_apply_imputation`` output for *items* x *years*."""
+
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2010-01-01", f"{2010 + years - 1}-12-31", freq="D")
+    rows = len(dates) * items
+    frame = pd.DataFrame(
+        {
+            "item": np.repeat([f"Commodity item {idx:04d}" for idx in range(items)], len(dates)),
+            "date": np.tile(dates.to_numpy(), items),
+            "price": rng.uniform(20, 400, rows).round(2),
+            "was_imputed": rng.random(rows) < 0.3,
+            "was_adjusted": rng.random(rows) < 0.02,
+        }
+    )
+    frame.insert(2, "year", frame["date"].dt.year)
+    frame.insert(3, "day_of_year", frame["date"].dt.dayofyear)
+    frame.insert(4, "month", frame["date"].dt.month)
+    return frame
+
+
+def run(items: int, years: int) -> dict:
+    frame = imputation_frame(items, years)
+    frame_bytes = int(frame.memory_usage(deep=True).sum())
+
+    start = time.perf_counter()
+    panel = PricePanel.from_frame(frame)
+    from_seconds = time.perf_counter() - start
+    panel32 = PricePanel.from_frame(frame, price_dtype=np.float32)
+
+    start = time.perf_counter()
+    restored = panel.to_frame(calendar=True)
+    to_seconds = time.perf_counter() - start
+    pd.testing.assert_frame_equal(
+        restored, frame[restored.columns], check_dtype=False, check_index_type=False
+    )
+
+    return {
+        "items": items,
+        "years": years,
+        "rows": len(frame),
+        "frame_mb": frame_bytes / 2**20,
+        "panel_mb": panel.nbytes / 2**20,
+        "panel_float32_mb": panel32.nbytes / 2**20,
+        "from_frame_seconds": from_seconds,
+        "to_frame_seconds": to_seconds,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=500, help="Items in the synthetic panel.")
+    parser.add_argument("--years", type=int, default=15, help="Years of daily rows per item.")
+    parser.add_argument("--output", type=Path, help="Optional JSON output path.")
+    args = parser.parse_args()
+
+    result = run(args.items, args.years)
+    print(
+        f"{result['rows']} rows: frame {result['frame_mb']:.1f} MB, panel {result['panel_mb']:.1f} MB "
+        f"(float32 {result['panel_float32_mb']:.1f} MB); from_frame {result['from_frame_seconds']:.2f}s, "
+        f"to_frame {result['to_frame_seconds']:.2f}s"
+    )
+    if args.output:
+        args.output.write_text(json.dumps(result, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
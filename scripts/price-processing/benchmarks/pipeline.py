@@ -0,0 +1,205 @@
+"""
+Time every pipeline stage on synthetic data at several scales.
+
+For each scale a synthetic ``data/all.xlsx`` and set of DA PDFs (see
+``synthetic_data``) is written to a temporary directory, which becomes the
+working directory while the stages run in pipeline order:
+
+    clean            clean_workbook
+    build_dataset    _build_dataset over the cleaned CSVs
+    pdf_parse_cold   _load_daily_index_records without the parse cache
+    pdf_parse_warm   _load_daily_index_records from the parse cache
+    impute           _apply_imputation
+    export_prices    _write_clean_csvs and _export_mobile_json
+    forecast         generate_forecasts (seasonal_trend)
+    export_current   export_current_prices
+
+With ``--baseline`` the results are compared against an earlier ``--output``
+file. A stage counts as a regression when it is more than ``--threshold``
+slower and at least ``MIN_REGRESSION_SECONDS`` slower in absolute terms. The
+command exits with status 1 when any stage regressed.
+
+Usage
+-----
+    python -m src.price_manager.benchmarks.pipeline --output bench.json
+    python -m src.price_manager.benchmarks.pipeline --baseline bench.json
+
+Options
+-------
+    --scales NAME [NAME ...]  Scales to run: small, medium, large. Defaults to
+                              small medium.
+    --repeat R                Timed repetitions per stage. Defaults to 1.
+    --gap-rate R              Share of blank workbook cells. Defaults to 0.2.
+    --output PATH             Write the results as JSON.
+    --baseline PATH           Compare against a previous --output file.
+    --threshold T             Allowed slowdown ratio. Defaults to 0.25.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import warnings
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import pandas as pd
+
+from .load_prices import _median_seconds
+from .synthetic_data import write_dataset
+
+
+SCALES: Dict[str, dict] = {
+    "small": {"items": 20, "years": 3, "pdfs": 10},
+    "medium": {"items": 100, "years": 8, "pdfs": 30},
+    "large": {"items": 300, "years": 15, "pdfs": 60},
+}
+DEFAULT_SCALES = ["small", "medium"]
+DEFAULT_THRESHOLD = 0.25
+MIN_REGRESSION_SECONDS = 0.05  # shorter differences are timer noise
+
+
+@contextlib.contextmanager
+def _working_directory(path: Path) -> Iterator[None]:
+    previous = Path.cwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def run_scale(name: str, *, repeat: int = 1, gap_rate: float = 0.2) -> List[dict]:
+    from .. import impute_prices as impute
+    from ..clean_workbook import clean_workbook
+    from ..export_current_prices import export_current_prices
+    from ..forecast import generate_forecasts
+    from ..repository import PriceRepository
+
+    scale = SCALES[name]
+    timings: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp, _working_directory(Path(tmp)):
+        write_dataset(Path(tmp), gap_rate=gap_rate, **scale)
+        repository = PriceRepository()
+        state: dict = {}
+
+        def clean() -> None:
+            state["exports"] = clean_workbook(repository=repository)
+
+        def drop_pdf_caches(keep_file_cache: bool) -> None:
+            impute._daily_records_memo.clear()
+            if not keep_file_cache:
+                (impute.DA_DAILY_DIR / impute.DA_PARSE_CACHE_NAME).unlink(missing_ok=True)
+
+        with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+            warnings.simplefilter("ignore")  # pandas warns per row in some stages; only the timings matter here
+            timings["clean"] = _median_seconds(clean, repeat)
+            timings["build_dataset"] = _median_seconds(
+                lambda: state.update(combined=impute._build_dataset(state["exports"], repository)), repeat
+            )
+            timings["pdf_parse_cold"] = _median_seconds(
+                impute._load_daily_index_records, repeat, before=lambda: drop_pdf_caches(False)
+            )
+            timings["pdf_parse_warm"] = _median_seconds(
+                impute._load_daily_index_records, repeat, before=lambda: drop_pdf_caches(True)
+            )
+            repository.observed()  # parsed above; keep it out of the imputation timing
+            timings["impute"] = _median_seconds(
+                lambda: state.update(imputed=impute._apply_imputation(state["combined"], repository)), repeat
+            )
+
+            def export_prices() -> None:
+                impute._write_clean_csvs(state["imputed"], state["exports"], repository)
+                impute._export_mobile_json(state["imputed"], repository=repository)
+
+            timings["export_prices"] = _median_seconds(export_prices, repeat)
+            timings["forecast"] = _median_seconds(lambda: generate_forecasts(repository=repository), repeat)
+            timings["export_current"] = _median_seconds(
+                lambda: export_current_prices(repository=repository), repeat
+            )
+        rows = len(state["combined"])
+
+    return [
+        {"scale": name, **scale, "rows": rows, "stage": stage, "seconds": seconds}
+        for stage, seconds in timings.items()
+    ]
+
+
+def run(scales: List[str], *, repeat: int = 1, gap_rate: float = 0.2) -> dict:
+    results: List[dict] = []
+    for name in scales:
+        print(f"Running scale '{name}' ({SCALES[name]})...", file=sys.stderr, flush=True)
+        results.extend(run_scale(name, repeat=repeat, gap_rate=gap_rate))
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(report: dict, baseline: dict, *, threshold: float = DEFAULT_THRESHOLD) -> List[dict]:
+    """Pair each stage with its baseline timing and flag slowdowns beyond *threshold*."""
+
+    previous = {(entry["scale"], entry["stage"]): entry["seconds"] for entry in baseline.get("results", [])}
+    rows = []
+    for entry in report["results"]:
+        before: Optional[float] = previous.get((entry["scale"], entry["stage"]))
+        if before is None:
+            status, ratio = "new", None
+        else:
+            ratio = entry["seconds"] / before if before else None
+            slower = entry["seconds"] - before
+            if ratio is not None and ratio > 1 + threshold and slower >= MIN_REGRESSION_SECONDS:
+                status = "regression"
+            elif ratio is not None and ratio < 1 / (1 + threshold) and -slower >= MIN_REGRESSION_SECONDS:
+                status = "faster"
+            else:
+                status = "ok"
+        rows.append({**entry, "baseline_seconds": before, "ratio": ratio, "status": status})
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", nargs="+", choices=sorted(SCALES), default=DEFAULT_SCALES, help="Scales to run.")
+    parser.add_argument("--repeat", type=int, default=1, help="Timed repetitions per stage.")
+    parser.add_argument("--gap-rate", type=float, default=0.2, help="Share of blank workbook cells.")
+    parser.add_argument("--output", type=Path, help="Optional JSON output path.")
+    parser.add_argument("--baseline", type=Path, help="Earlier --output file to compare against.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed slowdown ratio.")
+    args = parser.parse_args()
+
+    report = run(args.scales, repeat=args.repeat, gap_rate=args.gap_rate)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if args.baseline is None:
+        print(f"{'scale':>8} {'rows':>10} {'stage':<16} {'seconds':>9}")
+        for entry in report["results"]:
+            print(f"{entry['scale']:>8} {entry['rows']:>10} {entry['stage']:<16} {entry['seconds']:>9.3f}")
+        return
+
+    rows = compare(report, json.loads(args.baseline.read_text(encoding="utf-8")), threshold=args.threshold)
+    print(f"{'scale':>8} {'stage':<16} {'seconds':>9} {'baseline':>9} {'ratio':>7}  status")
+    for row in rows:
+        baseline_text = f"{row['baseline_seconds']:>9.3f}" if row["baseline_seconds"] is not None else f"{'-':>9}"
+        ratio_text = f"{row['ratio']:>7.2f}" if row["ratio"] is not None else f"{'-':>7}"
+        print(f"{row['scale']:>8} {row['stage']:<16} {row['seconds']:>9.3f} {baseline_text} {ratio_text}  {row['status']}")
+    regressions = [row for row in rows if row["status"] == "regression"]
+    if regressions:
+        print(f"{len(regressions)} stage(s) regressed by more than {args.threshold:.0%}.")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Compare peak memory and time of ``save_prices`` against ``DataFrame.to_excel``.
+
+``save_prices`` streams rows through a write-only worksheet, so its peak
+allocation should stay roughly flat as the row count grows, while
+``to_excel`` builds the whole workbook in memory first. Peaks are measured
+with ``tracemalloc`` and exclude the input frame itself.
+
+Usage
+-----
+    python -m src.price_manager.benchmarks.save_prices
+
+Options
+-------
+    --rows N [N ...]  Dataset sizes to measure. Defaults to 10000 50000 200000.
+    --output PATH     Also write the results as JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+from ..data_store import WORKSHEET_NAME, save_prices
+from .load_prices import synthetic_prices
+
+
+def _measure(func: Callable[[], object]) -> Tuple[float, int]:
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return elapsed, peak
+
+
+def run(rows_list: List[int]) -> List[dict]:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in rows_list:
+            frame = synthetic_prices(rows)
+            streamed_path = Path(tmp) / f"streamed_{rows}.xlsx"
+            pandas_path = Path(tmp) / f"pandas_{rows}.xlsx"
+
+            streamed_seconds, streamed_peak = _measure(lambda: save_prices(frame, streamed_path))
+            pandas_seconds, pandas_peak = _measure(
+                lambda: frame.to_excel(pandas_path, sheet_name=WORKSHEET_NAME, index=False)
+            )
+            results.append(
+                {
+                    "rows": rows,
+                    "streamed_seconds": streamed_seconds,
+                    "streamed_peak_mb": streamed_peak / 2**20,
+                    "to_excel_seconds": pandas_seconds,
+                    "to_excel_peak_mb": pandas_peak / 2**20,
+                }
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 50000, 200000], help="Dataset sizes to measure.")
+    parser.add_argument("--output", type=Path, help="Optional JSON output path.")
+    args = parser.parse_args()
+
+    results = run(args.rows)
+    print(f"{'rows':>10} {'streamed (s)':>13} {'peak (MB)':>10} {'to_excel (s)':>13} {'peak (MB)':>10}")
+    for entry in results:
+        print(
+            f"{entry['rows']:>10} {entry['streamed_seconds']:>13.2f} {entry['streamed_peak_mb']:>10.1f} "
+            f"{entry['to_excel_seconds']:>13.2f} {entry['to_excel_peak_mb']:>10.1f}"
+        )
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
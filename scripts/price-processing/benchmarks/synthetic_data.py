@@ -0,0 +1,249 @@
+"""
+Write a synthetic raw workbook and DA Daily Price Index PDFs for benchmarks.
+
+The workbook matches ``data/all.xlsx``: one sheet per item, an unnamed date
+column for a reference year, and one column per year holding numbers, price
+ranges such as ``"42.00 - 49.00"`` or blanks. The first sheets are named after
+the ``DA_MAPPING`` items so the PDFs merge into them. The PDFs follow the DA
+layout that ``impute_prices`` parses: a ruled table with category rows and
+commodity / specification / price rows. They are written directly, without a
+PDF library.
+
+Usage
+-----
+    python -m src.price_manager.benchmarks.synthetic_data --root /tmp/prices
+
+Options
+-------
+    --root DIR        Directory that receives data/all.xlsx and
+                      data/daily_price_index/. Defaults to the current one.
+    --items N         Workbook sheets. Defaults to 50.
+    --years Y         Years of columns per sheet. Defaults to 5.
+    --gap-rate R      Share of blank cells. Defaults to 0.2.
+    --range-rate R    Share of cells written as "low - high" ranges. Defaults to 0.1.
+    --pdfs P          Daily PDFs, one per day ending today. Defaults to 30.
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792
+COLUMN_EDGES = (40, 250, 430, 572)  # commodity | specification | price
+ROW_HEIGHT = 16
+ROWS_PER_PAGE = 42
+FONT_SIZE = 8
+
+
+def da_items() -> List[Tuple[str, str, Optional[str], str]]:
+    """``DA_MAPPING`` without the duplicate spellings of one item."""
+
+    from ..impute_prices import DA_MAPPING
+
+    seen, entries = set(), []
+    for entry in DA_MAPPING:
+        if entry[3] not in seen:
+            seen.add(entry[3])
+            entries.append(entry)
+    return entries
+
+
+def item_names(items: int) -> List[str]:
+    names = [entry[3] for entry in da_items()][:items]
+    return names + [f"Synthetic item {idx:04d}" for idx in range(items - len(names))]
+
+
+def base_prices(names: Sequence[str], seed: int = 0) -> Dict[str, float]:
+    rng = np.random.default_rng(seed)
+    return {name: float(price) for name, price in zip(names, rng.uniform(30, 400, len(names)).round(2))}
+
+
+def write_workbook(
+    path: Path,
+    *,
+    items: int = 50,
+    years: int = 5,
+    gap_rate: float = 0.2,
+    range_rate: float = 0.1,
+    last_year: Optional[int] = None,
+    seed: int = 0,
+) -> Path:
+    """Write a raw workbook shaped like ``data/all.xlsx``."""
+
+    from openpyxl import Workbook
+
+    rng = np.random.default_rng(seed)
+    last_year = last_year or date.today().year
+    year_labels = list(range(last_year - years + 1, last_year + 1))
+    reference = [datetime(last_year, 1, 1) + timedelta(days=day) for day in range(365)]
+    names = item_names(items)
+
+    workbook = Workbook(write_only=True)
+    for name, base in base_prices(names, seed).items():
+        sheet = workbook.create_sheet(title=name[:31])
+        sheet.append([None, *year_labels])
+        # A multiplicative random walk per year, drifting upward over the years
+        steps = rng.normal(0, 0.01, (365, years)).cumsum(axis=0)
+        prices = base * (1 + 0.04 * np.arange(years)) * np.exp(steps)
+        blank = rng.random((365, years)) < gap_rate
+        ranged = rng.random((365, years)) < range_rate
+        for day in range(365):
+            row: List[object] = [reference[day]]
+            for column in range(years):
+                price = round(float(prices[day, column]), 2)
+                if blank[day, column]:
+                    row.append(None)
+                elif ranged[day, column]:
+                    row.append(f"{price * 0.9:.2f} - {price * 1.1:.2f}")
+                else:
+                    row.append(price)
+            sheet.append(row)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    workbook.save(path)
+    return path
+
+
+def write_daily_index_pdfs(
+    directory: Path,
+    *,
+    days: int = 30,
+    end: Optional[date] = None,
+    missing_rate: float = 0.05,
+    seed: int = 0,
+) -> List[Path]:
+    """Write one ``daily-price-index-YYYY-MM-DD.pdf`` per day ending at *end*."""
+
+    rng = np.random.default_rng(seed)
+    end = end or date.today()
+    entries = da_items()
+    bases = base_prices([entry[3] for entry in entries], seed)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    paths = []
+    for offset in range(days):
+        day = end - timedelta(days=days - 1 - offset)
+        rows = []
+        for category, commodity, spec_hint, name in entries:
+            if rng.random() < missing_rate:
+                price = "n/a"
+            else:
+                price = f"{bases[name] * (1 + rng.normal(0, 0.03)):,.2f}"
+            rows.append((category, commodity, spec_hint or "per kilogram", price))
+        path = directory / f"daily-price-index-{day.isoformat()}.pdf"
+        write_daily_index_pdf(path, day, rows)
+        paths.append(path)
+    return paths
+
+
+def write_daily_index_pdf(path: Path, day: date, rows: Sequence[Tuple[str, str, str, str]]) -> Path:
+    """Write ``(category, commodity, specification, price)`` rows as a ruled DA table."""
+
+    lines: List[Tuple[Optional[str], Tuple[str, ...]]] = []  # (category, cells)
+    current = None
+    for category, commodity, specification, price in rows:
+        if category != current:
+            lines.append((category, (category,)))
+            current = category
+        lines.append((None, (commodity, specification, price)))
+
+    header = ("COMMODITY", "SPECIFICATION", "PREVAILING RETAIL PRICE PER UNIT (P/UNIT)")
+    pages = []
+    for start in range(0, len(lines), ROWS_PER_PAGE):
+        ops = [
+            "0.5 w",
+            _text(COLUMN_EDGES[0], PAGE_HEIGHT - 40, f"DAILY PRICE INDEX - {day.strftime('%B %d, %Y').upper()}"),
+        ]
+        top = PAGE_HEIGHT - 60
+        for index, cells in enumerate([header, *(cells for _, cells in lines[start : start + ROWS_PER_PAGE])]):
+            y = top - (index + 1) * ROW_HEIGHT
+            edges = COLUMN_EDGES if len(cells) > 1 else (COLUMN_EDGES[0], COLUMN_EDGES[-1])
+            for left, right, text in zip(edges, edges[1:], cells):
+                ops.append(f"{left} {y} {right - left} {ROW_HEIGHT} re S")
+                ops.append(_text(left + 3, y + 5, text))
+        pages.append("\n".join(ops).encode("latin-1"))
+
+    path.write_bytes(_pdf_document(pages))
+    return path
+
+
+def _text(x: float, y: float, text: str) -> str:
+    escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    return f"BT /F1 {FONT_SIZE} Tf {x} {y} Td ({escaped}) Tj ET"
+
+
+def _pdf_document(page_streams: Sequence[bytes]) -> bytes:
+    """A minimal PDF with Helvetica text; object numbers are assigned in order."""
+
+    page_ids = [4 + 2 * index for index in range(len(page_streams))]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % pid for pid in page_ids) + b"] /Count %d >>" % len(page_ids),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    for page_id, stream in zip(page_ids, page_streams):
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Resources << /Font << /F1 3 0 R >> >> "
+            b"/Contents %d 0 R >>" % (PAGE_WIDTH, PAGE_HEIGHT, page_id + 1)
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(output)
+
+
+def write_dataset(
+    root: Path,
+    *,
+    items: int = 50,
+    years: int = 5,
+    gap_rate: float = 0.2,
+    range_rate: float = 0.1,
+    pdfs: int = 30,
+    seed: int = 0,
+) -> Tuple[Path, List[Path]]:
+    """Write ``data/all.xlsx`` and ``data/daily_price_index/*.pdf`` under *root*."""
+
+    workbook = write_workbook(
+        root / "data" / "all.xlsx", items=items, years=years, gap_rate=gap_rate, range_rate=range_rate, seed=seed
+    )
+    return workbook, write_daily_index_pdfs(root / "data" / "daily_price_index", days=pdfs, seed=seed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", type=Path, default=Path("."), help="Directory that receives data/.")
+    parser.add_argument("--items", type=int, default=50, help="Workbook sheets.")
+    parser.add_argument("--years", type=int, default=5, help="Years of columns per sheet.")
+    parser.add_argument("--gap-rate", type=float, default=0.2, help="Share of blank cells.")
+    parser.add_argument("--range-rate", type=float, default=0.1, help="Share of cells written as ranges.")
+    parser.add_argument("--pdfs", type=int, default=30, help="Daily PDFs ending today.")
+    args = parser.parse_args()
+
+    workbook, pdfs = write_dataset(
+        args.root,
+        items=args.items,
+        years=args.years,
+        gap_rate=args.gap_rate,
+        range_rate=args.range_rate,
+        pdfs=args.pdfs,
+    )
+    print(f"Wrote '{workbook}' and {len(pdfs)} PDFs under '{pdfs[0].parent if pdfs else args.root}'.")
+
+
+if __name__ == "__main__":
+    main()
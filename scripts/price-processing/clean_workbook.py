@@ -2,12 +2,19 @@
 
 from __future__ import annotations
 
+import argparse
 from pathlib import Path
-from typing import Dict, Optional
+from typing import TYPE_CHECKING, Dict, Optional
 
 import pandas as pd
 from pandas.api import types as ptypes
 
+from . import instrumentation
+from .profiling import add_profile_arguments, profile_from_args
+
+if TYPE_CHECKING:
+    from .repository import PriceRepository
+
 RAW_WORKBOOK = Path("data/all.xlsx")
 CLEAN_ROOT = Path("data/cleaned")
 
@@ -26,8 +33,13 @@ def clean_workbook(
     *,
     destination_root: Path | str = CLEAN_ROOT,
     overwrite: bool = True,
+    repository: Optional[PriceRepository] = None,
 ) -> Dict[str, Dict[str, Path]]:
-    """Clean the raw workbook and emit per-sheet/year CSV files."""
+    """Clean the raw workbook and emit per-sheet/year CSV files.
+
+    With a ``repository`` the cleaned frames are also kept in memory for the
+    stages that read them next.
+    """
 
     source_path = Path(source)
     if not source_path.exists():
@@ -63,7 +75,10 @@ def clean_workbook(
             if output_path.exists() and not overwrite:
                 continue
 
-            cleaned.to_csv(output_path, index=False)
+            if repository is not None:
+                repository.write_csv(output_path, cleaned)
+            else:
+                cleaned.to_csv(output_path, index=False)
             exports[sheet_name][str(column)] = output_path
 
     return exports
@@ -125,7 +140,12 @@ def _safe_folder_name(name: str) -> str:
 
 
 def main() -> None:
-    exports = clean_workbook()
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    with profile_from_args(args, "clean_workbook"), instrumentation.stage("clean"):
+        exports = clean_workbook()
     total = sum(len(years) for years in exports.values())
     print(f"Cleaned {len(exports)} sheets into {total} CSV files under '{CLEAN_ROOT}'.")
 
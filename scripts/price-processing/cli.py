@@ -2,82 +2,195 @@
 
 from __future__ import annotations
 
+import shutil
+import sys
+import time
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Iterator, List, Optional
 
-import pandas as pd
 import typer
 from rich.console import Console
-from rich.table import Table
-
-from .data_store import (
-    PriceRecord,
-    compare_years,
-    filter_by_item,
-    filter_by_year,
-    load_prices,
-    summarize_by_item,
-    upsert_records,
-)
+
+from .output import OutputFormat
+from .query_server import DEFAULT_HOST, DEFAULT_PORT, SERVER_ENV
+
+# pandas and the data layer are imported inside the commands that use them,
+# so --help and server-backed queries start without paying for them.
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .data_store import PriceDataset
 
 
 app = typer.Typer(add_completion=False, no_args_is_help=True, help=__doc__)
 console = Console()
 
 
-def _dataset_or_exit(path: Path) -> pd.DataFrame:
+def _dataset_or_exit(path: Path) -> PriceDataset:
+    from .data_store import load_dataset
+
     try:
-        return load_prices(path, create_if_missing=True)
+        return load_dataset(path, create_if_missing=True)
     except ValueError as exc:  # schema issues
         typer.secho(f"Error: {exc}", fg=typer.colors.RED)
         raise typer.Exit(code=1) from exc
 
 
+def _emit(
+    frame: pd.DataFrame,
+    output_format: OutputFormat,
+    *,
+    title: str,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    output: Optional[Path] = None,
+    cell_formats: Optional[dict] = None,
+) -> None:
+    """Write one page of *frame*; csv/json stream to stdout or *output*."""
+    from .output import page, write_frame
+
+    frame = page(frame, offset=offset, limit=limit)
+    if cell_formats is None:
+        cell_formats = {column: "%.2f" for column in frame.select_dtypes("float").columns}
+    if output is not None and output_format is not OutputFormat.table:
+        with output.open("w", encoding="utf-8", newline="") as stream:
+            write_frame(frame, output_format, stream=stream)
+        console.print(f"[green]Wrote[/green] {len(frame)} rows to {output}.")
+        return
+    try:
+        write_frame(frame, output_format, console=console, title=title, cell_formats=cell_formats)
+    except BrokenPipeError:  # e.g. piped into head
+        sys.stderr.close()
+        raise typer.Exit(code=0)
+
+
+FORMAT_OPTION = typer.Option(OutputFormat.table, "--format", help="Output format")
+LIMIT_OPTION = typer.Option(None, "--limit", min=1, help="Show at most this many rows")
+OFFSET_OPTION = typer.Option(0, "--offset", min=0, help="Skip this many rows first")
+SERVER_OPTION = typer.Option(
+    None, "--server", envvar=SERVER_ENV, help="host:port of a running `serve` process to query instead"
+)
+
+
 @app.command()
-def summary(input_path: Path = typer.Argument(..., exists=False, file_okay=True)) -> None:
+def summary(
+    input_path: Path = typer.Argument(..., exists=False, file_okay=True),
+    output_format: OutputFormat = FORMAT_OPTION,
+    limit: Optional[int] = LIMIT_OPTION,
+    offset: int = OFFSET_OPTION,
+) -> None:
     """Show per-item price statistics."""
+    from .data_store import load_summary
 
-    df = _dataset_or_exit(input_path)
-    if df.empty:
+    try:
+        summary_df = load_summary(input_path, create_if_missing=True)
+    except ValueError as exc:  # schema issues
+        typer.secho(f"Error: {exc}", fg=typer.colors.RED)
+        raise typer.Exit(code=1) from exc
+    if summary_df.empty:
         console.print("[yellow]No data found. Use the add command to insert rows.")
         raise typer.Exit(code=0)
 
-    summary_df = summarize_by_item(df)
-    table = Table(title="Price Summary", show_lines=False)
-    for column in summary_df.columns:
-        table.add_column(column.replace("_", " ").title(), justify="right")
-
-    for _, row in summary_df.iterrows():
-        table.add_row(*(f"{value:.2f}" if isinstance(value, float) else str(value) for value in row))
-
-    console.print(table)
+    _emit(summary_df, output_format, title="Price Summary", offset=offset, limit=limit)
 
 
 @app.command()
 def add(
-    input_path: Path = typer.Argument(..., help="Excel file to update"),
+    input_path: Path = typer.Argument(..., help="Price dataset to update (.xlsx, or .db for SQLite)"),
     item: str = typer.Option(..., prompt=True, help="Product or service name"),
     year: int = typer.Option(..., prompt=True, help="Calendar year"),
     price: float = typer.Option(..., prompt=True, help="Price for the specified year"),
     currency: str = typer.Option("USD", prompt=False, help="ISO currency code"),
 ) -> None:
     """Insert or update a price observation."""
+    from .data_store import PriceRecord, records_to_frame, upsert_frame
 
     record = PriceRecord(item=item, year=year, price=price, currency=currency)
-    dataset = upsert_records(input_path, [record])
+    try:
+        total_rows = upsert_frame(input_path, records_to_frame([record]))
+    except ValueError as exc:  # schema issues or a missing price
+        typer.secho(f"Error: {exc}", fg=typer.colors.RED)
+        raise typer.Exit(code=1) from exc
     console.print(
         f"[green]Record saved[/green] for [bold]{record.item}[/bold] ({record.currency}) in {record.year}: {record.price:.2f}"
     )
-    console.print(f"Dataset now contains {len(dataset)} rows.")
+    console.print(f"Dataset now contains {total_rows} rows.")
+
+
+@app.command("import")
+def import_(
+    input_path: Path = typer.Argument(..., help="Price dataset to update (.xlsx, or .db for SQLite)"),
+    source: Path = typer.Argument(..., exists=True, dir_okay=False, help="CSV or JSON Lines file with item/year/currency/price"),
+    chunk_size: int = typer.Option(50_000, min=1, help="Rows validated and written per batch"),
+    rejects: Optional[Path] = typer.Option(None, help="Write rejected rows with a reason column to this CSV"),
+) -> None:
+    """Bulk insert or update prices from a CSV or JSON Lines file."""
+    from .data_store import split_valid_rows, upsert_frame
+
+    start = time.perf_counter()
+    accepted = rejected = 0
+    total_rows = 0
+    wrote_rejects = False
+
+    try:
+        for chunk in _read_chunks(source, chunk_size):
+            valid, invalid = split_valid_rows(chunk)
+            if not valid.empty:
+                total_rows = upsert_frame(input_path, valid)
+            accepted += len(valid)
+            rejected += len(invalid)
+            if rejects is not None and not invalid.empty:
+                invalid.to_csv(rejects, mode="a" if wrote_rejects else "w", header=not wrote_rejects, index=False)
+                wrote_rejects = True
+    except ValueError as exc:
+        typer.secho(f"Error: {exc}", fg=typer.colors.RED)
+        raise typer.Exit(code=1) from exc
+
+    elapsed = time.perf_counter() - start
+    rate = (accepted + rejected) / elapsed if elapsed else 0.0
+    console.print(
+        f"[green]Imported[/green] {accepted} rows ({rejected} rejected) in {elapsed:.2f}s, {rate:,.0f} rows/s."
+    )
+    if accepted:
+        console.print(f"Dataset now contains {total_rows} rows.")
+    if rejected and rejects is not None:
+        console.print(f"[yellow]Rejected rows written to {rejects}.")
+
+
+def _read_chunks(source: Path, chunk_size: int) -> Iterator[pd.DataFrame]:
+    import pandas as pd
+
+    if source.suffix.lower() in {".jsonl", ".ndjson"}:
+        return iter(pd.read_json(source, lines=True, chunksize=chunk_size, dtype=False))
+    return iter(pd.read_csv(source, chunksize=chunk_size, dtype=str, keep_default_na=False))
+
+
+@app.command()
+def export(
+    input_path: Path = typer.Argument(..., help="Price dataset to read (.xlsx or .db)"),
+    output_path: Path = typer.Argument(..., help="Destination; the suffix picks Excel or SQLite"),
+) -> None:
+    """Copy a dataset to another file, e.g. a SQLite store to .xlsx."""
+    from .data_store import export_prices
+
+    try:
+        total_rows = export_prices(input_path, output_path)
+    except (FileNotFoundError, ValueError) as exc:
+        typer.secho(f"Error: {exc}", fg=typer.colors.RED)
+        raise typer.Exit(code=1) from exc
+    console.print(f"[green]Exported[/green] {total_rows} rows to {output_path}.")
 
 
 @app.command()
 def compare(
-    input_path: Path = typer.Argument(..., help="Excel file to read"),
+    input_path: Path = typer.Argument(..., help="Price dataset to read (.xlsx or .db)"),
     base_year: int = typer.Option(..., help="Year used as the comparison baseline"),
     target_year: int = typer.Option(..., help="Year to compare against the baseline"),
 ) -> None:
     """Show price deltas between two years."""
+    from rich.table import Table
+
+    from .data_store import compare_years
 
     df = _dataset_or_exit(input_path)
     if df.empty:
@@ -92,7 +205,7 @@ def compare(
 
     table = Table(title=f"Comparison: {base_year} → {target_year}")
     for column in comparison.columns:
-        table.add_column(column.replace("_", " ").title(), justify="right")
+        table.add_column(str(column).replace("_", " ").title(), justify="right")
 
     for _, row in comparison.iterrows():
         table.add_row(
@@ -107,48 +220,108 @@ def compare(
 
 
 @app.command()
-def year(
-    input_path: Path = typer.Argument(..., help="Excel file to read"),
-    value: int = typer.Argument(..., help="Year to filter by"),
+def matrix(
+    input_path: Path = typer.Argument(..., help="Price dataset to read (.xlsx or .db)"),
+    years: Optional[List[int]] = typer.Option(None, "--year", "-y", help="Year to include; repeat for more (default: all)"),
+    output_format: OutputFormat = FORMAT_OPTION,
+    output: Optional[Path] = typer.Option(None, help="Write csv/json output to this file instead of stdout"),
+    limit: Optional[int] = LIMIT_OPTION,
+    offset: int = OFFSET_OPTION,
 ) -> None:
-    """List all items for a specific year."""
+    """Show deltas, percent changes, and CAGR for every pair of years."""
+    from .data_store import compare_matrix
 
     df = _dataset_or_exit(input_path)
-    filtered = filter_by_year(df, value)
-    if filtered.empty:
-        console.print(f"[yellow]No records found for year {value}.")
-        raise typer.Exit()
+    if df.empty:
+        console.print("[yellow]Dataset is empty; nothing to compare.")
+        raise typer.Exit(code=0)
 
-    table = Table(title=f"Prices in {value}")
-    for column in filtered.columns:
-        table.add_column(column.title())
+    try:
+        result = compare_matrix(df, years)
+    except ValueError as exc:
+        typer.secho(str(exc), fg=typer.colors.RED)
+        raise typer.Exit(code=1) from exc
 
-    for _, row in filtered.iterrows():
-        table.add_row(*(str(row[col]) for col in filtered.columns))
-    console.print(table)
+    prices = {column: "%.2f" for column in ("base_price", "target_price", "delta")}
+    _emit(
+        result,
+        output_format,
+        title="Year-over-year comparison matrix",
+        offset=offset,
+        limit=limit,
+        output=output,
+        cell_formats={**prices, "pct_change": "%.2f%%", "cagr": "%.2f%%"},
+    )
+
+
+@app.command()
+def year(
+    input_path: Path = typer.Argument(..., help="Price dataset to read (.xlsx or .db)"),
+    value: int = typer.Argument(..., help="Year to filter by"),
+    output_format: OutputFormat = FORMAT_OPTION,
+    limit: Optional[int] = LIMIT_OPTION,
+    offset: int = OFFSET_OPTION,
+    server: Optional[str] = SERVER_OPTION,
+) -> None:
+    """List all items for a specific year."""
+
+    _query(input_path, server, command="year", value=value, format=output_format.value, limit=limit, offset=offset)
 
 
 @app.command()
 def item(
-    input_path: Path = typer.Argument(..., help="Excel file to read"),
+    input_path: Path = typer.Argument(..., help="Price dataset to read (.xlsx or .db)"),
     name: str = typer.Argument(..., help="Item name to inspect"),
+    output_format: OutputFormat = FORMAT_OPTION,
+    limit: Optional[int] = LIMIT_OPTION,
+    offset: int = OFFSET_OPTION,
+    server: Optional[str] = SERVER_OPTION,
 ) -> None:
     """Show price history for a single item."""
 
-    df = _dataset_or_exit(input_path)
-    filtered = filter_by_item(df, name)
-    if filtered.empty:
-        console.print(f"[yellow]No records found for item '{name}'.")
-        raise typer.Exit()
+    _query(input_path, server, command="item", name=name, format=output_format.value, limit=limit, offset=offset)
 
-    table = Table(title=f"History for {name}")
-    for column in filtered.columns:
-        table.add_column(column.title())
 
-    for _, row in filtered.iterrows():
-        table.add_row(*(str(row[col]) for col in filtered.columns))
+def _query(input_path: Path, server: Optional[str], **request) -> None:
+    """Answer an item/year query locally, or through a `serve` process when *server* is set."""
+    from .query_server import parse_address, query, run_query
 
-    console.print(table)
+    try:
+        if server:
+            request.update(
+                path=str(input_path.resolve()),
+                width=shutil.get_terminal_size().columns,
+                tty=sys.stdout.isatty(),
+            )
+            try:
+                sys.stdout.write(query(parse_address(server), request))
+            except (ConnectionError, ValueError) as exc:
+                typer.secho(f"Error: {exc}", fg=typer.colors.RED)
+                raise typer.Exit(code=1) from exc
+        else:
+            run_query(_dataset_or_exit(input_path), request, console, sys.stdout)
+    except BrokenPipeError:  # e.g. piped into head
+        sys.stderr.close()
+        raise typer.Exit(code=0)
+
+
+@app.command()
+def serve(
+    input_path: Path = typer.Argument(..., help="Price dataset to keep loaded (.xlsx or .db)"),
+    host: str = typer.Option(DEFAULT_HOST, help="Interface to listen on"),
+    port: int = typer.Option(DEFAULT_PORT, help="TCP port to listen on"),
+    allow_remote: bool = typer.Option(False, "--allow-remote", help="Allow listening on a non-loopback interface"),
+) -> None:
+    """Keep the dataset loaded and answer `item`/`year --server` queries."""
+    from .query_server import serve as run_server
+
+    try:
+        run_server(input_path, (host, port), allow_remote=allow_remote, log=console.print)
+    except ValueError as exc:  # schema issues, a non-loopback host or a missing key
+        typer.secho(f"Error: {exc}", fg=typer.colors.RED)
+        raise typer.Exit(code=1) from exc
+    except KeyboardInterrupt:
+        console.print("Server stopped.")
 
 
 def main() -> None:
@@ -10,6 +10,16 @@ Options
     --lookback DAYS   Number of days (from today) to consider when fetching
                       PDFs. Defaults to 14.
     --force           Force re-download even when the PDF already exists.
+    --download-only   Only fetch new PDFs; a running ``watch`` process
+                      republishes the outputs.
+    --shard           Also publish per-item mobile JSON shards with a
+                      manifest and delta (see mobile_shards).
+    --report PATH     Write per-stage wall/CPU time, rows, peak RSS and
+                      per-item timings as JSON.
+    --metrics PATH    Write the same measurements in Prometheus text format.
+    --profile [DIR]   cProfile each stage into a run directory under DIR
+                      (default data/profiles) with a hot-function summary.
+    --profile-sample  With --profile, also write sampled call stacks.
 """
 
 from __future__ import annotations
@@ -28,9 +38,13 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from src.price_manager import instrumentation  # noqa: E402
 from src.price_manager.impute_prices import DA_DAILY_DIR, impute_prices  # noqa: E402
 from src.price_manager.forecast import generate_forecasts  # noqa: E402
 from src.price_manager.export_current_prices import export_current_prices  # noqa: E402
+from src.price_manager.price_api import publish_version  # noqa: E402
+from src.price_manager.profiling import add_profile_arguments, profile_from_args  # noqa: E402
+from src.price_manager.repository import PriceRepository  # noqa: E402
 
 DA_PRICE_MONITORING_URL = "https://www.da.gov.ph/price-monitoring/"
 HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; price-sync/1.0)"}
@@ -49,6 +63,27 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Re-download PDFs even if they already exist locally.",
     )
+    parser.add_argument(
+        "--download-only",
+        action="store_true",
+        help="Only download new PDFs and leave processing to a running watcher.",
+    )
+    parser.add_argument(
+        "--shard",
+        action="store_true",
+        help="Also write per-item mobile JSON shards, a manifest, and a delta.",
+    )
+    parser.add_argument(
+        "--report",
+        type=Path,
+        help="Write a JSON run report with per-stage timings and memory.",
+    )
+    parser.add_argument(
+        "--metrics",
+        type=Path,
+        help="Write the run's stage metrics in Prometheus text format.",
+    )
+    add_profile_arguments(parser)
     return parser.parse_args()
 
 
@@ -114,27 +149,49 @@ def download_pdfs(
 
 def main() -> None:
     args = parse_args()
-    print("Fetching latest Daily Price Index links…")
-    links = fetch_daily_links()
-    print(f"Found {len(links)} entries on the DA website.")
-
-    downloaded = download_pdfs(
-        links,
-        lookback_days=args.lookback,
-        force=args.force,
-    )
+    if args.report or args.metrics:
+        instrumentation.enable()
+    try:
+        with profile_from_args(args, "daily_price_sync"):
+            sync(args)
+    finally:
+        # Written on failure too, so the report shows how far the run got
+        recorder = instrumentation.disable()
+        if recorder is not None and args.report:
+            print(f"Run report written to '{recorder.write_json(args.report)}'.")
+        if recorder is not None and args.metrics:
+            print(f"Metrics written to '{recorder.write_prometheus(args.metrics)}'.")
+
+
+def sync(args: argparse.Namespace) -> None:
+    with instrumentation.stage("download") as record:
+        print("Fetching latest Daily Price Index links…")
+        links = fetch_daily_links()
+        print(f"Found {len(links)} entries on the DA website.")
+
+        downloaded = download_pdfs(
+            links,
+            lookback_days=args.lookback,
+            force=args.force,
+        )
+        record.rows(rows_in=len(links), rows_out=downloaded)
     if downloaded == 0:
         print("No new PDFs downloaded (already up to date).")
     else:
         print(f"Downloaded {downloaded} new PDF file(s).")
+    if args.download_only:
+        return
 
     print("Rebuilding cleaned datasets…")
-    impute_prices()
+    # One repository per run: later stages reuse what earlier ones parsed or wrote
+    repository = PriceRepository()
+    impute_prices(shard=args.shard, repository=repository)
     print("Updating forecasts…")
-    generate_forecasts()
+    generate_forecasts(shard=args.shard, repository=repository)
     print("Exporting current prices…")
-    export_current_prices()
-    print("Finished refreshing price datasets and mobile JSON.")
+    export_current_prices(shard=args.shard, repository=repository)
+    version = publish_version()
+    print(f"Finished refreshing price datasets and mobile JSON (version {version}).")
 
 
 if __name__ == "__main__":
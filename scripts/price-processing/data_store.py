@@ -1,17 +1,31 @@
-"""Utilities for loading, validating, and persisting Excel price datasets."""
+"""Utilities for loading, validating, and persisting price datasets (Excel or SQLite)."""
 
 from __future__ import annotations
 
+import json
+import os
+import sqlite3
+import uuid
+from contextlib import closing, contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Callable, Dict, Iterable, Iterator, Optional
 
+import numpy as np
 import pandas as pd
 from pandas import DataFrame
 
+from .file_lock import FileLock
+from .snapshot import read_snapshot, source_signature, write_snapshot
+
 
 WORKSHEET_NAME = "Prices"
 REQUIRED_COLUMNS = ["item", "year", "currency", "price"]
+STATS_COLUMNS = ["item", "observations", "first_year", "latest_year", "min_price", "max_price", "price_sum"]
+_STATS_SNAPSHOT = "stats"
+SQLITE_SUFFIXES = {".db", ".sqlite", ".sqlite3"}
+SQLITE_BUSY_TIMEOUT_SECONDS = 30.0
+EXCEL_WRITE_CHUNK_ROWS = 10000
 
 
 @dataclass(frozen=True)
@@ -31,12 +45,13 @@ def ensure_directory(path: Path) -> None:
 
 
 def load_prices(path: Path | str, *, create_if_missing: bool = False) -> DataFrame:
-    """Load and validate a price dataset from an Excel file.
+    """Load and validate a price dataset from an Excel file or SQLite database.
 
     Parameters
     ----------
     path:
-        Excel file to read.
+        Dataset to read; the storage backend is chosen from the suffix
+        (see :func:`open_storage`).
     create_if_missing:
         When ``True`` and the path does not exist, an empty, schema-valid
         ``DataFrame`` is returned.
@@ -47,105 +62,729 @@ def load_prices(path: Path | str, *, create_if_missing: bool = False) -> DataFra
         Normalized dataset with enforced schema.
     """
 
-    path = Path(path)
+    storage = open_storage(path)
 
-    if not path.exists():
+    if not storage.exists():
         if create_if_missing:
             return _empty_dataset()
-        raise FileNotFoundError(f"Excel file not found: {path}")
+        raise FileNotFoundError(f"Price dataset not found: {storage.path}")
 
-    df = pd.read_excel(path, sheet_name=WORKSHEET_NAME, dtype={"year": int})
-    return _normalize_dataset(df)
+    return storage.load()
 
 
 def save_prices(df: DataFrame, path: Path | str) -> None:
-    """Persist the dataset to disk, enforcing schema and sorting."""
+    """Persist the dataset to disk, enforcing schema and sorting.
 
-    normalized = _normalize_dataset(df)
-    normalized = normalized.sort_values(by=["item", "year"], kind="mergesort")
-    path = Path(path)
-    ensure_directory(path)
-    normalized.to_excel(path, sheet_name=WORKSHEET_NAME, index=False)
+    Raises ``ValueError`` for rows without a price, which neither backend stores.
+    """
+
+    open_storage(path).save(_require_prices(_normalize_dataset(df)))
 
 
 def upsert_records(path: Path | str, records: Iterable[PriceRecord]) -> DataFrame:
-    """Merge the provided records into the dataset, overwriting duplicates."""
+    """Merge the provided records into the dataset, overwriting duplicates.
+
+    Returns the updated dataset, which is read back after the write. Callers
+    that only need the row count should use :func:`upsert_frame` with
+    :func:`records_to_frame` and skip that read.
+    """
+
+    upsert_frame(path, records_to_frame(records))
+    return load_prices(path)
+
+
+def upsert_frame(path: Path | str, frame: DataFrame) -> int:
+    """Merge a batch of rows into the dataset and return the new row count.
+
+    Later rows win over earlier ones and over stored rows with the same
+    ``(item, year)``. With the SQLite backend only the batch is written.
+    Raises ``ValueError`` for rows without a price.
+    """
+
+    return open_storage(path).upsert(_require_prices(_normalize_dataset(frame)))
+
+
+def load_summary(path: Path | str, *, create_if_missing: bool = False) -> DataFrame:
+    """Return per-item statistics from the aggregates stored with the dataset.
+
+    The aggregates are maintained by every write, so this reads one row per
+    item instead of the full price history.
+    """
+
+    storage = open_storage(path)
+
+    if not storage.exists():
+        if create_if_missing:
+            return _summary_from_stats(_item_stats(_empty_dataset()))
+        raise FileNotFoundError(f"Price dataset not found: {storage.path}")
+
+    return _summary_from_stats(storage.item_stats())
+
+
+def export_prices(source: Path | str, destination: Path | str) -> int:
+    """Copy a dataset between backends, e.g. SQLite to ``.xlsx`` on demand."""
+
+    dataset = load_prices(source)
+    save_prices(dataset, destination)
+    return len(dataset)
+
+
+def open_storage(path: Path | str) -> ExcelStorage | SQLiteStorage:
+    """Return the storage backend for *path*: SQLite for ``.db``/``.sqlite``, Excel otherwise."""
 
     path = Path(path)
-    existing = load_prices(path, create_if_missing=True)
-    incoming = _records_to_frame(records)
+    if path.suffix.lower() in SQLITE_SUFFIXES:
+        return SQLiteStorage(path)
+    return ExcelStorage(path)
+
+
+class ExcelStorage:
+    """Dataset kept in one worksheet; every write rewrites the whole workbook.
+
+    A feather snapshot next to the workbook (see :mod:`snapshot`) serves reads
+    while the workbook is unchanged, and is rebuilt whenever it goes stale.
+    Per-item aggregates are kept in a second snapshot validated the same way.
+
+    Writers serialize on an advisory lock next to the workbook. Upserts are
+    first appended to a journal; whichever writer takes the lock applies every
+    pending entry in one rewrite (group commit), so concurrent producers share
+    rewrites instead of each paying for one. Entries left by a writer that died
+    after replacing the workbook but before truncating the journal are replayed
+    by the next upsert, which only rewrites the values they already hold.
+
+    :meth:`save` discards pending entries under the same lock, just before it
+    replaces the workbook, so old entries cannot resurface over the saved data.
+    Upserts still waiting for the lock then count as committed before the save.
+    """
 
-    if existing.empty:
-        combined = incoming
-    else:
-        combined = pd.concat([existing, incoming], ignore_index=True)
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.journal_path = path.with_name(f".{path.name}.journal")
+        self._write_lock = FileLock(path.with_name(f".{path.name}.lock"))
+        self._journal_lock = FileLock(path.with_name(f".{path.name}.journal.lock"))
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def load(self) -> DataFrame:
+        cached = read_snapshot(self.path)
+        if cached is not None:
+            return _normalize_dataset(cached)
+
+        signature = source_signature(self.path)  # before parsing, in case the workbook is replaced meanwhile
+        df = pd.read_excel(self.path, sheet_name=WORKSHEET_NAME, dtype={"year": int})
+        normalized = _normalize_dataset(df)
+        write_snapshot(self.path, normalized, signature=signature)
+        return normalized
+
+    def save(self, df: DataFrame) -> None:
+        normalized = _normalize_dataset(df)
+        with self._write_lock:
+            _, consumed = self._read_journal()
+            self._write(normalized, before_replace=lambda: self._truncate_journal(consumed) if consumed else None)
+
+    def _write(self, normalized: DataFrame, *, before_replace: Optional[Callable[[], None]] = None) -> None:
+        normalized = normalized.sort_values(by=["item", "year"], kind="mergesort", ignore_index=True)
+        ensure_directory(self.path)
+        tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+        try:
+            _write_worksheet(tmp_path, normalized)
+            if before_replace is not None:
+                before_replace()
+            os.replace(tmp_path, self.path)
+        finally:
+            tmp_path.unlink(missing_ok=True)
+        write_snapshot(self.path, normalized)
+
+    def upsert(self, incoming: DataFrame) -> int:
+        entry_id = self._append_journal(incoming)
+        with self._write_lock:
+            entries, consumed = self._read_journal()
+            if entry_id not in {pending_id for pending_id, _ in entries}:
+                # Another writer already committed this batch with its own
+                return len(self.load())
+            batch = pd.concat([frame for _, frame in entries], ignore_index=True)
+            rows = self._apply(_normalize_dataset(batch))
+            self._truncate_journal(consumed)
+        return rows
+
+    def _append_journal(self, incoming: DataFrame) -> str:
+        entry_id = uuid.uuid4().hex
+        line = json.dumps(
+            {"id": entry_id, "rows": {column: incoming[column].tolist() for column in REQUIRED_COLUMNS}}
+        )
+        with self._journal_lock:
+            fd = os.open(self.journal_path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                size = os.fstat(fd).st_size
+                if size:
+                    os.lseek(fd, size - 1, os.SEEK_SET)
+                    if os.read(fd, 1) != b"\n":
+                        line = "\n" + line  # never glue onto a torn line left by a crash
+                os.write(fd, (line + "\n").encode("utf-8"))
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        return entry_id
+
+    def _read_journal(self) -> tuple[list[tuple[str, DataFrame]], int]:
+        """Return the pending ``(id, rows)`` entries in order and the bytes they span."""
+
+        with self._journal_lock:
+            try:
+                content = self.journal_path.read_bytes()
+            except FileNotFoundError:
+                return [], 0
+        consumed = content.rfind(b"\n") + 1  # a torn tail is skipped until a newline closes it
+        entries = []
+        for line in content[:consumed].splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # torn write from a crashed writer
+            entries.append((entry["id"], pd.DataFrame(entry["rows"], columns=REQUIRED_COLUMNS)))
+        return entries, consumed
+
+    def _truncate_journal(self, consumed: int) -> None:
+        """Drop the first *consumed* bytes, keeping entries appended since they were read."""
+
+        with self._journal_lock:
+            remainder = self.journal_path.read_bytes()[consumed:]
+            if not remainder:
+                self.journal_path.unlink(missing_ok=True)
+                return
+            tmp_path = self.journal_path.with_name(self.journal_path.name + ".tmp")
+            tmp_path.write_bytes(remainder)
+            os.replace(tmp_path, self.journal_path)
+
+    def _apply(self, incoming: DataFrame) -> int:
+        exists = self.exists()
+        existing = self.load() if exists else _empty_dataset()
+        stats = self._stored_stats() if exists else None
+        incoming = incoming.drop_duplicates(subset=["item", "year"], keep="last")
+
+        if existing.empty:
+            combined = incoming
+        else:
+            combined = pd.concat([existing, incoming], ignore_index=True)
         combined = combined.drop_duplicates(subset=["item", "year"], keep="last")
 
-    save_prices(combined, path)
-    return combined
+        if stats is None:
+            stats = _item_stats(existing)
+        changes = incoming.merge(
+            existing[["item", "year", "price"]].rename(columns={"price": "old_price"}),
+            on=["item", "year"],
+            how="left",
+        )
+        updated, dirty = _update_item_stats(stats.loc[stats["item"].isin(changes["item"])], changes)
+        if dirty:
+            updated = pd.concat(
+                [updated.loc[~updated["item"].isin(dirty)], _item_stats(combined.loc[combined["item"].isin(dirty)])]
+            )
+        stats = pd.concat([stats.loc[~stats["item"].isin(updated["item"])], updated], ignore_index=True)
+
+        self._write(combined)
+        write_snapshot(self.path, stats.sort_values("item", kind="mergesort"), kind=_STATS_SNAPSHOT)
+        return len(combined)
+
+    def item_stats(self) -> DataFrame:
+        stats = self._stored_stats()
+        if stats is None:
+            signature = source_signature(self.path)
+            stats = _item_stats(self.load())
+            write_snapshot(self.path, stats, kind=_STATS_SNAPSHOT, signature=signature)
+        return stats
+
+    def _stored_stats(self) -> Optional[DataFrame]:
+        return read_snapshot(self.path, kind=_STATS_SNAPSHOT)
+
+
+def _write_worksheet(path: Path, df: DataFrame) -> None:
+    """Stream *df* into a single-sheet workbook at *path*.
+
+    openpyxl's write-only mode serializes rows as they are appended, so memory
+    stays flat as the dataset grows; rows are converted a chunk at a time.
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(WORKSHEET_NAME)
+    sheet.append(list(df.columns))
+    for start in range(0, len(df), EXCEL_WRITE_CHUNK_ROWS):
+        chunk = df.iloc[start : start + EXCEL_WRITE_CHUNK_ROWS]
+        for row in zip(*(chunk[column].tolist() for column in df.columns)):
+            sheet.append(row)
+    workbook.save(path)
 
 
-def summarize_by_item(df: DataFrame) -> DataFrame:
-    """Return aggregate statistics per item."""
+class SQLiteStorage:
+    """Dataset kept in a SQLite table keyed by ``(item, year)``.
 
-    normalized = _normalize_dataset(df)
-    summary = (
-        normalized.groupby("item")
+    Upserts touch only the incoming rows inside one transaction. WAL mode and
+    a busy timeout let several writers share the file safely. An
+    ``item_stats`` table holds per-item aggregates, updated in the same
+    transaction from the rows each upsert inserts or overwrites.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def load(self) -> DataFrame:
+        with closing(self._connect()) as conn:
+            df = pd.read_sql_query(
+                f"SELECT {', '.join(REQUIRED_COLUMNS)} FROM prices ORDER BY item, year", conn
+            )
+        return _normalize_dataset(df)
+
+    def save(self, df: DataFrame) -> None:
+        normalized = _normalize_dataset(df).drop_duplicates(subset=["item", "year"], keep="last")
+        with closing(self._connect()) as conn, _transaction(conn):
+            conn.execute("DELETE FROM prices")
+            conn.executemany(_SQLITE_UPSERT, _frame_rows(normalized))
+            self._rebuild_stats(conn)
+
+    def upsert(self, incoming: DataFrame) -> int:
+        incoming = incoming.drop_duplicates(subset=["item", "year"], keep="last")
+        with closing(self._connect()) as conn:
+            with _transaction(conn):
+                self._ensure_stats(conn)
+                conn.execute("CREATE TEMP TABLE IF NOT EXISTS batch (item TEXT, year INTEGER, price REAL)")
+                conn.execute("DELETE FROM batch")
+                conn.executemany(
+                    "INSERT INTO batch VALUES (?, ?, ?)",
+                    zip(incoming["item"].tolist(), incoming["year"].tolist(), incoming["price"].tolist()),
+                )
+                changes = pd.read_sql_query(
+                    "SELECT b.item, b.year, b.price, p.price AS old_price "
+                    "FROM batch b LEFT JOIN prices p ON p.item = b.item AND p.year = b.year",
+                    conn,
+                )
+                stats = pd.read_sql_query(
+                    f"SELECT {', '.join(STATS_COLUMNS)} FROM item_stats "
+                    "WHERE item IN (SELECT DISTINCT item FROM batch)",
+                    conn,
+                )
+
+                conn.executemany(_SQLITE_UPSERT, _frame_rows(incoming))
+
+                updated, dirty = _update_item_stats(stats, changes)
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO item_stats ({', '.join(STATS_COLUMNS)}) "
+                    f"VALUES ({', '.join('?' * len(STATS_COLUMNS))})",
+                    updated.loc[~updated["item"].isin(dirty), STATS_COLUMNS].itertuples(index=False, name=None),
+                )
+                if dirty:
+                    # An old extreme was overwritten inward; only these items need a rescan
+                    conn.execute("CREATE TEMP TABLE IF NOT EXISTS dirty (item TEXT PRIMARY KEY)")
+                    conn.execute("DELETE FROM dirty")
+                    conn.executemany("INSERT INTO dirty VALUES (?)", ((item,) for item in dirty))
+                    conn.execute(_SQLITE_RECOMPUTE_STATS + " WHERE item IN (SELECT item FROM dirty) GROUP BY item")
+            return conn.execute("SELECT COUNT(*) FROM prices").fetchone()[0]
+
+    def item_stats(self) -> DataFrame:
+        with closing(self._connect()) as conn:
+            with _transaction(conn):
+                self._ensure_stats(conn)
+            return pd.read_sql_query(
+                f"SELECT {', '.join(STATS_COLUMNS)} FROM item_stats ORDER BY item", conn
+            )
+
+    def _ensure_stats(self, conn: sqlite3.Connection) -> None:
+        # Databases written before item_stats existed get it built once
+        has_stats = conn.execute("SELECT EXISTS (SELECT 1 FROM item_stats)").fetchone()[0]
+        has_prices = conn.execute("SELECT EXISTS (SELECT 1 FROM prices)").fetchone()[0]
+        if has_prices and not has_stats:
+            self._rebuild_stats(conn)
+
+    def _rebuild_stats(self, conn: sqlite3.Connection) -> None:
+        conn.execute("DELETE FROM item_stats")
+        conn.execute(_SQLITE_RECOMPUTE_STATS + " GROUP BY item")
+
+    def _connect(self) -> sqlite3.Connection:
+        ensure_directory(self.path)
+        conn = sqlite3.connect(
+            self.path, timeout=SQLITE_BUSY_TIMEOUT_SECONDS, isolation_level=None
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS prices ("
+            "item TEXT NOT NULL, year INTEGER NOT NULL, currency TEXT NOT NULL, price REAL NOT NULL, "
+            "PRIMARY KEY (item, year))"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS item_stats ("
+            "item TEXT PRIMARY KEY, observations INTEGER NOT NULL, first_year INTEGER NOT NULL, "
+            "latest_year INTEGER NOT NULL, min_price REAL NOT NULL, max_price REAL NOT NULL, "
+            "price_sum REAL NOT NULL)"
+        )
+        return conn
+
+
+_SQLITE_UPSERT = (
+    "INSERT INTO prices (item, year, currency, price) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT(item, year) DO UPDATE SET currency = excluded.currency, price = excluded.price"
+)
+
+
+_SQLITE_RECOMPUTE_STATS = (
+    "INSERT OR REPLACE INTO item_stats "
+    "SELECT item, COUNT(*), MIN(year), MAX(year), MIN(price), MAX(price), SUM(price) FROM prices"
+)
+
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection) -> Iterator[None]:
+    # BEGIN IMMEDIATE takes the write lock up front so reads of old values
+    # and the writes that depend on them cannot interleave with other writers
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _item_stats(df: DataFrame) -> DataFrame:
+    """Compute stored per-item aggregates from scratch."""
+
+    if df.empty:
+        return pd.DataFrame(
+            {
+                "item": pd.Series(dtype=str),
+                "observations": pd.Series(dtype="int64"),
+                "first_year": pd.Series(dtype="int64"),
+                "latest_year": pd.Series(dtype="int64"),
+                "min_price": pd.Series(dtype=float),
+                "max_price": pd.Series(dtype=float),
+                "price_sum": pd.Series(dtype=float),
+            }
+        )
+    return (
+        df.groupby("item", observed=True)
         .agg(
             observations=("price", "count"),
             first_year=("year", "min"),
             latest_year=("year", "max"),
             min_price=("price", "min"),
             max_price=("price", "max"),
-            avg_price=("price", "mean"),
+            price_sum=("price", "sum"),
         )
-        .reset_index()
-        .sort_values(by="item")
+        .reset_index()[STATS_COLUMNS]
     )
-    return summary
 
 
-def compare_years(df: DataFrame, base_year: int, target_year: int) -> DataFrame:
-    """Compare price deltas for each item between two years."""
+def _update_item_stats(stats: DataFrame, changes: DataFrame) -> tuple[DataFrame, set[str]]:
+    """Fold a batch of writes into the stored aggregates of the affected items.
+
+    *changes* has one row per written ``(item, year)`` with the new ``price`` and
+    the ``old_price`` it replaced (NaN for inserts). Rows are never deleted, so
+    counts, sums and year bounds update exactly. Min/max only break when an
+    item's stored extreme is overwritten with a value further inside the
+    range; those items are returned as *dirty* and must be recomputed.
+    """
 
-    normalized = _normalize_dataset(df)
-    pivot = normalized.pivot_table(
-        index="item", columns="year", values="price", aggfunc="last"
+    if changes.empty:
+        return stats.iloc[:0], set()
+
+    changes = changes.assign(
+        inserted=changes["old_price"].isna(),
+        old_price=changes["old_price"].fillna(0.0),
+    )
+    changes["inserted_year"] = changes["year"].where(changes["inserted"])
+    batch = changes.groupby("item").agg(
+        added=("inserted", "sum"),
+        new_sum=("price", "sum"),
+        old_sum=("old_price", "sum"),
+        batch_min=("price", "min"),
+        batch_max=("price", "max"),
+        first_inserted=("inserted_year", "min"),
+        latest_inserted=("inserted_year", "max"),
     )
 
-    if base_year not in pivot.columns:
-        raise ValueError(f"Base year {base_year} not present in dataset")
-    if target_year not in pivot.columns:
-        raise ValueError(f"Target year {target_year} not present in dataset")
+    current = stats.set_index("item").reindex(batch.index)
+    updated = pd.DataFrame(
+        {
+            "observations": current["observations"].fillna(0) + batch["added"],
+            "first_year": pd.concat([current["first_year"], batch["first_inserted"]], axis=1).min(axis=1),
+            "latest_year": pd.concat([current["latest_year"], batch["latest_inserted"]], axis=1).max(axis=1),
+            "min_price": pd.concat([current["min_price"], batch["batch_min"]], axis=1).min(axis=1),
+            "max_price": pd.concat([current["max_price"], batch["batch_max"]], axis=1).max(axis=1),
+            "price_sum": current["price_sum"].fillna(0.0) + batch["new_sum"] - batch["old_sum"],
+        }
+    )
 
-    result = pivot[[base_year, target_year]].copy()
-    result["delta"] = result[target_year] - result[base_year]
-    result["pct_change"] = (result["delta"] / result[base_year]) * 100.0
-    return result.reset_index()
+    overwritten = changes.loc[~changes["inserted"]].join(current[["min_price", "max_price"]], on="item")
+    broken = (
+        (overwritten["old_price"] == overwritten["min_price"]) & (overwritten["price"] > overwritten["old_price"])
+    ) | ((overwritten["old_price"] == overwritten["max_price"]) & (overwritten["price"] < overwritten["old_price"]))
+    dirty = set(overwritten.loc[broken, "item"])
 
+    updated = updated.reset_index()
+    updated["observations"] = updated["observations"].astype("int64")
+    updated["first_year"] = updated["first_year"].astype("int64")
+    updated["latest_year"] = updated["latest_year"].astype("int64")
+    return updated[STATS_COLUMNS], dirty
 
-def filter_by_item(df: DataFrame, item: str) -> DataFrame:
+
+def _summary_from_stats(stats: DataFrame) -> DataFrame:
+    summary = stats.assign(avg_price=stats["price_sum"] / stats["observations"])
+    return summary.drop(columns="price_sum").sort_values(by="item").reset_index(drop=True)
+
+
+def _frame_rows(df: DataFrame) -> Iterable[tuple]:
+    return zip(
+        df["item"].tolist(),
+        df["year"].tolist(),
+        df["currency"].tolist(),
+        df["price"].tolist(),
+    )
+
+
+class PriceDataset:
+    """A normalized, sorted dataset with lookup indexes built once.
+
+    ``item`` and ``currency`` are stored as categoricals. Rows are sorted by
+    item then year, and row positions are indexed by case-folded item name and
+    by year, so queries slice the frame instead of re-normalizing and scanning it.
+    """
+
+    def __init__(self, df: DataFrame, *, normalized: bool = False) -> None:
+        frame = df if normalized else _normalize_dataset(df)
+        frame = frame.sort_values(by=["item", "year"], kind="mergesort").reset_index(drop=True)
+        frame["item"] = frame["item"].astype("category")
+        frame["currency"] = frame["currency"].astype("category")
+        self.frame = frame
+
+        positions = pd.Series(np.arange(len(frame)))
+        self._item_index: Dict[str, np.ndarray] = {}
+        for code, rows in positions.groupby(frame["item"].cat.codes.to_numpy()).indices.items():
+            key = str(frame["item"].cat.categories[code]).casefold()
+            if key in self._item_index:
+                # Names differing only by case share one entry, ordered by year
+                merged = np.concatenate([self._item_index[key], rows])
+                rows = merged[np.argsort(frame["year"].to_numpy()[merged], kind="mergesort")]
+            self._item_index[key] = rows
+        self._year_index: Dict[int, np.ndarray] = {
+            int(year): rows for year, rows in positions.groupby(frame["year"].to_numpy()).indices.items()
+        }
+        self._pivot: Optional[DataFrame] = None
+
+    @classmethod
+    def load(cls, path: Path | str, *, create_if_missing: bool = False) -> "PriceDataset":
+        return cls(load_prices(path, create_if_missing=create_if_missing), normalized=True)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @property
+    def empty(self) -> bool:
+        return self.frame.empty
+
+    def years(self) -> list[int]:
+        return sorted(self._year_index)
+
+    def by_item(self, item: str) -> DataFrame:
+        """Rows for *item* (case-insensitive), ordered by year."""
+
+        rows = self._item_index.get(item.strip().casefold())
+        return self.frame.iloc[rows] if rows is not None else self.frame.iloc[:0]
+
+    def by_year(self, year: int) -> DataFrame:
+        """Rows for *year*, ordered by item."""
+
+        rows = self._year_index.get(int(year))
+        return self.frame.iloc[rows] if rows is not None else self.frame.iloc[:0]
+
+    def summary(self) -> DataFrame:
+        """Aggregate statistics per item."""
+
+        return (
+            self.frame.groupby("item", observed=True)
+            .agg(
+                observations=("price", "count"),
+                first_year=("year", "min"),
+                latest_year=("year", "max"),
+                min_price=("price", "min"),
+                max_price=("price", "max"),
+                avg_price=("price", "mean"),
+            )
+            .reset_index()
+            .sort_values(by="item")
+        )
+
+    def pivot(self) -> DataFrame:
+        """Item x year price matrix, built on first use and reused afterwards."""
+
+        if self._pivot is None:
+            self._pivot = self.frame.pivot_table(
+                index="item", columns="year", values="price", aggfunc="last", observed=True
+            )
+        return self._pivot
+
+    def compare(self, base_year: int, target_year: int) -> DataFrame:
+        """Price deltas for each item between two years."""
+
+        for label, year in (("Base", base_year), ("Target", target_year)):
+            if int(year) not in self._year_index:
+                raise ValueError(f"{label} year {year} not present in dataset")
+
+        result = self.pivot()[[base_year, target_year]].copy()
+        result["delta"] = result[target_year] - result[base_year]
+        result["pct_change"] = (result["delta"] / result[base_year]) * 100.0
+        return result.reset_index()
+
+    def compare_matrix(self, years: Optional[Iterable[int]] = None) -> DataFrame:
+        """Deltas, percent changes and CAGR for every pair of *years* (default: all).
+
+        Returns one row per item and ``base_year < target_year`` pair where both
+        prices exist, computed from the pivot in a single broadcast.
+        """
+
+        chosen = sorted({int(year) for year in years}) if years else self.years()
+        missing = [year for year in chosen if year not in self._year_index]
+        if missing:
+            raise ValueError("Years not present in dataset: " + ", ".join(map(str, missing)))
+        if len(chosen) < 2:
+            raise ValueError("At least two years are needed for a comparison matrix")
+
+        pivot = self.pivot()[chosen]
+        prices = pivot.to_numpy(dtype=float)
+        base_idx, target_idx = np.triu_indices(len(chosen), k=1)
+        base = prices[:, base_idx]
+        target = prices[:, target_idx]
+        spans = (np.asarray(chosen)[target_idx] - np.asarray(chosen)[base_idx]).astype(float)
+
+        delta = target - base
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pct_change = np.where(base != 0, delta / base * 100.0, np.nan)
+            growth = np.where((base > 0) & (target > 0), target / base, np.nan)
+            cagr = (np.power(growth, 1.0 / spans) - 1.0) * 100.0
+
+        pairs = len(base_idx)
+        result = pd.DataFrame(
+            {
+                "item": np.repeat(pivot.index.astype(str).to_numpy(), pairs),
+                "base_year": np.tile(np.asarray(chosen)[base_idx], len(pivot)),
+                "target_year": np.tile(np.asarray(chosen)[target_idx], len(pivot)),
+                "base_price": base.ravel(),
+                "target_price": target.ravel(),
+                "delta": delta.ravel(),
+                "pct_change": pct_change.ravel(),
+                "cagr": cagr.ravel(),
+            }
+        )
+        return result.dropna(subset=["base_price", "target_price"]).reset_index(drop=True)
+
+
+def load_dataset(path: Path | str, *, create_if_missing: bool = False) -> PriceDataset:
+    """Load *path* into an indexed :class:`PriceDataset`."""
+
+    return PriceDataset.load(path, create_if_missing=create_if_missing)
+
+
+def summarize_by_item(df: DataFrame | PriceDataset) -> DataFrame:
+    """Return aggregate statistics per item."""
+
+    return _as_dataset(df).summary()
+
+
+def compare_years(df: DataFrame | PriceDataset, base_year: int, target_year: int) -> DataFrame:
+    """Compare price deltas for each item between two years."""
+
+    return _as_dataset(df).compare(base_year, target_year)
+
+
+def compare_matrix(df: DataFrame | PriceDataset, years: Optional[Iterable[int]] = None) -> DataFrame:
+    """Compare every pair of *years* for each item in one pass."""
+
+    return _as_dataset(df).compare_matrix(years)
+
+
+def filter_by_item(df: DataFrame | PriceDataset, item: str) -> DataFrame:
     """Return all rows for the requested *item*."""
 
-    normalized = _normalize_dataset(df)
-    mask = normalized["item"].str.lower() == item.lower()
-    return normalized.loc[mask].sort_values(by="year")
+    return _as_dataset(df).by_item(item)
 
 
-def filter_by_year(df: DataFrame, year: int) -> DataFrame:
+def filter_by_year(df: DataFrame | PriceDataset, year: int) -> DataFrame:
     """Return all rows for the requested *year*."""
 
-    normalized = _normalize_dataset(df)
-    return normalized.loc[normalized["year"] == year]
+    return _as_dataset(df).by_year(year)
+
+
+def _as_dataset(df: DataFrame | PriceDataset) -> PriceDataset:
+    return df if isinstance(df, PriceDataset) else PriceDataset(df)
 
 
-def _records_to_frame(records: Iterable[PriceRecord]) -> DataFrame:
+def records_to_frame(records: Iterable[PriceRecord]) -> DataFrame:
     data = [record.__dict__ for record in records]
     if not data:
         return _empty_dataset()
     return _normalize_dataset(pd.DataFrame(data))
 
 
+def split_valid_rows(df: DataFrame) -> tuple[DataFrame, DataFrame]:
+    """Split *df* into normalized valid rows and rejected rows.
+
+    Applies the :func:`_normalize_dataset` rules row by row instead of failing
+    the whole frame: item and currency must be non-empty, year a whole number
+    and price numeric. Rejected rows keep their original values plus a
+    ``reason`` column. Missing columns still raise ``ValueError``.
+    """
+
+    renamed = df.rename(columns={orig: str(orig).lower() for orig in df.columns})
+
+    missing = [col for col in REQUIRED_COLUMNS if col not in renamed.columns]
+    if missing:
+        raise ValueError(
+            "Dataset is missing required columns: " + ", ".join(sorted(missing))
+        )
+
+    original = renamed[REQUIRED_COLUMNS]
+    item = original["item"].astype("string").str.strip()
+    currency = original["currency"].astype("string").str.strip().str.upper()
+    year = pd.to_numeric(original["year"], errors="coerce")
+    price = pd.to_numeric(original["price"], errors="coerce")
+
+    reason = pd.Series(pd.NA, index=original.index, dtype="string")
+    checks = [
+        ("missing item", item.isna() | (item == "")),
+        ("missing currency", currency.isna() | (currency == "")),
+        ("invalid year", year.isna() | (year % 1 != 0)),
+        ("invalid price", price.isna()),
+    ]
+    for label, failed in reversed(checks):  # report the first failing rule
+        reason = reason.mask(failed.fillna(True), label)
+
+    rejected_mask = reason.notna().to_numpy()
+    valid = pd.DataFrame(
+        {
+            "item": item[~rejected_mask].astype(str),
+            "year": year[~rejected_mask].astype(int),
+            "currency": currency[~rejected_mask].astype(str),
+            "price": price[~rejected_mask].astype(float),
+        }
+    )
+    rejected = original.loc[rejected_mask].assign(reason=reason[rejected_mask].astype(str))
+    return valid.reset_index(drop=True), rejected
+
+
+def _require_prices(normalized: DataFrame) -> DataFrame:
+    """Reject rows without a price before they reach either backend."""
+
+    missing = normalized["price"].isna()
+    if missing.any():
+        examples = ", ".join(
+            f"{row.item} ({row.year})" for row in normalized.loc[missing, ["item", "year"]].head(3).itertuples()
+        )
+        raise ValueError(f"{int(missing.sum())} row(s) have no price, e.g. {examples}")
+    return normalized
+
+
 def _empty_dataset() -> DataFrame:
     return pd.DataFrame(columns=REQUIRED_COLUMNS)
 
@@ -5,128 +5,128 @@ from __future__ import annotations
 import json
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Optional
 
+import numpy as np
 import pandas as pd
 
+from . import instrumentation
 from .clean_workbook import CLEAN_ROOT
-from .impute_prices import _load_daily_index_records
+from .repository import PriceRepository
 
 MOBILE_CURRENT_JSON = Path("mobile/assets/data/current_prices.json")
 DAYS_TO_SHOW = 30  # Show last 30 days of fetched prices
 
 
-def export_current_prices() -> Path:
-    """Export the latest DA prices to JSON for mobile consumption."""
-    observed = _load_daily_index_records()
-    
-    if observed.empty:
-        # Fallback: read from latest CSV files
-        observed = _load_from_latest_csvs()
-    
+def export_current_prices(*, shard: bool = False, repository: Optional[PriceRepository] = None) -> Path:
+    """Export the latest DA prices to JSON for mobile consumption.
+
+    With ``shard`` the payload is also written as per-item shards. The run's
+    ``repository`` supplies already-parsed PDF prices and cleaned CSVs.
+    """
+    repository = repository or PriceRepository()
+    with instrumentation.stage("export") as record:
+        observed = repository.observed()
+
+        if observed.empty:
+            # Fallback: read from latest CSV files
+            observed = _load_from_latest_csvs(repository)
+
+        payload = _build_payload(observed)
+
+        MOBILE_CURRENT_JSON.parent.mkdir(parents=True, exist_ok=True)
+        with MOBILE_CURRENT_JSON.open("w", encoding="utf-8") as stream:
+            json.dump(payload, stream, indent=2)
+        if shard:
+            from .mobile_shards import write_shards
+
+            write_shards("current_prices", payload)
+        record.rows(rows_in=len(observed), rows_out=len(payload["items"]))
+
+    return MOBILE_CURRENT_JSON
+
+
+def _build_payload(observed: pd.DataFrame) -> dict:
+    """Build the mobile payload from ``item``/``date``/``price`` rows in one pass."""
     if observed.empty:
-        payload = {
+        return {
             "generatedAt": datetime.now(timezone.utc).isoformat(),
             "latestDate": None,
             "items": [],
         }
-    else:
-        # Get the latest date
-        latest_date = observed["date"].max()
-        cutoff_date = latest_date - pd.Timedelta(days=DAYS_TO_SHOW)
-        
-        # Filter to recent dates
-        recent = observed[observed["date"] >= cutoff_date].copy()
-        
-        # Group by item and date
-        items_payload = []
-        for item_name, item_group in recent.groupby("item"):
-            dates_payload = []
-            for _, row in item_group.sort_values("date").iterrows():
-                dates_payload.append({
-                    "date": row["date"].strftime("%Y-%m-%d"),
-                    "price": round(float(row["price"]), 2),
-                })
-            
-            if dates_payload:
-                items_payload.append({
-                    "name": item_name,
-                    "prices": dates_payload,
-                })
-        
-        items_payload.sort(key=lambda entry: entry["name"].lower())
-        
-        payload = {
-            "generatedAt": datetime.now(timezone.utc).isoformat(),
-            "latestDate": latest_date.strftime("%Y-%m-%d"),
-            "daysShown": DAYS_TO_SHOW,
-            "items": items_payload,
+
+    latest_date = observed["date"].max()
+    cutoff_date = latest_date - pd.Timedelta(days=DAYS_TO_SHOW)
+
+    recent = observed.loc[observed["date"] >= cutoff_date, ["item", "date", "price"]]
+    recent = recent.sort_values(["item", "date"], kind="mergesort")
+
+    # Format every row at once, then slice the flat lists at item boundaries
+    names = recent["item"].to_numpy()
+    dates = recent["date"].dt.strftime("%Y-%m-%d").tolist()
+    # Python's round, not Series.round: numpy rounds some half-way cents the other way
+    prices = [round(price, 2) for price in recent["price"].astype(float).tolist()]
+    starts = np.flatnonzero(np.r_[True, names[1:] != names[:-1]]) if len(names) else np.array([], dtype=int)
+    ends = np.r_[starts[1:], len(names)]
+
+    items_payload = [
+        {
+            "name": names[start],
+            "prices": [{"date": day, "price": price} for day, price in zip(dates[start:end], prices[start:end])],
         }
-    
-    MOBILE_CURRENT_JSON.parent.mkdir(parents=True, exist_ok=True)
-    with MOBILE_CURRENT_JSON.open("w", encoding="utf-8") as stream:
-        json.dump(payload, stream, indent=2)
-    
-    return MOBILE_CURRENT_JSON
+        for start, end in zip(starts.tolist(), ends.tolist())
+    ]
+    items_payload.sort(key=lambda entry: entry["name"].lower())
 
+    return {
+        "generatedAt": datetime.now(timezone.utc).isoformat(),
+        "latestDate": latest_date.strftime("%Y-%m-%d"),
+        "daysShown": DAYS_TO_SHOW,
+        "items": items_payload,
+    }
 
-def _load_from_latest_csvs() -> pd.DataFrame:
+
+def _load_from_latest_csvs(repository: PriceRepository) -> pd.DataFrame:
     """Fallback: load from the latest CSV files in cleaned directory."""
+    empty = pd.DataFrame(columns=["item", "date", "price"])
     if not CLEAN_ROOT.exists():
-        return pd.DataFrame(columns=["item", "date", "price"])
-    
-    records = []
-    
-    # Find the latest year
-    all_years = []
+        return empty
+
+    # One scan: remember each item's yearly files, then read only the latest year
+    files_by_year: dict[int, list[tuple[str, Path]]] = {}
     for item_dir in CLEAN_ROOT.iterdir():
         if not item_dir.is_dir():
             continue
         for csv_file in item_dir.glob("*.csv"):
             try:
                 year = int(csv_file.stem)
-                all_years.append(year)
             except ValueError:
                 continue
-    
-    if not all_years:
-        return pd.DataFrame(columns=["item", "date", "price"])
-    
-    latest_year = max(all_years)
-    
-    # Load data from latest year
-    for item_dir in CLEAN_ROOT.iterdir():
-        if not item_dir.is_dir():
-            continue
-        
-        item_name = item_dir.name
-        csv_file = item_dir / f"{latest_year}.csv"
-        
-        if not csv_file.exists():
-            continue
-        
+            files_by_year.setdefault(year, []).append((item_dir.name, csv_file))
+
+    if not files_by_year:
+        return empty
+
+    frames = []
+    for item_name, csv_file in files_by_year[max(files_by_year)]:
         try:
-            df = pd.read_csv(csv_file, parse_dates=["date"])
-            for _, row in df.iterrows():
-                if pd.notna(row.get("price")):
-                    records.append({
-                        "item": item_name,
-                        "date": pd.Timestamp(row["date"]),
-                        "price": float(row["price"]),
-                    })
+            df = repository.read_csv(csv_file)[["date", "price"]]
         except Exception:
             continue
-    
-    if not records:
-        return pd.DataFrame(columns=["item", "date", "price"])
-    
-    df = pd.DataFrame(records)
+        frames.append(df.assign(item=item_name))
+
+    if not frames:
+        return empty
+
+    df = pd.concat(frames, ignore_index=True)[["item", "date", "price"]]
+    df = df.loc[df["price"].notna()]
+    if df.empty:
+        return empty
+    df["price"] = df["price"].astype(float)
+
     # Get only the most recent dates
-    if not df.empty:
-        latest_date = df["date"].max()
-        cutoff = latest_date - pd.Timedelta(days=DAYS_TO_SHOW)
-        df = df[df["date"] >= cutoff]
-    
-    return df
+    cutoff = df["date"].max() - pd.Timedelta(days=DAYS_TO_SHOW)
+    return df.loc[df["date"] >= cutoff].reset_index(drop=True)
 
 
 def main() -> None:
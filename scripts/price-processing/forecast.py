@@ -3,16 +3,31 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import bisect
+import io
 import json
+import os
 from dataclasses import dataclass
 from datetime import date, datetime, timezone
 from pathlib import Path
-from typing import Dict, List
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Sequence
 
 import numpy as np
 import pandas as pd
 
+from . import instrumentation
+from .arima_pool import (
+    ARIMA_MAX_WORKERS,
+    ARIMA_MODEL_FILE,
+    ARIMA_TIMEOUT_SECONDS,
+    ArimaFit,
+    fit_arima,
+    run_bounded,
+)
 from .clean_workbook import CLEAN_ROOT, _safe_folder_name
+from .profiling import add_profile_arguments, profile_from_args
+from .repository import PriceRepository
 
 
 FORECAST_ROOT = Path("data/forecast")
@@ -20,6 +35,20 @@ MOBILE_FORECAST_JSON = Path("mobile/assets/data/forecasts.json")
 HORIZON_DAYS = 90
 HOLDOUT_DAYS = 45
 TREND_WINDOW_DAYS = 60  # Look back this many days to calculate current trend
+BLEND_DAYS = 7  # Ease from the last observed price into the seasonal forecast over this many days
+TREND_RATIO_CLIP = (0.5, 2.0)
+PARAMS_JSON = FORECAST_ROOT / "params.json"
+SWEEP_CSV = FORECAST_ROOT / "sweep.csv"
+BACKTEST_CSV = FORECAST_ROOT / "backtest.csv"
+BACKTEST_ORIGIN_STEP_DAYS = 7
+BACKTEST_LOOKBACK_DAYS = 730
+BACKTEST_MIN_TRAIN_DAYS = 365  # Need a full year before seasonal medians mean anything
+HORIZON_BUCKETS = ((1, 7), (8, 14), (15, 30), (31, 60), (61, 90))
+SWEEP_TREND_WINDOWS = (30, 45, 60, 90, 120)
+SWEEP_BLEND_DAYS = (0, 3, 7, 14)
+SWEEP_TREND_CLIPS = ((0.5, 2.0), (0.67, 1.5), (0.8, 1.25))
+MODEL_TYPES = ("seasonal_trend", "arima", "auto")
+_MONTH_DAY_SLOTS = 12 * 31
 
 
 @dataclass
@@ -29,6 +58,20 @@ class ForecastResult:
     metric: float | None
     output_path: Path
     model_type: str
+    frame: pd.DataFrame | None = None  # forecast.csv contents, kept to avoid re-reading it
+
+
+@dataclass(frozen=True)
+class SeasonalTrendParams:
+    """Tunable knobs of the seasonal-trend model (defaults are the module constants)."""
+
+    trend_window_days: int = TREND_WINDOW_DAYS
+    blend_days: int = BLEND_DAYS
+    clip_low: float = TREND_RATIO_CLIP[0]
+    clip_high: float = TREND_RATIO_CLIP[1]
+
+
+DEFAULT_PARAMS = SeasonalTrendParams()
 
 
 def _list_item_directories(root: Path) -> Dict[str, Path]:
@@ -39,10 +82,10 @@ def _list_item_directories(root: Path) -> Dict[str, Path]:
     return mapping
 
 
-def _load_item_series(item: str, directory: Path) -> pd.DataFrame:
+def _load_item_series(item: str, directory: Path, repository: PriceRepository) -> pd.DataFrame:
     frames: List[pd.DataFrame] = []
     for csv_path in sorted(directory.glob("*.csv")):
-        df = pd.read_csv(csv_path, parse_dates=["date"])
+        df = repository.read_csv(csv_path)
         if "price" not in df.columns:
             continue
         frames.append(df[["date", "price"]])
@@ -57,49 +100,152 @@ def _load_item_series(item: str, directory: Path) -> pd.DataFrame:
     return combined
 
 
-def _calculate_trend_ratio(series: pd.Series, historical_seasonal: pd.Series) -> float:
+def _month_day_keys(dates: pd.DatetimeIndex) -> np.ndarray:
+    """Map dates to a dense (month, day) slot so seasonal lookups become array gathers."""
+    index = pd.DatetimeIndex(dates)
+    return ((index.month - 1) * 31 + (index.day - 1)).to_numpy(dtype=np.intp)
+
+
+class _SeasonalTable:
+    """Historical prices bucketed by (month, day), kept sorted so medians update incrementally.
+
+    Adding a day of history only touches one bucket, which lets the backtest walk
+    forecast origins forward without regrouping the whole series at every step.
+    """
+
+    def __init__(self) -> None:
+        self._buckets: List[List[float]] = [[] for _ in range(_MONTH_DAY_SLOTS)]
+        self.median = np.full(_MONTH_DAY_SLOTS, np.nan)
+        self.count = np.zeros(_MONTH_DAY_SLOTS, dtype=np.int64)
+
+    def extend(self, keys: np.ndarray, values: np.ndarray) -> None:
+        touched = set()
+        for key, value in zip(keys.tolist(), values.tolist()):
+            if value != value:  # NaN check
+                continue
+            bisect.insort(self._buckets[key], value)
+            touched.add(key)
+
+        for key in touched:
+            bucket = self._buckets[key]
+            size = len(bucket)
+            mid = size // 2
+            self.median[key] = bucket[mid] if size % 2 else (bucket[mid - 1] + bucket[mid]) / 2.0
+            self.count[key] = size
+
+    def std(self, keys: np.ndarray) -> np.ndarray:
+        """Population standard deviation per key (NaN where fewer than two prices)."""
+        return np.array(
+            [float(np.std(self._buckets[key])) if self.count[key] > 1 else np.nan for key in keys.tolist()],
+            dtype=float,
+        )
+
+    def copy(self) -> "_SeasonalTable":
+        table = _SeasonalTable.__new__(_SeasonalTable)
+        table._buckets = [list(bucket) for bucket in self._buckets]
+        table.median = self.median.copy()
+        table.count = self.count.copy()
+        return table
+
+
+@dataclass
+class _SeasonalHistory:
+    """Seasonal tables of one item's series, extended in place when a later series only appends days.
+
+    ``train`` covers the series before the holdout (``None`` while the series is
+    too short to hold one out) and ``full`` the whole series.
+    """
+
+    start: pd.Timestamp
+    values: np.ndarray
+    holdout_days: int
+    train: _SeasonalTable | None
+    full: _SeasonalTable
+
+
+def _seasonal_history(
+    series: pd.Series, holdout_days: int, previous: _SeasonalHistory | None = None
+) -> _SeasonalHistory:
+    """Seasonal tables for *series*, reusing *previous* when *series* starts with exactly its values."""
+    values = series.to_numpy(dtype=float)
+    keys = _month_day_keys(series.index)
+    size = len(values)
+    train_end = size - holdout_days if size > holdout_days + 30 else None
+
+    if (
+        previous is not None
+        and previous.holdout_days == holdout_days
+        and previous.start == series.index[0]
+        and (previous.train is None) == (train_end is None)
+        and len(previous.values) <= size
+        and np.array_equal(values[: len(previous.values)], previous.values, equal_nan=True)
+    ):
+        old_size = len(previous.values)
+        if previous.train is not None:
+            old_train_end = old_size - holdout_days
+            previous.train.extend(keys[old_train_end:train_end], values[old_train_end:train_end])
+        previous.full.extend(keys[old_size:], values[old_size:])
+        previous.values = values
+        return previous
+
+    if train_end is None:
+        train = None
+        full = _SeasonalTable()
+        full.extend(keys, values)
+    else:
+        train = _SeasonalTable()
+        train.extend(keys[:train_end], values[:train_end])
+        full = train.copy()
+        full.extend(keys[train_end:], values[train_end:])
+    return _SeasonalHistory(series.index[0], values, holdout_days, train, full)
+
+
+def _calculate_trend_ratio(
+    values: np.ndarray,
+    keys: np.ndarray,
+    table: _SeasonalTable,
+    params: SeasonalTrendParams = DEFAULT_PARAMS,
+) -> float:
     """Calculate how current prices compare to historical seasonal averages.
     
     Returns a ratio: if > 1.0, prices are trending higher than historical;
     if < 1.0, prices are trending lower.
     
     Args:
-        series: Current price series with datetime index
-        historical_seasonal: Series with MultiIndex (month, day) -> median price
+        values: Current daily prices, oldest first
+        keys: Month-day slots matching ``values``
+        table: Seasonal medians built from the history available at this point
+        params: Trend window and ratio clip to use
     """
-    if len(series) < TREND_WINDOW_DAYS:
+    window = params.trend_window_days
+    if len(values) < window:
         return 1.0  # No trend data available
     
-    # Get recent prices (last TREND_WINDOW_DAYS)
-    recent = series.iloc[-TREND_WINDOW_DAYS:]
+    # Get recent prices (last trend_window_days)
+    recent = values[-window:]
+    recent = recent[~np.isnan(recent)]
+    if not len(recent):
+        return 1.0
     recent_mean = float(recent.mean())
     
-    if recent_mean <= 0 or recent_mean != recent_mean:  # NaN check
+    if recent_mean <= 0:
         return 1.0
     
-    # Get historical seasonal values for the same dates
-    recent_dates = recent.index
-    historical_values = []
-    for date in recent_dates:
-        month_day = (date.month, date.day)
-        # Look for same month-day in historical seasonal data (MultiIndex)
-        try:
-            if month_day in historical_seasonal.index:
-                historical_values.append(float(historical_seasonal.loc[month_day]))
-        except (KeyError, TypeError):
-            pass
+    # Get historical seasonal values for the same month-days
+    recent_keys = keys[-window:]
+    historical_values = table.median[recent_keys[table.count[recent_keys] > 0]]
     
-    if not historical_values:
+    if not len(historical_values):
         return 1.0
     
-    historical_mean = float(np.nanmean(historical_values))
+    historical_mean = float(historical_values.mean())
     if historical_mean <= 0 or historical_mean != historical_mean:
         return 1.0
     
     # Calculate trend ratio
     ratio = recent_mean / historical_mean
     # Cap extreme ratios to prevent unrealistic forecasts
-    return float(np.clip(ratio, 0.5, 2.0))
+    return float(np.clip(ratio, params.clip_low, params.clip_high))
 
 
 def _forecast_with_seasonal_trend(
@@ -107,22 +253,52 @@ def _forecast_with_seasonal_trend(
     *,
     horizon: int,
     holdout_days: int,
+    params: SeasonalTrendParams = DEFAULT_PARAMS,
+    history: _SeasonalHistory | None = None,
 ) -> tuple[pd.DataFrame, float | None]:
-    """Forecast using historical same-date prices adjusted by current trend."""
+    """Forecast using historical same-date prices adjusted by current trend.
+
+    *history* holds the seasonal tables for *series_df* (see ``_seasonal_history``);
+    they are built here when it is not given.
+    """
     series = series_df.set_index("ds")["y"].astype(float)
+    values = series.to_numpy()
+    keys = _month_day_keys(series.index)
     
-    # Build historical seasonal pattern: for each (month, day), get median price
-    series_with_dates = series_df.copy()
-    series_with_dates["ds"] = pd.to_datetime(series_with_dates["ds"])
-    series_with_dates["month"] = series_with_dates["ds"].dt.month
-    series_with_dates["day"] = series_with_dates["ds"].dt.day
-    series_with_dates = series_with_dates.dropna(subset=["y"])
+    # Historical seasonal pattern: median price for each (month, day), once
+    # from the training part and once from the whole series.
+    if history is None:
+        history = _seasonal_history(series, holdout_days)
+    table = history.full
     
-    # Group by month-day and get median (more robust than mean)
-    seasonal_pattern = series_with_dates.groupby(["month", "day"])["y"].median()
+    # Evaluate on holdout set if we have enough data
+    metric = None
+    if history.train is not None:
+        test_start_idx = len(series) - holdout_days
+        train_table = history.train
+        try:
+            train_values = values[:test_start_idx]
+            train_trend = _calculate_trend_ratio(train_values, keys[:test_start_idx], train_table, params)
+            
+            test_values = values[test_start_idx:]
+            test_keys = keys[test_start_idx:]
+            test_predictions = np.where(
+                train_table.count[test_keys] > 0,
+                train_table.median[test_keys] * train_trend,
+                float(train_values[-1]) * train_trend,
+            )
+            
+            # Calculate MAPE
+            with np.errstate(divide="ignore", invalid="ignore"):
+                mape = np.abs((test_values - test_predictions) / 
+                             np.where(test_values != 0, test_values, np.nan))
+            if not np.isnan(mape).all():
+                metric = float(np.nanmean(mape) * 100)
+        except Exception:
+            pass  # Evaluation failed, metric stays None
     
     # Calculate current trend ratio
-    trend_ratio = _calculate_trend_ratio(series, seasonal_pattern)
+    trend_ratio = _calculate_trend_ratio(values, keys, table, params)
     
     # Generate future dates - always start from day after last actual price
     # This ensures smooth transition from historical data to forecast
@@ -130,157 +306,644 @@ def _forecast_with_seasonal_trend(
     start_date = last_date + pd.Timedelta(days=1)
     
     future_dates = pd.date_range(start_date, periods=horizon, freq="D")
-    
-    # For each future date, get historical seasonal value and apply trend
-    forecasts = []
-    lower_bounds = []
-    upper_bounds = []
+    future_keys = _month_day_keys(future_dates)
     
     # Get last known price for smoothing transition
     # Use dropna() to ensure we get the actual last price, not a forward-filled NaN
     last_valid_series = series.dropna()
     last_known_price = float(last_valid_series.iloc[-1]) if len(last_valid_series) > 0 else None
     
-    for idx, future_date in enumerate(future_dates):
-        month = future_date.month
-        day = future_date.day
-        
-        # Get historical prices for this month-day
-        historical_prices = series_with_dates[
-            (series_with_dates["month"] == month) & (series_with_dates["day"] == day)
-        ]["y"].values
-        
-        if len(historical_prices) > 0:
-            # Use median for robustness
-            seasonal_value = float(np.nanmedian(historical_prices))
-            # Apply trend adjustment
-            forecast_value = seasonal_value * trend_ratio
-            
-            # Smooth transition: blend with last known price for first few days
-            # This prevents sudden jumps from current price to forecast
-            if idx < 7 and last_known_price is not None:  # First week
-                # Gradually transition: 100% last price on day 1, to 100% forecast by day 7
-                blend_factor = idx / 7.0
-                forecast_value = last_known_price * (1 - blend_factor) + forecast_value * blend_factor
-            
-            # Calculate confidence interval from historical variation
-            std_dev = float(np.nanstd(historical_prices)) if len(historical_prices) > 1 else seasonal_value * 0.1
-            lower = forecast_value - 1.96 * std_dev
-            upper = forecast_value + 1.96 * std_dev
-        else:
-            # No historical data for this date, use last known price with trend
-            forecast_value = float(series.iloc[-1]) * trend_ratio if last_known_price else 0
-            std_dev = float(series.std()) * 0.1 if len(series) > 1 else forecast_value * 0.1
-            lower = forecast_value - 1.96 * std_dev
-            upper = forecast_value + 1.96 * std_dev
-        
-        forecasts.append(max(0, forecast_value))  # Ensure non-negative
-        lower_bounds.append(max(0, lower))
-        upper_bounds.append(max(0, upper))
+    forecasts = _project_seasonal_trend(
+        table.median[future_keys],
+        table.count[future_keys],
+        trend_ratio=trend_ratio,
+        last_price=float(series.iloc[-1]),
+        last_known_price=last_known_price,
+        blend_days=params.blend_days,
+    )
     
-    # Evaluate on holdout set if we have enough data
-    metric = None
-    if len(series) > holdout_days + 30:
-        try:
-            # Use last holdout_days as test set
-            test_start_idx = len(series) - holdout_days
-            test_series = series.iloc[test_start_idx:]
-            
-            # Generate "forecasts" for test period using data up to test_start_idx
-            train_series = series.iloc[:test_start_idx]
-            train_df = pd.DataFrame({"ds": train_series.index, "y": train_series.values})
-            
-            # Recalculate seasonal pattern and trend from training data only
-            train_with_dates = train_df.copy()
-            train_with_dates["ds"] = pd.to_datetime(train_with_dates["ds"])
-            train_with_dates["month"] = train_with_dates["ds"].dt.month
-            train_with_dates["day"] = train_with_dates["ds"].dt.day
-            train_with_dates = train_with_dates.dropna(subset=["y"])
-            train_seasonal = train_with_dates.groupby(["month", "day"])["y"].median()
-            train_series_indexed = train_series
-            train_trend = _calculate_trend_ratio(train_series_indexed, train_seasonal)
-            
-            # Generate predictions for test dates
-            test_predictions = []
-            for test_date in test_series.index:
-                month = test_date.month
-                day = test_date.day
-                historical = train_with_dates[
-                    (train_with_dates["month"] == month) & (train_with_dates["day"] == day)
-                ]["y"].values
-                if len(historical) > 0:
-                    seasonal_val = float(np.nanmedian(historical))
-                    pred = seasonal_val * train_trend
-                else:
-                    pred = float(train_series.iloc[-1]) * train_trend
-                test_predictions.append(pred)
-            
-            # Calculate MAPE
-            with np.errstate(divide="ignore", invalid="ignore"):
-                mape = np.abs((test_series.values - np.array(test_predictions)) / 
-                             np.where(test_series.values != 0, test_series.values, np.nan))
-            if not np.isnan(mape).all():
-                metric = float(np.nanmean(mape) * 100)
-        except Exception:
-            pass  # Evaluation failed, metric stays None
+    # Confidence interval from historical variation on the same month-day;
+    # dates without history fall back to a share of the overall volatility
+    has_history = table.count[future_keys] > 0
+    std_dev = np.where(
+        table.count[future_keys] > 1,
+        table.std(future_keys),
+        table.median[future_keys] * 0.1,
+    )
+    fallback_std = float(series.std()) * 0.1 if len(series) > 1 else None
+    std_dev = np.where(has_history, std_dev, forecasts * 0.1 if fallback_std is None else fallback_std)
+    lower = forecasts - 1.96 * std_dev
+    upper = forecasts + 1.96 * std_dev
     
     output = pd.DataFrame(
         {
             "date": future_dates,
-            "forecast": forecasts,
-            "lower": lower_bounds,
-            "upper": upper_bounds,
+            "forecast": _non_negative(forecasts),  # Ensure non-negative
+            "lower": _non_negative(lower),
+            "upper": _non_negative(upper),
         }
     )
     return output, metric
 
 
+def _project_seasonal_trend(
+    seasonal: np.ndarray,
+    counts: np.ndarray,
+    *,
+    trend_ratio: np.ndarray | float,
+    last_price: np.ndarray | float,
+    last_known_price: np.ndarray | float | None,
+    blend_days: int = BLEND_DAYS,
+) -> np.ndarray:
+    """Turn seasonal medians into trend-adjusted forecasts along the last axis.
+
+    Works on a single origin (1-D arrays, scalar ratio/prices) or on many origins
+    at once (2-D arrays with one row per origin and column vectors for the rest).
+    """
+    trend_ratio = np.asarray(trend_ratio, dtype=float)
+    last_price = np.asarray(last_price, dtype=float)
+    known_price = np.asarray(np.nan if last_known_price is None else last_known_price, dtype=float)
+    forecasts = np.where(
+        counts > 0,
+        seasonal * trend_ratio,
+        # No historical data for this date, use last price with trend when a price is known.
+        # A NaN last price stays NaN, so its bounds are NaN too and publish as 0.
+        np.where(np.nan_to_num(known_price) != 0, last_price * trend_ratio, 0.0),
+    )
+    
+    # Smooth transition: blend with last known price for the first blend_days.
+    # This prevents sudden jumps from current price to forecast
+    if last_known_price is not None and blend_days > 0:
+        last_known_price = np.asarray(last_known_price, dtype=float)
+        steps = np.arange(seasonal.shape[-1])
+        # Gradually transition: 100% last price on day 1, to 100% forecast by day blend_days
+        blend_factor = np.minimum(steps / float(blend_days), 1.0)
+        blended = last_known_price * (1 - blend_factor) + forecasts * blend_factor
+        forecasts = np.where((counts > 0) & (steps < blend_days), blended, forecasts)
+    return forecasts
+
+
+def _non_negative(values: np.ndarray) -> np.ndarray:
+    return np.where(values > 0, values, 0.0)
+
+
+def _backtest_seasonal_trend(
+    series_df: pd.DataFrame,
+    *,
+    horizon: int,
+    origin_step: int,
+    lookback_days: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Replay the seasonal-trend forecast from rolling origins.
+
+    Origins are spaced ``origin_step`` days apart over the last ``lookback_days``.
+    The seasonal table is extended with the days between consecutive origins and
+    a snapshot of the medians each origin needs is taken, so all forecasts are
+    then produced in a single vectorized pass.
+
+    Returns ``(predictions, actuals)`` shaped ``(origins, horizon)``; actuals past
+    the end of the series are NaN.
+    """
+    series = series_df.set_index("ds")["y"].astype(float)
+    values = series.to_numpy()
+    keys = _month_day_keys(series.index)
+    size = len(values)
+
+    origins = _backtest_origins(size, origin_step=origin_step, lookback_days=lookback_days)
+    if not len(origins):
+        empty = np.empty((0, horizon))
+        return empty, empty
+
+    steps = np.arange(1, horizon + 1)
+    targets = origins[:, None] + steps[None, :]
+    in_range = targets < size
+    target_keys = keys[np.minimum(targets, size - 1)]
+
+    seasonal = np.empty(targets.shape)
+    counts = np.empty(targets.shape, dtype=np.int64)
+    trend_ratios = np.empty(len(origins))
+
+    table = _SeasonalTable()
+    filled = 0
+    for row, origin in enumerate(origins.tolist()):
+        table.extend(keys[filled : origin + 1], values[filled : origin + 1])
+        filled = origin + 1
+        trend_ratios[row] = _calculate_trend_ratio(values[:filled], keys[:filled], table)
+        seasonal[row] = table.median[target_keys[row]]
+        counts[row] = table.count[target_keys[row]]
+
+    last_prices = values[origins][:, None]
+    predictions = _project_seasonal_trend(
+        seasonal,
+        counts,
+        trend_ratio=trend_ratios[:, None],
+        last_price=last_prices,
+        last_known_price=last_prices,
+    )
+    predictions = _non_negative(predictions)
+    actuals = np.where(in_range, values[np.minimum(targets, size - 1)], np.nan)
+    return predictions, actuals
+
+
+def _backtest_origins(size: int, *, origin_step: int, lookback_days: int) -> np.ndarray:
+    """Positions of the last training day for each rolling origin."""
+    first_origin = max(size - 1 - lookback_days, BACKTEST_MIN_TRAIN_DAYS - 1)
+    return np.arange(first_origin, size - 1, origin_step)
+
+
+def _sweep_seasonal_trend(
+    series_df: pd.DataFrame,
+    *,
+    trend_windows: Sequence[int],
+    holdout_days: int,
+    blends: Sequence[int],
+    clips: Sequence[tuple[float, float]],
+    origin_step: int,
+    lookback_days: int,
+) -> List[dict[str, object]]:
+    """Score every parameter combination on the same rolling origins.
+
+    The seasonal table is walked forward once, like the backtest. At each origin
+    the recent and historical means for every trend window come from prefix
+    sums, so each extra grid point only costs one vectorized projection.
+    Each projection is scored over its first ``holdout_days`` days.
+    """
+    series = series_df.set_index("ds")["y"].astype(float)
+    values = series.to_numpy()
+    keys = _month_day_keys(series.index)
+    size = len(values)
+
+    origins = _backtest_origins(size, origin_step=origin_step, lookback_days=lookback_days)
+    if not len(origins):
+        return []
+
+    horizon = holdout_days
+    windows = np.asarray(trend_windows, dtype=np.intp)
+    widest = int(windows.max())
+    targets = origins[:, None] + np.arange(1, horizon + 1)[None, :]
+    in_range = targets < size
+    target_keys = keys[np.minimum(targets, size - 1)]
+
+    finite = ~np.isnan(values)
+    price_sums = np.concatenate([[0.0], np.cumsum(np.where(finite, values, 0.0))])
+    price_counts = np.concatenate([[0], np.cumsum(finite)])
+
+    seasonal = np.empty(targets.shape)
+    counts = np.empty(targets.shape, dtype=np.int64)
+    raw_ratios = np.ones((len(origins), len(windows)))
+
+    table = _SeasonalTable()
+    filled = 0
+    for row, origin in enumerate(origins.tolist()):
+        table.extend(keys[filled : origin + 1], values[filled : origin + 1])
+        filled = origin + 1
+        seasonal[row] = table.median[target_keys[row]]
+        counts[row] = table.count[target_keys[row]]
+
+        # Same guards as _calculate_trend_ratio, evaluated for every window at once
+        usable = windows <= filled
+        starts = np.maximum(filled - windows, 0)
+        recent_counts = price_counts[filled] - price_counts[starts]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            recent_means = (price_sums[filled] - price_sums[starts]) / recent_counts
+
+        recent_keys = keys[max(filled - widest, 0) : filled][::-1]  # most recent first
+        known = table.count[recent_keys] > 0
+        hist_sums = np.cumsum(np.where(known, table.median[recent_keys], 0.0))
+        hist_counts = np.cumsum(known)
+        last = np.minimum(windows, len(recent_keys)) - 1
+        with np.errstate(divide="ignore", invalid="ignore"):
+            hist_means = hist_sums[last] / hist_counts[last]
+
+        valid = usable & (recent_counts > 0) & (recent_means > 0) & (hist_counts[last] > 0) & (hist_means > 0)
+        raw_ratios[row] = np.where(valid, recent_means / hist_means, 1.0)
+
+    last_prices = values[origins][:, None]
+    actuals = np.where(in_range, values[np.minimum(targets, size - 1)], np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = np.where(actuals != 0, np.abs(actuals), np.nan)
+
+    rows: List[dict[str, object]] = []
+    for window_idx, window in enumerate(windows.tolist()):
+        for clip_low, clip_high in clips:
+            trend_ratios = np.clip(raw_ratios[:, window_idx], clip_low, clip_high)[:, None]
+            for blend_days in blends:
+                predictions = _non_negative(
+                    _project_seasonal_trend(
+                        seasonal,
+                        counts,
+                        trend_ratio=trend_ratios,
+                        last_price=last_prices,
+                        last_known_price=last_prices,
+                        blend_days=blend_days,
+                    )
+                )
+                abs_errors = np.abs(actuals - predictions)
+                pct_errors = abs_errors / scale
+                abs_points = np.count_nonzero(~np.isnan(abs_errors))
+                pct_points = np.count_nonzero(~np.isnan(pct_errors))
+                rows.append(
+                    {
+                        "trend_window_days": window,
+                        "blend_days": blend_days,
+                        "clip_low": clip_low,
+                        "clip_high": clip_high,
+                        "origins": len(origins),
+                        "mape": float(np.nansum(pct_errors) / pct_points * 100) if pct_points else None,
+                        "mae": float(np.nansum(abs_errors) / abs_points) if abs_points else None,
+                    }
+                )
+    return rows
+
+
+def _horizon_bucket_errors(predictions: np.ndarray, actuals: np.ndarray, horizon: int) -> List[dict[str, object]]:
+    abs_errors = np.abs(actuals - predictions)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct_errors = abs_errors / np.where(actuals != 0, np.abs(actuals), np.nan)
+
+    rows: List[dict[str, object]] = []
+    for low, high in HORIZON_BUCKETS:
+        if low > horizon:
+            break
+        high = min(high, horizon)
+        bucket_abs = abs_errors[:, low - 1 : high]
+        bucket_pct = pct_errors[:, low - 1 : high]
+        points = int(np.count_nonzero(~np.isnan(bucket_abs)))
+        rows.append(
+            {
+                "horizon": f"{low}-{high}",
+                "points": points,
+                "mape": float(np.nanmean(bucket_pct) * 100) if np.any(~np.isnan(bucket_pct)) else None,
+                "mae": float(np.nanmean(bucket_abs)) if points else None,
+            }
+        )
+    return rows
+
+
+def backtest_forecasts(
+    *,
+    horizon: int = HORIZON_DAYS,
+    origin_step: int = BACKTEST_ORIGIN_STEP_DAYS,
+    lookback_days: int = BACKTEST_LOOKBACK_DAYS,
+) -> pd.DataFrame:
+    """Evaluate the seasonal-trend model from rolling origins for every item.
+
+    Writes MAPE/MAE per horizon bucket to ``BACKTEST_CSV`` and returns the same table.
+    """
+    FORECAST_ROOT.mkdir(parents=True, exist_ok=True)
+
+    repository = PriceRepository()
+    item_dirs = _list_item_directories(CLEAN_ROOT)
+    display_map = _load_display_name_map(repository)
+    rows: List[dict[str, object]] = []
+
+    print(f"Backtesting {len(item_dirs)} items (origin every {origin_step} days over {lookback_days} days)...", flush=True)
+    for item, directory in item_dirs.items():
+        series = _load_item_series(item, directory, repository)
+        if series.empty:
+            continue
+
+        predictions, actuals = _backtest_seasonal_trend(
+            series, horizon=horizon, origin_step=origin_step, lookback_days=lookback_days
+        )
+        if not len(predictions):
+            continue
+
+        for bucket in _horizon_bucket_errors(predictions, actuals, horizon):
+            rows.append(
+                {
+                    "item": item,
+                    "display_name": display_map.get(item, item),
+                    "model": "seasonal_trend",
+                    "origins": len(predictions),
+                    **bucket,
+                }
+            )
+
+    report = pd.DataFrame(
+        rows, columns=["item", "display_name", "model", "origins", "horizon", "points", "mape", "mae"]
+    )
+    report.to_csv(BACKTEST_CSV, index=False)
+    return report
+
+
+def sweep_forecast_params(
+    *,
+    holdout_days: int = HOLDOUT_DAYS,
+    trend_windows: Sequence[int] = SWEEP_TREND_WINDOWS,
+    blends: Sequence[int] = SWEEP_BLEND_DAYS,
+    clips: Sequence[tuple[float, float]] = SWEEP_TREND_CLIPS,
+    origin_step: int = BACKTEST_ORIGIN_STEP_DAYS,
+    lookback_days: int = BACKTEST_LOOKBACK_DAYS,
+) -> pd.DataFrame:
+    """Score a grid of seasonal-trend parameters for every item in one pass.
+
+    Every grid point is written to ``SWEEP_CSV``. The best combination per item,
+    ranked by rolling-origin MAPE over the first ``holdout_days`` of the horizon,
+    is saved to ``PARAMS_JSON`` where ``generate_forecasts`` picks it up.
+    """
+    FORECAST_ROOT.mkdir(parents=True, exist_ok=True)
+
+    repository = PriceRepository()
+    item_dirs = _list_item_directories(CLEAN_ROOT)
+    grid_size = len(trend_windows) * len(blends) * len(clips)
+    print(f"Sweeping {grid_size} parameter combinations for {len(item_dirs)} items...", flush=True)
+
+    rows: List[dict[str, object]] = []
+    for item, directory in item_dirs.items():
+        series = _load_item_series(item, directory, repository)
+        if series.empty:
+            continue
+        for row in _sweep_seasonal_trend(
+            series,
+            trend_windows=trend_windows,
+            holdout_days=holdout_days,
+            blends=blends,
+            clips=clips,
+            origin_step=origin_step,
+            lookback_days=lookback_days,
+        ):
+            rows.append({"item": item, **row})
+
+    report = pd.DataFrame(
+        rows,
+        columns=[
+            "item",
+            "trend_window_days",
+            "blend_days",
+            "clip_low",
+            "clip_high",
+            "origins",
+            "mape",
+            "mae",
+        ],
+    )
+    report.to_csv(SWEEP_CSV, index=False)
+
+    best: Dict[str, dict[str, object]] = {}
+    scored = report.loc[report["mape"].notna()]
+    if not scored.empty:
+        winners = scored.loc[scored.groupby("item")["mape"].idxmin()]
+        for row in winners.itertuples(index=False):
+            best[row.item] = {
+                "trend_window_days": int(row.trend_window_days),
+                "blend_days": int(row.blend_days),
+                "clip_low": float(row.clip_low),
+                "clip_high": float(row.clip_high),
+                "mape": float(row.mape),
+            }
+
+    payload = {
+        "generatedAt": datetime.now(timezone.utc).isoformat(),
+        "items": best,
+    }
+    PARAMS_JSON.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    return report
+
+
+def _load_tuned_params() -> Dict[str, SeasonalTrendParams]:
+    mapping: Dict[str, SeasonalTrendParams] = {}
+    if not PARAMS_JSON.exists():
+        return mapping
+
+    try:
+        payload = json.loads(PARAMS_JSON.read_text(encoding="utf-8"))
+    except (json.JSONDecodeError, OSError):
+        return mapping
+
+    for item, entry in payload.get("items", {}).items():
+        try:
+            mapping[item] = SeasonalTrendParams(
+                trend_window_days=int(entry["trend_window_days"]),
+                blend_days=int(entry["blend_days"]),
+                clip_low=float(entry["clip_low"]),
+                clip_high=float(entry["clip_high"]),
+            )
+        except (KeyError, TypeError, ValueError):
+            continue
+    return mapping
+
+
 def _forecast_item(
     item: str,
     directory: Path,
     display_name: str,
+    repository: PriceRepository,
     *,
     horizon: int,
     holdout_days: int,
+    params: SeasonalTrendParams = DEFAULT_PARAMS,
+    model_type: str = "seasonal_trend",
+    arima_fit: ArimaFit | None = None,
+    histories: Dict[str, _SeasonalHistory] | None = None,
 ) -> ForecastResult | None:
-    series = _load_item_series(item, directory)
+    """Forecast one item with the requested ``model_type``.
+
+    ``"arima"`` and ``"auto"`` use ``arima_fit`` produced by the bounded pool in
+    ``generate_forecasts``; ``"auto"`` keeps whichever model scored the lower
+    holdout MAPE. Without a fit (timeout or failure) the item falls back to
+    ``"seasonal_trend"``. The item's seasonal tables are taken from and stored
+    back into *histories* when it is given.
+    """
+    if model_type not in MODEL_TYPES:
+        raise ValueError(f"Unknown model type '{model_type}'; expected one of {', '.join(MODEL_TYPES)}")
+
+    series = _load_item_series(item, directory, repository)
     if series.empty:
         return None
 
-    forecast_df, metric = _forecast_with_seasonal_trend(series, horizon=horizon, holdout_days=holdout_days)
-    model_type = "seasonal_trend"
+    history = None
+    if histories is not None:
+        # Taken out while it is extended, so a failure leaves no half-updated entry behind
+        previous = histories.pop(item, None)
+        history = _seasonal_history(series.set_index("ds")["y"].astype(float), holdout_days, previous)
+        histories[item] = history
+    forecast_df, metric = _forecast_with_seasonal_trend(
+        series, horizon=horizon, holdout_days=holdout_days, params=params, history=history
+    )
+    model_type_used = "seasonal_trend"
+
+    if arima_fit is not None and model_type != "seasonal_trend":
+        arima_wins = model_type == "arima" or (
+            arima_fit.metric is not None and (metric is None or arima_fit.metric < metric)
+        )
+        if arima_wins:
+            forecast_df = pd.DataFrame(
+                {
+                    "date": forecast_df["date"],
+                    "forecast": _non_negative(arima_fit.forecast),
+                    "lower": _non_negative(arima_fit.lower),
+                    "upper": _non_negative(arima_fit.upper),
+                }
+            )
+            metric = arima_fit.metric
+            model_type_used = "arima"
 
     item_dir = FORECAST_ROOT / _safe_folder_name(item)
     item_dir.mkdir(parents=True, exist_ok=True)
     output_path = item_dir / "forecast.csv"
-    forecast_df.to_csv(output_path, index=False)
+    text = forecast_df.to_csv(index=False)
+    with output_path.open("w", encoding="utf-8", newline="") as stream:
+        stream.write(text)
+    # Keep what a reader of forecast.csv gets; to_csv floats do not always round-trip
+    forecast_df = pd.read_csv(io.StringIO(text), parse_dates=["date"])
+
+    return ForecastResult(
+        item=item,
+        display_name=display_name,
+        metric=metric,
+        output_path=output_path,
+        model_type=model_type_used,
+        frame=forecast_df,
+    )
+
 
-    return ForecastResult(item=item, display_name=display_name, metric=metric, output_path=output_path, model_type=model_type)
+def _fit_item_arima(item: str, series: pd.DataFrame, *, horizon: int, holdout_days: int) -> ArimaFit:
+    """Pool job: fit or refresh the item's ARIMA on the series the parent loaded."""
+    cache_path = FORECAST_ROOT / _safe_folder_name(item) / ARIMA_MODEL_FILE
+    return fit_arima(series, cache_path, horizon=horizon, holdout_days=holdout_days)
+
+
+def iter_forecasts(
+    *,
+    horizon: int = HORIZON_DAYS,
+    holdout_days: int = HOLDOUT_DAYS,
+    model_type: str = "seasonal_trend",
+    max_workers: int = ARIMA_MAX_WORKERS,
+    timeout: float = ARIMA_TIMEOUT_SECONDS,
+    repository: Optional[PriceRepository] = None,
+    items: Optional[Iterable[str]] = None,
+    histories: Optional[Dict[str, _SeasonalHistory]] = None,
+) -> Iterator[ForecastResult]:
+    """Yield each item's ``ForecastResult`` as soon as it is written.
 
+    Items come out in directory order for ``seasonal_trend`` and in completion
+    order when ARIMA fits run in the worker pool. Nothing is aggregated; see
+    ``generate_forecasts`` for the summary CSV and mobile JSON. Cleaned CSVs
+    are read through *repository*, so a pipeline run that just wrote them does
+    not parse them again. *items* limits the run to those item directories.
+    *histories* keeps each item's seasonal tables between runs; a later run
+    only adds the days appended to a series since and rebuilds the tables of
+    an item whose earlier prices changed.
+    """
+    if model_type not in MODEL_TYPES:
+        raise ValueError(f"Unknown model type '{model_type}'; expected one of {', '.join(MODEL_TYPES)}")
 
-def generate_forecasts(*, horizon: int = HORIZON_DAYS, holdout_days: int = HOLDOUT_DAYS) -> List[ForecastResult]:
     FORECAST_ROOT.mkdir(parents=True, exist_ok=True)
 
+    repository = repository or PriceRepository()
     item_dirs = _list_item_directories(CLEAN_ROOT)
-    display_map = _load_display_name_map()
+    if items is not None:
+        wanted = set(items)
+        item_dirs = {item: directory for item, directory in item_dirs.items() if item in wanted}
+    display_map = _load_display_name_map(repository)
+    tuned_params = _load_tuned_params()
     total_items = len(item_dirs)
     if not total_items:
         print("No cleaned item directories found; skipping forecast generation.", flush=True)
-        return []
+        return
 
     print(f"Starting forecast generation for {total_items} items...", flush=True)
-    results: List[ForecastResult] = []
 
-    for idx, (item, directory) in enumerate(item_dirs.items(), start=1):
+    if model_type == "seasonal_trend":
+        fits: Iterable[tuple[str, ArimaFit | None, str | None]] = ((item, None, None) for item in item_dirs)
+    else:
+        print(f"Fitting ARIMA models with up to {max_workers} workers ({timeout:g}s per item)...", flush=True)
+        fits = run_bounded(
+            (
+                (
+                    item,
+                    _fit_item_arima,
+                    (item, _load_item_series(item, directory, repository)),
+                    {"horizon": horizon, "holdout_days": holdout_days},
+                )
+                for item, directory in item_dirs.items()
+            ),
+            max_workers=max_workers,
+            timeout=timeout,
+        )
+
+    for idx, (item, arima_fit, error) in enumerate(fits, start=1):
         display_name = display_map.get(item, item)
         print(f"[{idx}/{total_items}] Forecasting '{display_name}'...", flush=True)
-        result = _forecast_item(item, directory, display_name, horizon=horizon, holdout_days=holdout_days)
+        if error:
+            print(f"    [WARN] {display_name}: ARIMA {error}; falling back to seasonal_trend.", flush=True)
+        with instrumentation.item(item):
+            result = _forecast_item(
+                item,
+                item_dirs[item],
+                display_name,
+                repository,
+                horizon=horizon,
+                holdout_days=holdout_days,
+                params=tuned_params.get(item, DEFAULT_PARAMS),
+                model_type=model_type,
+                arima_fit=arima_fit,
+                histories=histories,
+            )
         if result:
-            results.append(result)
             print(f"    [OK] {display_name}: wrote {result.output_path.name} using {result.model_type}", flush=True)
+            yield result
         else:
             print(f"    [SKIP] {display_name}: no data available, skipped.", flush=True)
 
+
+async def aiter_forecasts(**kwargs) -> AsyncIterator[ForecastResult]:
+    """Async variant of ``iter_forecasts``; each item is computed in a worker thread.
+
+    When the consumer stops early or is cancelled, the item in progress is
+    allowed to finish and the generator is closed, which stops any ARIMA
+    worker processes.
+    """
+    loop = asyncio.get_running_loop()
+    iterator = iter_forecasts(**kwargs)
+    done = object()
+    step = None
+    try:
+        while True:
+            step = loop.run_in_executor(None, next, iterator, done)
+            result = await asyncio.shield(step)  # a cancelled await must not abandon a running next()
+            step = None
+            if result is done:
+                return
+            yield result
+    finally:
+        if step is not None:
+            await asyncio.wait([step])  # the generator cannot be closed while next() runs
+        await loop.run_in_executor(None, iterator.close)
+
+
+def generate_forecasts(
+    *,
+    horizon: int = HORIZON_DAYS,
+    holdout_days: int = HOLDOUT_DAYS,
+    model_type: str = "seasonal_trend",
+    max_workers: int = ARIMA_MAX_WORKERS,
+    timeout: float = ARIMA_TIMEOUT_SECONDS,
+    shard: bool = False,
+    repository: Optional[PriceRepository] = None,
+) -> List[ForecastResult]:
+    results: List[ForecastResult] = []
+    with instrumentation.stage("forecast") as record:
+        with _MobileForecastWriter(MOBILE_FORECAST_JSON, horizon, shard=shard) as writer:
+            for result in iter_forecasts(
+                horizon=horizon,
+                holdout_days=holdout_days,
+                model_type=model_type,
+                max_workers=max_workers,
+                timeout=timeout,
+                repository=repository,
+            ):
+                writer.write(result)
+                results.append(result)
+
+        if results:
+            _write_summary_csv(results)
+        record.rows(rows_out=sum(len(result.frame) for result in results if result.frame is not None))
+    return results
+
+
+def _write_summary_csv(results: List[ForecastResult]) -> None:
     summary = pd.DataFrame(
         [
             {
@@ -295,18 +958,15 @@ def generate_forecasts(*, horizon: int = HORIZON_DAYS, holdout_days: int = HOLDO
     ).sort_values("item")
     summary.to_csv(FORECAST_ROOT / "summary.csv", index=False)
 
-    _write_mobile_forecast_json(results, horizon)
-    return results
-
 
-def _load_display_name_map() -> Dict[str, str]:
+def _load_display_name_map(repository: PriceRepository) -> Dict[str, str]:
     price_json = Path("mobile/assets/data/prices.json")
     mapping: Dict[str, str] = {}
     if not price_json.exists():
         return mapping
 
     try:
-        payload = json.loads(price_json.read_text(encoding="utf-8"))
+        payload = repository.read_json(price_json)
     except (json.JSONDecodeError, OSError):
         return mapping
 
@@ -318,46 +978,137 @@ def _load_display_name_map() -> Dict[str, str]:
     return mapping
 
 
-def _write_mobile_forecast_json(results: List[ForecastResult], horizon: int) -> None:
-    items_payload: List[dict[str, object]] = []
+def _write_mobile_forecast_json(results: Iterable[ForecastResult], horizon: int, *, shard: bool = False) -> None:
+    with _MobileForecastWriter(MOBILE_FORECAST_JSON, horizon, shard=shard) as writer:
+        for result in results:
+            writer.write(result)
 
-    for result in results:
-        frame = pd.read_csv(result.output_path, parse_dates=["date"]) if result.output_path.exists() else pd.DataFrame()
-        points = [
-            {
-                "date": row.date.date().isoformat() if isinstance(row.date, pd.Timestamp) else str(row.date),
-                "forecast": float(row.forecast) if pd.notna(row.forecast) else None,
-                "lower": float(row.lower) if pd.notna(row.lower) else None,
-                "upper": float(row.upper) if pd.notna(row.upper) else None,
-            }
-            for row in frame.itertuples(index=False)
-        ]
-        items_payload.append(
-            {
-                "name": result.display_name,
-                "key": result.item,
-                "model": result.model_type,
-                "mape": result.metric,
-                "points": points,
-            }
+
+class _MobileForecastWriter:
+    """Stream ``forecasts.json`` one item at a time.
+
+    Items are encoded as soon as they are written, so memory stays flat as the
+    item count grows. The document goes to a temporary file that replaces the
+    target once it is complete, also when no item was written. With ``shard``
+    each item is also written as a shard, published on the same terms.
+    """
+
+    def __init__(self, path: Path, horizon: int, *, shard: bool = False) -> None:
+        self.path = path
+        self.horizon = horizon
+        self._tmp_path = path.with_name(path.name + ".tmp")
+        self._stream = None
+        self._count = 0
+        self._shards = None
+        if shard:
+            from .mobile_shards import ShardWriter
+
+            self._shards = ShardWriter("forecasts", {"horizonDays": horizon})
+
+    def __enter__(self) -> "_MobileForecastWriter":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._stream = self._tmp_path.open("w", encoding="utf-8")
+        generated_at = datetime.now(timezone.utc).isoformat()
+        if self._shards is not None:
+            self._shards.meta["generatedAt"] = generated_at
+        header = json.dumps(
+            {"generatedAt": generated_at, "horizonDays": self.horizon},
+            separators=(",", ":"),
         )
+        self._stream.write(header[:-1] + ',"items":[')
+        return self
+
+    def write(self, result: ForecastResult) -> None:
+        item_payload = {
+            "name": result.display_name,
+            "key": result.item,
+            "model": result.model_type,
+            "mape": result.metric,
+            "points": _forecast_points(_result_frame(result)),
+        }
+        if self._count:
+            self._stream.write(",")
+        self._stream.write(json.dumps(item_payload, separators=(",", ":")))
+        if self._shards is not None:
+            self._shards.add(item_payload)
+        self._count += 1
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self._stream.write("]}")
+        self._stream.close()
+        if exc_type is None:  # an empty run publishes an empty item list rather than leaving stale forecasts
+            os.replace(self._tmp_path, self.path)
+            if self._shards is not None:
+                self._shards.commit()
+        else:
+            self._tmp_path.unlink(missing_ok=True)
 
-    payload = {
-        "generatedAt": datetime.now(timezone.utc).isoformat(),
-        "horizonDays": horizon,
-        "items": items_payload,
-    }
-    MOBILE_FORECAST_JSON.parent.mkdir(parents=True, exist_ok=True)
-    MOBILE_FORECAST_JSON.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+
+def _result_frame(result: ForecastResult) -> pd.DataFrame:
+    if result.frame is not None:
+        return result.frame
+    # Results built outside generate_forecasts may only carry the CSV path
+    if result.output_path.exists():
+        return pd.read_csv(result.output_path, parse_dates=["date"])
+    return pd.DataFrame(columns=["date", "forecast", "lower", "upper"])
+
+
+def _forecast_points(frame: pd.DataFrame) -> List[dict[str, object]]:
+    """Build point objects from whole columns rather than walking rows."""
+    if frame.empty:
+        return []
+    dates = pd.to_datetime(frame["date"]).dt.strftime("%Y-%m-%d").tolist()
+    columns = [
+        [None if value != value else value for value in frame[name].to_numpy(dtype=float).tolist()]
+        for name in ("forecast", "lower", "upper")
+    ]
+    return [
+        {"date": day, "forecast": forecast, "lower": lower, "upper": upper}
+        for day, forecast, lower, upper in zip(dates, *columns)
+    ]
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--horizon", type=int, default=HORIZON_DAYS, help="Forecast horizon in days.")
     parser.add_argument("--holdout", type=int, default=HOLDOUT_DAYS, help="Holdout window (days) for MAPE calculation.")
+    parser.add_argument("--model", choices=MODEL_TYPES, default="seasonal_trend", help="Forecast model; 'auto' keeps the lower holdout MAPE.")
+    parser.add_argument("--workers", type=int, default=ARIMA_MAX_WORKERS, help="Maximum concurrent ARIMA fitting processes.")
+    parser.add_argument("--timeout", type=float, default=ARIMA_TIMEOUT_SECONDS, help="Seconds allowed per ARIMA fit before falling back.")
+    parser.add_argument("--backtest", action="store_true", help="Evaluate rolling forecast origins instead of forecasting.")
+    parser.add_argument("--origin-step", type=int, default=BACKTEST_ORIGIN_STEP_DAYS, help="Days between backtest origins.")
+    parser.add_argument("--lookback", type=int, default=BACKTEST_LOOKBACK_DAYS, help="Days of history covered by backtest origins.")
+    parser.add_argument("--sweep", action="store_true", help="Tune seasonal-trend parameters per item and save the best ones.")
+    add_profile_arguments(parser)
     args = parser.parse_args()
 
-    results = generate_forecasts(horizon=args.horizon, holdout_days=args.holdout)
+    with profile_from_args(args, "forecast"):
+        _run(args)
+
+
+def _run(args: argparse.Namespace) -> None:
+    if args.sweep:
+        with instrumentation.stage("sweep"):
+            report = sweep_forecast_params(
+                holdout_days=args.holdout, origin_step=args.origin_step, lookback_days=args.lookback
+            )
+        print(f"Swept {len(report)} parameter combinations; best settings written to '{PARAMS_JSON}'.")
+        return
+
+    if args.backtest:
+        with instrumentation.stage("backtest"):
+            report = backtest_forecasts(horizon=args.horizon, origin_step=args.origin_step, lookback_days=args.lookback)
+        print(f"Backtested {report['item'].nunique() if not report.empty else 0} items; report written to '{BACKTEST_CSV}'.")
+        return
+
+    results = generate_forecasts(
+        horizon=args.horizon,
+        holdout_days=args.holdout,
+        model_type=args.model,
+        max_workers=args.workers,
+        timeout=args.timeout,
+    )
     print(f"Generated forecasts for {len(results)} items; files written to '{FORECAST_ROOT}'.")
 
 
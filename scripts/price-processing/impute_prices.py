@@ -2,23 +2,30 @@
 
 from __future__ import annotations
 
+import argparse
 from pathlib import Path
 from typing import Dict, Iterable, Optional
 
 import calendar
+import hashlib
 import json
+import os
 import re
 from datetime import datetime, timezone
 
 import numpy as np
 import pandas as pd
-import pdfplumber
 
+from . import instrumentation
 from .clean_workbook import CLEAN_ROOT, clean_workbook, _safe_folder_name
+from .panel import FLAG_COLUMNS, PricePanelBuilder
+from .profiling import add_profile_arguments, profile_from_args
+from .repository import PriceRepository
 
 
 MOBILE_JSON = Path("mobile/assets/data/prices.json")
 DA_DAILY_DIR = Path("data/daily_price_index")
+DA_PARSE_CACHE_NAME = ".parsed_rows.json"  # per-PDF rows, kept inside DA_DAILY_DIR
 
 DA_MAPPING = [
     ("IMPORTED COMMERCIAL RICE", "SPECIAL RICE", None, "Imported Special"),
@@ -58,29 +65,42 @@ DA_MAPPING = [
 ]
 
 
-def impute_prices() -> Path:
-    """Clean the raw workbook, impute gaps, and export results."""
+def impute_prices(*, shard: bool = False, repository: Optional[PriceRepository] = None) -> Path:
+    """Clean the raw workbook, impute gaps, and export results.
 
-    exports = clean_workbook()
-    combined = _build_dataset(exports)
+    With ``shard`` the mobile JSON is also written as per-item shards (see
+    :mod:`mobile_shards`). Passing the run's ``repository`` keeps the cleaned
+    and imputed data in memory for the stages after this one.
+    """
+
+    repository = repository or PriceRepository()
+    with instrumentation.stage("clean") as record:
+        exports = clean_workbook(repository=repository)
+        combined = _build_dataset(exports, repository)
+        record.rows(rows_out=len(combined))
 
     if combined.empty:
         raise ValueError("No price observations were found to impute.")
 
-    imputed = _apply_imputation(combined)
-    _write_clean_csvs(imputed, exports)
-    _export_mobile_json(imputed)
+    with instrumentation.stage("pdf_parse") as record:
+        record.rows(rows_out=len(repository.observed()))
+
+    with instrumentation.stage("impute") as record:
+        imputed = _apply_imputation(combined, repository)
+        _write_clean_csvs(imputed, exports, repository)
+        _export_mobile_json(imputed, shard=shard, repository=repository)
+        record.rows(rows_in=len(combined), rows_out=len(imputed))
     return CLEAN_ROOT
 
 
-def _build_dataset(exports: Dict[str, Dict[str, Path]]) -> pd.DataFrame:
+def _build_dataset(exports: Dict[str, Dict[str, Path]], repository: PriceRepository) -> pd.DataFrame:
     rows = []
     for sheet_name, year_map in exports.items():
         for year, csv_path in year_map.items():
             year_value = _coerce_year(year)
             if year_value is None:
                 continue
-            df = pd.read_csv(csv_path, parse_dates=["date"])
+            df = repository.read_csv(csv_path)
             df["item"] = sheet_name
             df["year"] = year_value
             rows.append(df)
@@ -95,9 +115,19 @@ def _build_dataset(exports: Dict[str, Dict[str, Path]]) -> pd.DataFrame:
     return combined
 
 
-def _apply_imputation(df: pd.DataFrame) -> pd.DataFrame:
+def _apply_imputation(df: pd.DataFrame, repository: PriceRepository) -> pd.DataFrame:
+    observed = repository.observed()
+    return _apply_future_cutoff(_impute_items(df, observed), observed)
+
+
+def _impute_items(df: pd.DataFrame, observed: pd.DataFrame) -> pd.DataFrame:
+    """Merge *observed* prices and fill gaps; every step is per item.
+
+    Running this on a subset of items gives exactly those items' rows of the
+    full result, which lets ``watch`` re-impute only what new PDFs touched.
+    """
     df = df.copy()
-    df = _merge_official_prices(df)
+    df = _merge_official_prices(df, observed)
 
     available = df.dropna(subset=["price"])  # original observed values
     seasonal_mean = (
@@ -116,23 +146,19 @@ def _apply_imputation(df: pd.DataFrame) -> pd.DataFrame:
         else pd.Series(dtype=float)
     )
 
-    imputed_frames = []
+    # Each group's year is kept as flat arrays; the frame is expanded once, already sorted
+    panel = PricePanelBuilder()
 
-    for (item, year), group in df.groupby(["item", "year"], sort=False):
+    for (item, _), group in df.groupby(["item", "year"], sort=False):
         seasonal_item = seasonal_mean.xs(item) if item in seasonal_mean.index.levels[0] else None
         monthly_item = monthly_median.xs(item) if item in monthly_median.index.levels[0] else None
         item_default = item_median.loc[item] if item in item_median.index else np.nan
 
-        processed = _impute_series(group, seasonal_item, monthly_item, item_default)
-        processed["item"] = item
-        processed["year"] = year
-        imputed_frames.append(processed)
+        with instrumentation.item(item):
+            processed = _impute_series(group, seasonal_item, monthly_item, item_default)
+        panel.append(item, processed["date"], processed["price"], {name: processed[name] for name in FLAG_COLUMNS})
 
-    imputed_df = pd.concat(imputed_frames, ignore_index=True)
-    imputed_df = imputed_df.sort_values(by=["item", "year", "date"])
-    imputed_df = _rebuild_calendar_dates(imputed_df)
-    imputed_df = _apply_future_cutoff(imputed_df)
-    return imputed_df
+    return panel.build().to_frame(calendar=True)
 
 
 def _impute_series(
@@ -248,7 +274,7 @@ def _coerce_year(label: object) -> Optional[int]:
 
 
 def _write_clean_csvs(
-    imputed: pd.DataFrame, exports: Dict[str, Dict[str, Path]]
+    imputed: pd.DataFrame, exports: Dict[str, Dict[str, Path]], repository: PriceRepository
 ) -> None:
     for item, year_map in exports.items():
         item_data = imputed.loc[imputed["item"] == item]
@@ -271,7 +297,7 @@ def _write_clean_csvs(
                     "price": sorted_subset["price"].round(2),
                 }
             )
-            output.to_csv(csv_path, index=False)
+            repository.write_csv(csv_path, output)
 
         written_years = {
             _coerce_year(year_key)
@@ -306,31 +332,40 @@ def _write_clean_csvs(
                     "price": sorted_subset["price"].round(2),
                 }
             )
-            output.to_csv(output_path, index=False)
+            repository.write_csv(output_path, output)
 
 
-def _export_mobile_json(df: pd.DataFrame) -> None:
-    monthly_labels = {idx: calendar.month_abbr[idx] for idx in range(1, 13)}
-    items_payload = []
+def _export_mobile_json(
+    df: pd.DataFrame, *, shard: bool = False, repository: Optional[PriceRepository] = None
+) -> None:
+    month_labels = [calendar.month_abbr[month] for month in range(1, 13)]
+
+    # One aggregation, scattered into a dense item x year x month grid
+    monthly = df.groupby(["item", "year", "month"])["price"].mean()
+    item_codes, item_names = pd.factorize(monthly.index.get_level_values("item"), sort=True)
+    year_codes, years = pd.factorize(monthly.index.get_level_values("year"), sort=True)
+    month_codes = monthly.index.get_level_values("month").astype(int) - 1
 
-    for item_name, item_group in df.groupby("item"):
+    grid = np.full((len(item_names), len(years), 12), np.nan)
+    grid[item_codes, year_codes, month_codes] = monthly.to_numpy(dtype=float)
+    present = np.zeros((len(item_names), len(years)), dtype=bool)
+    present[item_codes, year_codes] = True
+
+    year_values = [int(year) for year in years]
+    grid_rows = grid.tolist()
+    items_payload = []
+    for item_idx, item_name in enumerate(item_names):
         year_payload = []
-        for year, year_group in item_group.groupby("year"):
-            monthly_prices = (
-                year_group.groupby("month")["price"].mean().reindex(range(1, 13))
-            )
-            months_payload = []
-            for month in range(1, 13):
-                price = monthly_prices.iloc[month - 1]
-                months_payload.append(
-                    {
-                        "month": month,
-                        "label": monthly_labels[month],
-                        "price": round(float(price), 2) if pd.notna(price) else None,
-                    }
-                )
-            year_payload.append({"year": int(year), "months": months_payload})
-        year_payload.sort(key=lambda entry: entry["year"])
+        for year_idx in np.flatnonzero(present[item_idx]).tolist():
+            months_payload = [
+                {
+                    "month": month,
+                    "label": label,
+                    "price": None if price != price else round(price, 2),  # NaN check
+                }
+                for month, label, price in zip(range(1, 13), month_labels, grid_rows[item_idx][year_idx])
+            ]
+            year_payload.append({"year": year_values[year_idx], "months": months_payload})
         items_payload.append({"name": item_name, "years": year_payload})
 
     items_payload.sort(key=lambda entry: entry["name"].lower())
@@ -340,20 +375,14 @@ def _export_mobile_json(df: pd.DataFrame) -> None:
     }
 
     MOBILE_JSON.parent.mkdir(parents=True, exist_ok=True)
-    with MOBILE_JSON.open("w", encoding="utf-8") as stream:
-        json.dump(payload, stream, indent=2)
-
+    (repository or PriceRepository()).write_json(MOBILE_JSON, payload, indent=2)
+    if shard:
+        from .mobile_shards import write_shards
 
-def _rebuild_calendar_dates(df: pd.DataFrame) -> pd.DataFrame:
-    rebuilt = df.copy()
-    base_dates = pd.to_datetime(rebuilt["year"].astype(str) + "-01-01")
-    rebuilt["date"] = base_dates + pd.to_timedelta(rebuilt["day_of_year"].astype(int) - 1, unit="D")
-    rebuilt["month"] = rebuilt["date"].dt.month
-    return rebuilt
+        write_shards("prices", payload)
 
 
-def _apply_future_cutoff(df: pd.DataFrame) -> pd.DataFrame:
-    observed = _load_daily_index_records()
+def _apply_future_cutoff(df: pd.DataFrame, observed: pd.DataFrame) -> pd.DataFrame:
     if observed.empty:
         baseline_cutoff = pd.Timestamp(2025, 11, 1)
     else:
@@ -369,8 +398,7 @@ def _apply_future_cutoff(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def _merge_official_prices(df: pd.DataFrame) -> pd.DataFrame:
-    observed = _load_daily_index_records()
+def _merge_official_prices(df: pd.DataFrame, observed: pd.DataFrame) -> pd.DataFrame:
     if observed.empty:
         return df
 
@@ -408,37 +436,97 @@ def _merge_official_prices(df: pd.DataFrame) -> pd.DataFrame:
     return merged
 
 
+_daily_records_memo: dict[Path, tuple[tuple, pd.DataFrame]] = {}
+
+
 def _load_daily_index_records() -> pd.DataFrame:
+    """Observed DA prices from every daily PDF, averaged per item and date.
+
+    Parsed rows are cached per PDF in ``DA_PARSE_CACHE_NAME`` (keyed by size and
+    modification time, invalidated when ``DA_MAPPING`` changes), so each PDF is
+    parsed once; the assembled frame is also memoized for repeat calls in the
+    same run.
+    """
+    empty = pd.DataFrame(columns=["item", "date", "price"])
     if not DA_DAILY_DIR.exists():
-        return pd.DataFrame(columns=["item", "date", "price"])
-
-    records: list[dict[str, object]] = []
+        return empty
 
+    pdfs = []
     for path in sorted(DA_DAILY_DIR.glob("*.pdf")):
         date_value = _date_from_filename(path.name)
         if date_value is None:
             continue
+        stat = path.stat()
+        pdfs.append((path, date_value, stat.st_size, stat.st_mtime_ns))
+
+    signature = tuple((path.name, size, mtime_ns) for path, _, size, mtime_ns in pdfs)
+    memo = _daily_records_memo.get(DA_DAILY_DIR)
+    if memo is not None and memo[0] == signature:
+        return memo[1].copy()
+
+    cache_path = DA_DAILY_DIR / DA_PARSE_CACHE_NAME
+    cached_files = _read_parse_cache(cache_path)
+    parsed_files: dict[str, dict] = {}
+    items: list[str] = []
+    prices: list[float] = []
+    dates: list[object] = []
+    counts: list[int] = []
+
+    for path, date_value, size, mtime_ns in pdfs:
+        entry = cached_files.get(path.name)
+        if entry is None or entry.get("size") != size or entry.get("mtime_ns") != mtime_ns:
+            rows = [[item, price] for item, price in _iter_daily_index_rows(path) if price is not None]
+            entry = {"size": size, "mtime_ns": mtime_ns, "rows": rows}
+        parsed_files[path.name] = entry
+        for item, price in entry["rows"]:
+            items.append(item)
+            prices.append(price)
+        dates.append(date_value)
+        counts.append(len(entry["rows"]))
+
+    if parsed_files != cached_files:
+        _write_parse_cache(cache_path, parsed_files)
+
+    if not items:
+        observed = empty
+    else:
+        observed = pd.DataFrame(
+            {"item": items, "date": pd.DatetimeIndex(dates).repeat(counts), "price": prices}
+        )
+        observed = observed.groupby(["item", "date"], as_index=False)["price"].mean()
+    _daily_records_memo[DA_DAILY_DIR] = (signature, observed)
+    return observed.copy()
 
-        for item, price in _iter_daily_index_rows(path):
-            if price is None:
-                continue
-            records.append(
-                {
-                    "item": item,
-                    "date": pd.Timestamp(date_value),
-                    "price": price,
-                }
-            )
 
-    if not records:
-        return pd.DataFrame(columns=["item", "date", "price"])
+def _mapping_fingerprint() -> str:
+    return hashlib.sha256(repr(DA_MAPPING).encode("utf-8")).hexdigest()
 
-    observed = pd.DataFrame(records)
-    observed = observed.groupby(["item", "date"], as_index=False)["price"].mean()
-    return observed
+
+def _read_parse_cache(path: Path) -> dict[str, dict]:
+    try:
+        cache = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("mapping") != _mapping_fingerprint():
+        return {}  # Rows were mapped with a different DA_MAPPING
+    return cache.get("files", {})
+
+
+def _write_parse_cache(path: Path, files: dict[str, dict]) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        tmp_path.write_text(
+            json.dumps({"mapping": _mapping_fingerprint(), "files": files}, separators=(",", ":")),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)  # Caching is best effort; parsing still succeeded
 
 
 def _iter_daily_index_rows(path: Path):
+    import pdfplumber  # slow to import; only needed when a PDF is actually parsed
+
     with pdfplumber.open(path) as pdf:
         current_category: Optional[str] = None
 
@@ -529,7 +617,12 @@ def _date_from_filename(name: str) -> Optional[datetime]:
 
 
 def main() -> None:
-    path = impute_prices()
+    parser = argparse.ArgumentParser(description=__doc__)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    with profile_from_args(args, "impute_prices"):
+        path = impute_prices()
     print(f"Imputed price workbook written to '{path}'.")
 
 
@@ -0,0 +1,303 @@
+"""Per-stage timing and memory records for pipeline runs.
+
+Stages wrap their work in :func:`stage` and time items with :func:`item`::
+
+    with instrumentation.stage("impute") as record:
+        record.rows(rows_in=len(frame))
+        for name, group in groups:
+            with instrumentation.item(name):
+                ...
+
+Nothing is recorded until :func:`enable` is called, and until then
+:func:`stage` hands out a shared no-op record, so instrumented code costs a
+function call per stage and per item. ``daily_price_sync --report`` and
+``--metrics`` enable it and write the run as JSON or Prometheus text.
+
+Peak RSS is the process high-water mark while the stage ran. On Linux it is
+reset at each stage start (``/proc/self/clear_refs``); elsewhere it is the
+high-water mark of the whole process so far.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, ContextManager, Dict, Iterator, List, Optional
+
+
+METRIC_PREFIX = "price_pipeline"
+
+
+class StageRecord:
+    """Measurements for one run of a stage."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.rows_in: Optional[int] = None
+        self.rows_out: Optional[int] = None
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.peak_rss_bytes: Optional[int] = None
+        self.items: Dict[str, float] = {}
+        self._child_peak = 0
+
+    def rows(self, *, rows_in: Optional[int] = None, rows_out: Optional[int] = None) -> None:
+        if rows_in is not None:
+            self.rows_in = int(rows_in)
+        if rows_out is not None:
+            self.rows_out = int(rows_out)
+
+    @contextmanager
+    def item(self, name: str) -> Iterator[None]:
+        """Add the wall time of the block to *name*'s total for this stage."""
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.items[name] = self.items.get(name, 0.0) + time.perf_counter() - start
+
+    def to_dict(self) -> dict:
+        return {
+            "stage": self.name,
+            "wall_seconds": round(self.wall_seconds, 6),
+            "cpu_seconds": round(self.cpu_seconds, 6),
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "items": {name: round(seconds, 6) for name, seconds in self.items.items()},
+        }
+
+
+class _NullRecord:
+    """Stand-in handed out while instrumentation is disabled."""
+
+    def rows(self, *, rows_in: Optional[int] = None, rows_out: Optional[int] = None) -> None:
+        pass
+
+    def item(self, name: str) -> "_NullRecord":
+        return self
+
+    def __enter__(self) -> "_NullRecord":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+_NULL_RECORD = _NullRecord()
+
+
+class RunRecorder:
+    """Collects the stages of one pipeline run."""
+
+    def __init__(self) -> None:
+        self.started_at = datetime.now(timezone.utc)
+        self.stages: List[StageRecord] = []
+        self._stack: List[StageRecord] = []
+        self._start = time.perf_counter()
+        self._start_cpu = time.process_time()
+        self._can_reset_peak = _reset_peak_rss()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageRecord]:
+        record = StageRecord(name)
+        parent = self._stack[-1] if self._stack else None
+        if parent is not None and self._can_reset_peak:
+            # Resetting the high-water mark would hide the parent's peak so far
+            parent._child_peak = max(parent._child_peak, _peak_rss_bytes() or 0)
+        if self._can_reset_peak:
+            _reset_peak_rss()
+
+        self._stack.append(record)
+        start, start_cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record.wall_seconds = time.perf_counter() - start
+            record.cpu_seconds = time.process_time() - start_cpu
+            peak = _peak_rss_bytes()
+            if peak is not None:
+                record.peak_rss_bytes = max(peak, record._child_peak)
+            self._stack.pop()
+            if parent is not None and record.peak_rss_bytes is not None:
+                parent._child_peak = max(parent._child_peak, record.peak_rss_bytes)
+            self.stages.append(record)
+
+    def to_dict(self) -> dict:
+        return {
+            "started_at": self.started_at.isoformat(),
+            "wall_seconds": round(time.perf_counter() - self._start, 6),
+            "cpu_seconds": round(time.process_time() - self._start_cpu, 6),
+            "peak_rss_bytes": max(
+                (stage.peak_rss_bytes for stage in self.stages if stage.peak_rss_bytes is not None), default=None
+            ),
+            "stages": [stage.to_dict() for stage in self.stages],
+        }
+
+    def write_json(self, path: Path) -> Path:
+        _replace_text(path, json.dumps(self.to_dict(), indent=2))
+        return path
+
+    def write_prometheus(self, path: Path) -> Path:
+        """Write the run in the Prometheus text exposition format (for a textfile collector)."""
+
+        lines: List[str] = []
+
+        def metric(name: str, help_text: str, samples: List[tuple]) -> None:
+            lines.append(f"# HELP {METRIC_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {METRIC_PREFIX}_{name} gauge")
+            for labels, value in samples:
+                label_text = ",".join(f'{key}="{_escape_label(str(val))}"' for key, val in labels.items())
+                series = f"{METRIC_PREFIX}_{name}{{{label_text}}}" if label_text else f"{METRIC_PREFIX}_{name}"
+                lines.append(f"{series} {value}")
+
+        stages = self.stages
+        metric(
+            "stage_wall_seconds",
+            "Wall-clock time of a pipeline stage.",
+            [({"stage": s.name}, f"{s.wall_seconds:.6f}") for s in stages],
+        )
+        metric(
+            "stage_cpu_seconds",
+            "CPU time of a pipeline stage in this process.",
+            [({"stage": s.name}, f"{s.cpu_seconds:.6f}") for s in stages],
+        )
+        metric(
+            "stage_rows_in",
+            "Rows a pipeline stage read.",
+            [({"stage": s.name}, s.rows_in) for s in stages if s.rows_in is not None],
+        )
+        metric(
+            "stage_rows_out",
+            "Rows a pipeline stage produced.",
+            [({"stage": s.name}, s.rows_out) for s in stages if s.rows_out is not None],
+        )
+        metric(
+            "stage_peak_rss_bytes",
+            "Peak resident memory while a pipeline stage ran.",
+            [({"stage": s.name}, s.peak_rss_bytes) for s in stages if s.peak_rss_bytes is not None],
+        )
+        metric(
+            "item_seconds",
+            "Wall-clock time spent on one item within a stage.",
+            [
+                ({"stage": s.name, "item": item}, f"{seconds:.6f}")
+                for s in stages
+                for item, seconds in s.items.items()
+            ],
+        )
+        metric("run_timestamp_seconds", "Start time of the run.", [({}, f"{self.started_at.timestamp():.3f}")])
+
+        _replace_text(path, "\n".join(lines) + "\n")
+        return path
+
+
+_RECORDER: Optional[RunRecorder] = None
+_STAGE_HOOKS: List[Callable[[str], ContextManager]] = []
+
+
+def enable() -> RunRecorder:
+    """Start recording stages for a new run and return its recorder."""
+
+    global _RECORDER
+    _RECORDER = RunRecorder()
+    return _RECORDER
+
+
+def disable() -> Optional[RunRecorder]:
+    """Stop recording; returns the recorder of the finished run, if any."""
+
+    global _RECORDER
+    recorder, _RECORDER = _RECORDER, None
+    return recorder
+
+
+def add_stage_hook(hook: Callable[[str], ContextManager]) -> None:
+    """Enter ``hook(name)`` around every stage, e.g. to profile it."""
+
+    _STAGE_HOOKS.append(hook)
+
+
+def remove_stage_hook(hook: Callable[[str], ContextManager]) -> None:
+    if hook in _STAGE_HOOKS:
+        _STAGE_HOOKS.remove(hook)
+
+
+def stage(name: str):
+    """Context manager recording *name*; a no-op while instrumentation is disabled."""
+
+    if _STAGE_HOOKS:
+        return _hooked_stage(name)
+    if _RECORDER is None:
+        return _NULL_RECORD
+    return _RECORDER.stage(name)
+
+
+@contextmanager
+def _hooked_stage(name: str) -> Iterator[object]:
+    with ExitStack() as stack:
+        for hook in list(_STAGE_HOOKS):
+            stack.enter_context(hook(name))
+        yield stack.enter_context(_RECORDER.stage(name)) if _RECORDER is not None else _NULL_RECORD
+
+
+def item(name: str):
+    """Time a block against *name* in the innermost running stage."""
+
+    if _RECORDER is None or not _RECORDER._stack:
+        return _NULL_RECORD
+    return _RECORDER._stack[-1].item(name)
+
+
+def _reset_peak_rss() -> bool:
+    try:
+        with open("/proc/self/clear_refs", "w") as stream:
+            stream.write("5")
+    except OSError:
+        return False
+    return True
+
+
+def _peak_rss_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/status") as stream:
+            for line in stream:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # bytes on macOS, KiB elsewhere
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _replace_text(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+__all__ = [
+    "RunRecorder",
+    "StageRecord",
+    "add_stage_hook",
+    "disable",
+    "enable",
+    "item",
+    "remove_stage_hook",
+    "stage",
+]
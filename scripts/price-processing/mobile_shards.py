@@ -0,0 +1,153 @@
+"""Sharded, content-hashed copies of the mobile JSON exports.
+
+Each dataset (``prices``, ``forecasts``, ``current_prices``) gets a folder
+under ``SHARD_ROOT`` holding one minified JSON file per item, named after the
+item and its content hash, plus a deterministic ``.gz`` copy. ``manifest.json``
+lists every shard with its hash and sizes; ``delta.json`` lists the shards
+added, changed, or removed since the previous manifest, so clients only fetch
+what changed. Shards are immutable, so they can be cached forever.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .clean_workbook import _safe_folder_name
+
+
+SHARD_ROOT = Path("mobile/assets/data/shards")
+MANIFEST_NAME = "manifest.json"
+DELTA_NAME = "delta.json"
+_HASH_CHARS = 16
+
+
+class ShardWriter:
+    """Write one dataset's items as shards as they arrive, then publish a manifest.
+
+    ``meta`` holds the dataset's top-level fields other than ``items``. Nothing
+    visible changes until :meth:`commit` replaces the manifest.
+    """
+
+    def __init__(self, dataset: str, meta: Optional[dict] = None, *, root: Path = SHARD_ROOT) -> None:
+        self.dataset = dataset
+        self.meta = dict(meta or {})
+        self.directory = root / dataset
+        self._entries: List[dict] = []
+
+    def add(self, item_payload: dict) -> None:
+        data = json.dumps(item_payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        name = str(item_payload["name"])
+        key = str(item_payload.get("key", name))  # forecasts carry a unique key besides the display name
+        stem = f"{_safe_folder_name(name).replace(' ', '_')}.{digest[:_HASH_CHARS]}"
+        compressed = gzip.compress(data, mtime=0)  # mtime=0 keeps the bytes reproducible
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        _write_if_missing(self.directory / f"{stem}.json", data)
+        _write_if_missing(self.directory / f"{stem}.json.gz", compressed)
+        self._entries.append(
+            {
+                "key": key,
+                "name": name,
+                "file": f"{stem}.json",
+                "gzip": f"{stem}.json.gz",
+                "sha256": digest,
+                "bytes": len(data),
+                "gzipBytes": len(compressed),
+            }
+        )
+
+    def commit(self) -> Path:
+        """Publish the manifest and delta, then drop shards no manifest still needs."""
+
+        manifest_path = self.directory / MANIFEST_NAME
+        previous = _read_json(manifest_path)
+        stable_meta = {key: value for key, value in self.meta.items() if key != "generatedAt"}
+        version = hashlib.sha256(
+            json.dumps(
+                {"meta": stable_meta, "shards": [(entry["key"], entry["sha256"]) for entry in self._entries]},
+                sort_keys=True,
+            ).encode("utf-8")
+        ).hexdigest()[:_HASH_CHARS]
+
+        manifest = {
+            "dataset": self.dataset,
+            "generatedAt": self.meta.get("generatedAt", datetime.now(timezone.utc).isoformat()),
+            "version": version,
+            "meta": self.meta,
+            "shards": self._entries,
+        }
+        delta = _delta(previous, manifest)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        _write_json(self.directory / DELTA_NAME, delta)
+        _write_json(manifest_path, manifest)
+        self._prune(keep=_shard_files(manifest) | _shard_files(previous))
+        return manifest_path
+
+    def _prune(self, keep: set) -> None:
+        # One generation of old shards stays so clients mid-download still find them
+        for path in self.directory.iterdir():
+            if path.name.endswith((".json", ".json.gz")) and path.name not in keep:
+                if path.name not in (MANIFEST_NAME, DELTA_NAME):
+                    path.unlink(missing_ok=True)
+
+
+def write_shards(dataset: str, payload: dict, *, root: Path = SHARD_ROOT) -> Path:
+    """Shard a complete ``{..., "items": [...]}`` payload and publish its manifest."""
+
+    writer = ShardWriter(dataset, {key: value for key, value in payload.items() if key != "items"}, root=root)
+    for item_payload in payload.get("items", []):
+        writer.add(item_payload)
+    return writer.commit()
+
+
+def _delta(previous: Optional[dict], manifest: dict) -> dict:
+    old: Dict[str, dict] = {entry["key"]: entry for entry in (previous or {}).get("shards", [])}
+    new: Dict[str, dict] = {entry["key"]: entry for entry in manifest["shards"]}
+    return {
+        "dataset": manifest["dataset"],
+        "from": (previous or {}).get("version"),
+        "to": manifest["version"],
+        "added": [new[key] for key in new if key not in old],
+        "changed": [new[key] for key in new if key in old and old[key]["sha256"] != new[key]["sha256"]],
+        "removed": [key for key in old if key not in new],
+    }
+
+
+def _shard_files(manifest: Optional[dict]) -> set:
+    files = set()
+    for entry in (manifest or {}).get("shards", []):
+        files.update((entry["file"], entry["gzip"]))
+    return files
+
+
+def _read_json(path: Path) -> Optional[dict]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path: Path, payload: dict) -> None:
+    _replace(path, json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8"))
+
+
+def _write_if_missing(path: Path, data: bytes) -> None:
+    if not path.exists():  # content-addressed: an existing file already holds these bytes
+        _replace(path, data)
+
+
+def _replace(path: Path, data: bytes) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+__all__ = ["SHARD_ROOT", "ShardWriter", "write_shards"]
@@ -0,0 +1,103 @@
+"""Chunked table/CSV/JSON writers for CLI query results."""
+
+from __future__ import annotations
+
+import sys
+from enum import Enum
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, TextIO
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+OUTPUT_CHUNK_ROWS = 5000
+
+
+class OutputFormat(str, Enum):
+    table = "table"
+    csv = "csv"
+    json = "json"
+
+
+def page(frame: pd.DataFrame, *, offset: int = 0, limit: Optional[int] = None) -> pd.DataFrame:
+    """Return rows ``offset`` to ``offset + limit`` without copying the rest."""
+
+    end = None if limit is None else offset + limit
+    return frame.iloc[offset:end]
+
+
+def write_frame(
+    frame: pd.DataFrame,
+    output_format: OutputFormat,
+    *,
+    stream: TextIO | None = None,
+    console=None,
+    title: str | None = None,
+    cell_formats: Dict[str, str] | None = None,
+    chunk_rows: int = OUTPUT_CHUNK_ROWS,
+) -> None:
+    """Write *frame* in chunks so output starts before the last row is formatted.
+
+    CSV and JSON go to *stream* (stdout by default) chunk by chunk; JSON is one
+    array of records. Tables are rendered with *console*, formatting each
+    column as a whole using the printf-style *cell_formats* (``str`` otherwise).
+    """
+
+    if output_format is OutputFormat.table:
+        _write_table(frame, console, title=title, cell_formats=cell_formats or {}, chunk_rows=chunk_rows)
+        return
+
+    stream = stream or sys.stdout
+    if output_format is OutputFormat.csv:
+        stream.write(",".join(map(str, frame.columns)) + "\n")
+        for chunk in _chunks(frame, chunk_rows):
+            chunk.to_csv(stream, header=False, index=False, lineterminator="\n")
+            stream.flush()
+        return
+
+    stream.write("[")
+    for idx, chunk in enumerate(_chunks(frame, chunk_rows)):
+        records = chunk.to_json(orient="records")
+        if records != "[]":
+            stream.write(("," if idx else "") + records[1:-1])
+            stream.flush()
+    stream.write("]\n")
+
+
+def _write_table(
+    frame: pd.DataFrame,
+    console,
+    *,
+    title: str | None,
+    cell_formats: Dict[str, str],
+    chunk_rows: int,
+) -> None:
+    from pandas.api.types import is_numeric_dtype
+    from rich.table import Table
+
+    table = Table(title=title)
+    for column in frame.columns:
+        numeric = is_numeric_dtype(frame[column])
+        table.add_column(str(column).replace("_", " ").title(), justify="right" if numeric else "left")
+
+    for chunk in _chunks(frame, chunk_rows):
+        cells = [_format_column(chunk[column], cell_formats.get(column)) for column in chunk.columns]
+        for row in zip(*cells):
+            table.add_row(*row)
+    console.print(table)
+
+
+def _format_column(values: pd.Series, cell_format: str | None) -> list[str]:
+    import numpy as np
+
+    if cell_format is None:
+        return values.astype(str).tolist()
+    return np.char.mod(cell_format, values.to_numpy()).tolist()
+
+
+def _chunks(frame: pd.DataFrame, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    for start in range(0, len(frame), chunk_rows):
+        yield frame.iloc[start : start + chunk_rows]
+
+
+__all__ = ["OutputFormat", "page", "write_frame"]
@@ -0,0 +1,220 @@
+"""Compact array-backed storage for daily item prices.
+
+A long pandas frame repeats the item name and a 64-bit timestamp on every
+row and spends a full byte per boolean flag. ``PricePanel`` keeps the same
+rows as
+
+* one integer code per row into a list of item names,
+* day offsets from a single base date,
+* a float64 (or float32) price array, and
+* ``was_imputed``/``was_adjusted`` packed eight rows to a byte.
+
+Rows are sorted by item then date, so one item's history is a contiguous
+slice. Convert with :meth:`PricePanel.from_frame` and
+:meth:`PricePanel.to_frame` at the pandas edges, or collect rows with
+:class:`PricePanelBuilder`. ``impute_prices`` accumulates its per-item,
+per-year results in a builder and expands the panel once at the end, instead
+of holding a frame per group and concatenating and sorting them.
+
+For 500 items x 15 years of daily rows (2.74M rows) the imputation frame
+(``item``, ``date``, ``year``, ``day_of_year``, ``month``, ``price`` and two
+flags) takes 149 MB by ``memory_usage(deep=True)`` on pandas 3, most of it
+the repeated item names; the panel takes 37 MB with float64 prices and
+27 MB with float32. Run ``python -m src.price_manager.benchmarks.panel_memory``
+to measure.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+FLAG_COLUMNS = ("was_imputed", "was_adjusted")
+
+
+class PricePanel:
+    """Daily prices for many items in flat numpy arrays."""
+
+    def __init__(
+        self,
+        items: Sequence[str],
+        codes: np.ndarray,
+        base_date: np.datetime64,
+        offsets: np.ndarray,
+        prices: np.ndarray,
+        flags: Optional[Dict[str, np.ndarray]] = None,
+    ) -> None:
+        if not len(codes) == len(offsets) == len(prices):
+            raise ValueError("codes, offsets and prices must have the same length")
+        self.items: List[str] = list(items)
+        self.codes = codes
+        self.base_date = np.datetime64(base_date, "D")
+        self.offsets = offsets
+        self.prices = prices
+        self._flags: Dict[str, np.ndarray] = dict(flags or {})  # packed with np.packbits
+        starts = np.searchsorted(codes, np.arange(len(self.items) + 1))
+        self._bounds: Dict[str, Tuple[int, int]] = {
+            name: (int(starts[code]), int(starts[code + 1])) for code, name in enumerate(self.items)
+        }
+
+    @classmethod
+    def from_frame(
+        cls,
+        frame: pd.DataFrame,
+        *,
+        flag_columns: Iterable[str] = FLAG_COLUMNS,
+        price_dtype: type = np.float64,
+    ) -> "PricePanel":
+        """Build a panel from ``item``/``date``/``price`` rows plus any flag columns present.
+
+        Raises ``ValueError`` when an ``item`` or ``date`` is missing.
+        """
+
+        if frame["item"].isna().any():
+            raise ValueError("PricePanel rows need an item; found missing item names")
+        if pd.to_datetime(frame["date"]).isna().any():
+            raise ValueError("PricePanel rows need a date; found missing dates")
+        frame = frame.sort_values(["item", "date"], kind="mergesort", ignore_index=True)
+        codes, items = pd.factorize(frame["item"], sort=True)
+        days = pd.to_datetime(frame["date"]).to_numpy(dtype="datetime64[D]")
+        base_date = days.min() if len(days) else np.datetime64("1970-01-01", "D")
+        offsets = (days - base_date).astype(np.int32)
+        prices = pd.to_numeric(frame["price"], errors="coerce").to_numpy(dtype=price_dtype)
+        flags = {
+            column: np.packbits(frame[column].fillna(False).to_numpy(dtype=bool))
+            for column in flag_columns
+            if column in frame.columns
+        }
+        return cls(
+            [str(item) for item in items],
+            codes.astype(_code_dtype(len(items))),
+            base_date,
+            offsets,
+            prices,
+            flags,
+        )
+
+    def to_frame(self, *, calendar: bool = False) -> pd.DataFrame:
+        """Expand back to a long frame; ``calendar`` adds ``year``/``day_of_year``/``month``."""
+
+        dates = pd.DatetimeIndex(self.dates)
+        frame = pd.DataFrame(
+            {
+                "item": np.asarray(self.items, dtype=object)[self.codes] if self.items else np.array([], dtype=object),
+                "date": dates,
+            }
+        )
+        if calendar:
+            frame["year"] = dates.year
+            frame["day_of_year"] = dates.dayofyear
+            frame["month"] = dates.month
+        frame["price"] = self.prices
+        for name in self._flags:
+            frame[name] = self.flag(name)
+        return frame
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @property
+    def dates(self) -> np.ndarray:
+        return self.base_date + self.offsets
+
+    @property
+    def flag_names(self) -> List[str]:
+        return list(self._flags)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the arrays and item names."""
+
+        names = sum(len(name.encode("utf-8")) for name in self.items)
+        packed = sum(bits.nbytes for bits in self._flags.values())
+        return self.codes.nbytes + self.offsets.nbytes + self.prices.nbytes + packed + names
+
+    def flag(self, name: str) -> np.ndarray:
+        """Unpacked boolean array for flag *name*."""
+
+        return np.unpackbits(self._flags[name], count=len(self)).astype(bool)
+
+    def item_slice(self, name: str) -> slice:
+        """Row range of *name*; empty when the item is absent."""
+
+        start, end = self._bounds.get(name, (0, 0))
+        return slice(start, end)
+
+    def series(self, name: str) -> pd.Series:
+        """Prices of one item indexed by date."""
+
+        rows = self.item_slice(name)
+        return pd.Series(
+            self.prices[rows], index=pd.DatetimeIndex(self.base_date + self.offsets[rows], name="date"), name=name
+        )
+
+
+class PricePanelBuilder:
+    """Collect runs of rows one item at a time, then build one sorted :class:`PricePanel`.
+
+    Each run is kept as its date, price and flag arrays only, and runs are
+    ordered by item and first date when the panel is built, so the dates
+    within a run must be sorted and the runs of one item must not overlap.
+    """
+
+    def __init__(self, *, flag_columns: Iterable[str] = FLAG_COLUMNS, price_dtype: type = np.float64) -> None:
+        self.flag_columns = tuple(flag_columns)
+        self.price_dtype = price_dtype
+        self._runs: List[Tuple[str, np.ndarray, np.ndarray, Dict[str, np.ndarray]]] = []
+
+    def append(
+        self, item: str, dates: Iterable, prices: Iterable, flags: Optional[Mapping[str, Iterable]] = None
+    ) -> None:
+        days = pd.to_datetime(np.asarray(dates)).to_numpy(dtype="datetime64[D]")
+        if not len(days):
+            return
+        if item is None or (isinstance(item, float) and np.isnan(item)):
+            raise ValueError("PricePanel rows need an item; found a missing item name")
+        if np.isnat(days).any():
+            raise ValueError(f"PricePanel rows need a date; found missing dates for {item!r}")
+        values = np.asarray(prices, dtype=self.price_dtype)
+        if len(values) != len(days):
+            raise ValueError("dates and prices must have the same length")
+        flags = flags or {}
+        self._runs.append(
+            (
+                str(item),
+                days,
+                values,
+                {name: np.asarray(flags[name], dtype=bool) for name in self.flag_columns if name in flags},
+            )
+        )
+
+    def build(self) -> PricePanel:
+        runs = sorted(self._runs, key=lambda run: (run[0], run[1][0]))
+        items = sorted({run[0] for run in runs})
+        index = {name: code for code, name in enumerate(items)}
+        code_dtype = _code_dtype(len(items))
+
+        codes = np.concatenate([np.full(len(run[1]), index[run[0]], dtype=code_dtype) for run in runs] or [[]])
+        days = np.concatenate([run[1] for run in runs] or [np.array([], dtype="datetime64[D]")])
+        base_date = days.min() if len(days) else np.datetime64("1970-01-01", "D")
+        prices = np.concatenate([run[2] for run in runs] or [np.array([], dtype=self.price_dtype)])
+        flags = {
+            name: np.packbits(np.concatenate([run[3].get(name, np.zeros(len(run[1]), dtype=bool)) for run in runs]))
+            for name in self.flag_columns
+            if any(name in run[3] for run in runs)
+        }
+        return PricePanel(
+            items, codes.astype(code_dtype), base_date, (days - base_date).astype(np.int32), prices, flags
+        )
+
+
+def _code_dtype(count: int) -> type:
+    if count <= np.iinfo(np.uint16).max:
+        return np.uint16
+    return np.uint32
+
+
+__all__ = ["FLAG_COLUMNS", "PricePanel", "PricePanelBuilder"]
@@ -0,0 +1,288 @@
+"""Read-only HTTP API over the cleaned and forecast price outputs.
+
+All CSVs under ``CLEAN_ROOT`` and ``FORECAST_ROOT`` are loaded once into
+sorted columnar arrays, so a query is a dictionary lookup plus a binary
+search. Every response carries an ``ETag`` derived from the published data
+version and the request URL; ``If-None-Match`` requests get ``304``s. When the
+pipeline publishes a new version (``daily_price_sync`` rewrites
+``PUBLISH_MARKER``) the index is rebuilt in place without restarting.
+
+Usage
+-----
+    python -m src.price_manager.price_api --port 5000
+
+Endpoints
+---------
+    GET /health
+    GET /items
+    GET /items/<name>/prices?start=YYYY-MM-DD&end=YYYY-MM-DD
+    GET /items/<name>/latest
+    GET /items/<name>/forecast
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .clean_workbook import CLEAN_ROOT
+from .forecast import FORECAST_ROOT
+
+
+PUBLISH_MARKER = Path("data/VERSION")
+RELOAD_CHECK_SECONDS = 1.0
+FORECAST_COLUMNS = ["forecast", "lower", "upper"]
+
+
+def publish_version(marker: Path = PUBLISH_MARKER) -> str:
+    """Record that a new set of outputs is complete; running APIs reload on it."""
+
+    version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S.%fZ")
+    marker.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = marker.with_name(marker.name + ".tmp")
+    tmp_path.write_text(version, encoding="utf-8")
+    tmp_path.replace(marker)
+    return version
+
+
+def read_version(marker: Path = PUBLISH_MARKER) -> str:
+    try:
+        return marker.read_text(encoding="utf-8").strip() or "unpublished"
+    except OSError:
+        return "unpublished"
+
+
+@dataclass
+class _Series:
+    """One item's rows in a shared sorted frame: ``[start, end)``."""
+
+    name: str
+    start: int
+    end: int
+
+
+class _ColumnarTable:
+    """Rows of ``item``/``date``/values sorted by item then date, sliced per item."""
+
+    def __init__(self, frame: pd.DataFrame, value_columns: List[str]) -> None:
+        frame = frame.sort_values(["item", "date"], kind="mergesort", ignore_index=True)
+        self.dates = frame["date"].to_numpy(dtype="datetime64[D]")
+        self.values = {column: frame[column].to_numpy(dtype=float) for column in value_columns}
+        names = frame["item"].to_numpy()
+        starts = np.flatnonzero(np.r_[True, names[1:] != names[:-1]]) if len(names) else np.array([], dtype=int)
+        ends = np.r_[starts[1:], len(names)]
+        self.series: Dict[str, _Series] = {
+            str(names[start]).casefold(): _Series(str(names[start]), int(start), int(end))
+            for start, end in zip(starts, ends)
+        }
+
+    def get(self, name: str) -> Optional[_Series]:
+        return self.series.get(name.strip().casefold())
+
+    def rows(self, series: _Series, start: Optional[np.datetime64] = None, end: Optional[np.datetime64] = None) -> dict:
+        """Column lists for *series* between *start* and *end* (inclusive)."""
+
+        dates = self.dates[series.start : series.end]
+        lo = int(np.searchsorted(dates, start, side="left")) if start is not None else 0
+        hi = int(np.searchsorted(dates, end, side="right")) if end is not None else len(dates)
+        window = slice(series.start + lo, series.start + hi)
+        columns = {"date": np.datetime_as_string(self.dates[window], unit="D").tolist()}
+        for column, values in self.values.items():
+            chunk = values[window]
+            columns[column] = [None if value != value else value for value in chunk.tolist()]  # NaN -> null
+        return columns
+
+
+class PriceIndex:
+    """Everything the API serves, loaded from disk for one published version."""
+
+    def __init__(self, version: str, prices: _ColumnarTable, forecasts: _ColumnarTable) -> None:
+        self.version = version
+        self.prices = prices
+        self.forecasts = forecasts
+
+    @classmethod
+    def load(
+        cls,
+        clean_root: Path = CLEAN_ROOT,
+        forecast_root: Path = FORECAST_ROOT,
+        *,
+        marker: Path = PUBLISH_MARKER,
+    ) -> "PriceIndex":
+        version = read_version(marker)
+        prices = _read_csv_tree(clean_root, "*.csv", ["price"], year_files=True)
+        forecasts = _read_csv_tree(forecast_root, "forecast.csv", FORECAST_COLUMNS)
+        return cls(version, _ColumnarTable(prices, ["price"]), _ColumnarTable(forecasts, FORECAST_COLUMNS))
+
+    def latest(self, series: _Series) -> Optional[dict]:
+        prices = self.prices.values["price"][series.start : series.end]
+        observed = np.flatnonzero(~np.isnan(prices))
+        if not len(observed):
+            return None
+        row = series.start + int(observed[-1])
+        return {"date": str(self.prices.dates[row]), "price": float(self.prices.values["price"][row])}
+
+
+def _read_csv_tree(root: Path, pattern: str, value_columns: List[str], *, year_files: bool = False) -> pd.DataFrame:
+    frames = []
+    if root.exists():
+        for item_dir in sorted(path for path in root.iterdir() if path.is_dir()):
+            for csv_file in sorted(item_dir.glob(pattern)):
+                if year_files and not csv_file.stem.isdigit():
+                    continue
+                try:
+                    df = pd.read_csv(csv_file, usecols=["date", *value_columns], parse_dates=["date"])
+                except (OSError, ValueError):
+                    continue
+                frames.append(df.assign(item=item_dir.name))
+    if not frames:
+        return pd.DataFrame({"item": [], "date": pd.to_datetime([]), **{column: [] for column in value_columns}})
+    return pd.concat(frames, ignore_index=True)
+
+
+class _IndexHolder:
+    """Serve the current index; rebuild it when the publish marker changes."""
+
+    def __init__(self, loader, marker: Path) -> None:
+        self._loader = loader
+        self._marker = marker
+        self._index: PriceIndex = loader()
+        self._checked = time.monotonic()
+        self._reloading = threading.Lock()
+
+    def current(self) -> PriceIndex:
+        now = time.monotonic()
+        if now - self._checked >= RELOAD_CHECK_SECONDS:
+            self._checked = now
+            if read_version(self._marker) != self._index.version and self._reloading.acquire(blocking=False):
+                # Other requests keep answering from the old index meanwhile
+                try:
+                    self._index = self._loader()
+                finally:
+                    self._reloading.release()
+        return self._index
+
+
+def create_app(
+    clean_root: Path = CLEAN_ROOT,
+    forecast_root: Path = FORECAST_ROOT,
+    *,
+    marker: Path = PUBLISH_MARKER,
+):
+    from flask import Flask, abort, jsonify, request
+
+    holder = _IndexHolder(lambda: PriceIndex.load(clean_root, forecast_root, marker=marker), marker)
+    app = Flask(__name__)
+    try:
+        from flask_cors import CORS
+    except ImportError:  # CORS only matters for browser clients
+        pass
+    else:
+        CORS(app)
+
+    def cached(build):
+        """Answer 304 before building the body when the client's ETag is current."""
+
+        index = holder.current()
+        etag = hashlib.sha256(f"{index.version}|{request.full_path}".encode("utf-8")).hexdigest()[:32]
+        if request.if_none_match.contains(etag):
+            response = app.response_class(status=304)
+        else:
+            response = jsonify(build(index))
+        response.set_etag(etag)
+        response.headers["X-Data-Version"] = index.version
+        return response
+
+    def series_or_404(table: _ColumnarTable, name: str) -> _Series:
+        series = table.get(name)
+        if series is None:
+            abort(404, description=f"Unknown item: {name}")
+        return series
+
+    def parse_date(field: str) -> Optional[np.datetime64]:
+        value = request.args.get(field)
+        if not value:
+            return None
+        try:
+            return np.datetime64(datetime.strptime(value, "%Y-%m-%d").date(), "D")
+        except ValueError:
+            abort(400, description=f"'{field}' must be YYYY-MM-DD")
+
+    @app.get("/health")
+    def health():
+        index = holder.current()
+        return jsonify({"status": "ok", "version": index.version, "items": len(index.prices.series)})
+
+    @app.get("/items")
+    def items():
+        def build(index: PriceIndex) -> dict:
+            payload = []
+            for key in sorted(index.prices.series):
+                series = index.prices.series[key]
+                payload.append(
+                    {
+                        "name": series.name,
+                        "firstDate": str(index.prices.dates[series.start]),
+                        "lastDate": str(index.prices.dates[series.end - 1]),
+                        "hasForecast": key in index.forecasts.series,
+                    }
+                )
+            return {"version": index.version, "items": payload}
+
+        return cached(build)
+
+    @app.get("/items/<path:name>/prices")
+    def prices(name: str):
+        start, end = parse_date("start"), parse_date("end")
+
+        def build(index: PriceIndex) -> dict:
+            series = series_or_404(index.prices, name)
+            return {"name": series.name, **index.prices.rows(series, start, end)}
+
+        return cached(build)
+
+    @app.get("/items/<path:name>/latest")
+    def latest(name: str):
+        def build(index: PriceIndex) -> dict:
+            series = series_or_404(index.prices, name)
+            return {"name": series.name, "latest": index.latest(series)}
+
+        return cached(build)
+
+    @app.get("/items/<path:name>/forecast")
+    def forecast(name: str):
+        def build(index: PriceIndex) -> dict:
+            series = series_or_404(index.forecasts, name)
+            return {"name": series.name, **index.forecasts.rows(series)}
+
+        return cached(build)
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on.")
+    parser.add_argument("--port", type=int, default=5000, help="TCP port to listen on.")
+    parser.add_argument("--clean-root", type=Path, default=CLEAN_ROOT, help="Cleaned CSV tree to serve.")
+    parser.add_argument("--forecast-root", type=Path, default=FORECAST_ROOT, help="Forecast CSV tree to serve.")
+    args = parser.parse_args()
+
+    app = create_app(args.clean_root, args.forecast_root)
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
+
+
+__all__ = ["PriceIndex", "create_app", "main", "publish_version", "read_version"]
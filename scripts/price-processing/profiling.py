@@ -0,0 +1,192 @@
+"""cProfile and sampled call stacks per pipeline stage.
+
+``--profile`` on ``daily_price_sync``, ``impute_prices``, ``forecast`` and
+``clean_workbook`` runs the command inside :func:`session`, which profiles
+every :func:`instrumentation.stage` separately. The run directory (by default
+``PROFILE_ROOT/<command>-<timestamp>``) receives, per stage:
+
+* ``<stage>.prof``: raw cProfile data for ``snakeviz``/``pstats``,
+* ``<stage>.txt``: the top functions by own time and by cumulative time,
+* ``<stage>.folded``: sampled stacks in the collapsed format read by
+  ``flamegraph.pl`` and speedscope (only with ``--profile-sample``),
+
+plus ``summary.json`` and ``summary.txt`` with the hottest functions of every
+stage. Only the calling process is profiled; ARIMA pool workers are not.
+"""
+
+from __future__ import annotations
+
+import argparse
+import cProfile
+import io
+import json
+import pstats
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from . import instrumentation
+
+
+PROFILE_ROOT = Path("data/profiles")
+TOP_FUNCTIONS = 15
+SAMPLE_INTERVAL_SECONDS = 0.005
+
+
+class _StackSampler(threading.Thread):
+    """Count the call stacks of one thread at a fixed interval."""
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        super().__init__(name="stack-sampler", daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts: Dict[str, int] = {}
+        self._done = threading.Event()
+
+    def run(self) -> None:
+        while not self._done.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack: List[str] = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                key = ";".join(reversed(stack))
+                self.counts[key] = self.counts.get(key, 0) + 1
+
+    def stop(self) -> Dict[str, int]:
+        self._done.set()
+        self.join()
+        return self.counts
+
+
+class StageProfiler:
+    """Stage hook writing one profile per outermost stage into ``run_dir``."""
+
+    def __init__(self, run_dir: Path, *, sample_interval: Optional[float] = None, top: int = TOP_FUNCTIONS) -> None:
+        self.run_dir = run_dir
+        self.sample_interval = sample_interval
+        self.top = top
+        self.summary: List[dict] = []
+        self._active = False
+        self._seen: Dict[str, int] = {}
+
+    @contextmanager
+    def __call__(self, name: str) -> Iterator[None]:
+        if self._active:  # only one cProfile can run at a time; nested stages fold into the outer one
+            yield
+            return
+
+        self._active = True
+        self._seen[name] = self._seen.get(name, 0) + 1
+        label = name if self._seen[name] == 1 else f"{name}-{self._seen[name]}"
+        sampler = _StackSampler(threading.get_ident(), self.sample_interval) if self.sample_interval else None
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        if sampler is not None:
+            sampler.start()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            samples = sampler.stop() if sampler is not None else None
+            self._active = False
+            self._write(label, profile, time.perf_counter() - start, samples)
+
+    def _write(self, label: str, profile: cProfile.Profile, seconds: float, samples: Optional[Dict[str, int]]) -> None:
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        profile.dump_stats(str(self.run_dir / f"{label}.prof"))
+
+        report = io.StringIO()
+        stats = pstats.Stats(profile, stream=report)
+        stats.sort_stats(pstats.SortKey.TIME).print_stats(self.top)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        (self.run_dir / f"{label}.txt").write_text(report.getvalue(), encoding="utf-8")
+
+        if samples is not None:
+            folded = "".join(f"{stack} {count}\n" for stack, count in sorted(samples.items()))
+            (self.run_dir / f"{label}.folded").write_text(folded, encoding="utf-8")
+
+        self.summary.append({"stage": label, "seconds": round(seconds, 6), "functions": _hot_functions(stats, self.top)})
+
+    def write_summary(self) -> Path:
+        self.run_dir.mkdir(parents=True, exist_ok=True)
+        (self.run_dir / "summary.json").write_text(json.dumps(self.summary, indent=2), encoding="utf-8")
+
+        lines: List[str] = []
+        for entry in self.summary:
+            lines.append(f"== {entry['stage']} ({entry['seconds']:.2f}s)")
+            lines.append(f"{'own (s)':>9} {'cum (s)':>9} {'calls':>10}  function")
+            for function in entry["functions"]:
+                lines.append(
+                    f"{function['own_seconds']:>9.3f} {function['cumulative_seconds']:>9.3f} "
+                    f"{function['calls']:>10}  {function['function']}"
+                )
+            lines.append("")
+        path = self.run_dir / "summary.txt"
+        path.write_text("\n".join(lines), encoding="utf-8")
+        return path
+
+
+def _hot_functions(stats: pstats.Stats, top: int) -> List[dict]:
+    rows = sorted(stats.stats.items(), key=lambda entry: entry[1][2], reverse=True)[:top]  # by own time
+    return [
+        {
+            "function": f"{func} ({Path(filename).name}:{line})",
+            "calls": calls,
+            "own_seconds": round(own, 6),
+            "cumulative_seconds": round(cumulative, 6),
+        }
+        for (filename, line, func), (_, calls, own, cumulative, _) in rows
+    ]
+
+
+@contextmanager
+def session(run_dir: Path, *, sample_interval: Optional[float] = None) -> Iterator[StageProfiler]:
+    """Profile every stage entered inside the block, then write the summary."""
+
+    profiler = StageProfiler(run_dir, sample_interval=sample_interval)
+    instrumentation.add_stage_hook(profiler)
+    try:
+        yield profiler
+    finally:
+        instrumentation.remove_stage_hook(profiler)
+        if profiler.summary:
+            print(f"Profiles written to '{run_dir}'; hot functions in '{profiler.write_summary()}'.", flush=True)
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        type=Path,
+        const=PROFILE_ROOT,
+        metavar="DIR",
+        help=f"Profile each stage into a run directory under DIR (default {PROFILE_ROOT}).",
+    )
+    parser.add_argument(
+        "--profile-sample",
+        action="store_true",
+        help=f"With --profile, also sample call stacks every {SAMPLE_INTERVAL_SECONDS * 1000:g} ms.",
+    )
+
+
+@contextmanager
+def profile_from_args(args: argparse.Namespace, command: str) -> Iterator[Optional[StageProfiler]]:
+    """A :func:`session` when ``--profile`` was given, otherwise nothing."""
+
+    if args.profile is None:
+        yield None
+        return
+    run_dir = args.profile / f"{command}-{datetime.now().strftime('%Y%m%dT%H%M%S')}"
+    with session(run_dir, sample_interval=SAMPLE_INTERVAL_SECONDS if args.profile_sample else None) as profiler:
+        yield profiler
+
+
+__all__ = ["PROFILE_ROOT", "StageProfiler", "add_profile_arguments", "profile_from_args", "session"]
@@ -0,0 +1,211 @@
+"""Keep a price dataset loaded and answer ``item``/``year`` queries over a local socket.
+
+``price-manager serve`` loads the dataset once; the CLI's ``--server`` option
+then sends queries here instead of importing pandas and re-reading the file,
+and prints the text the server rendered.
+
+Connections are authenticated with a per-user key before anything is
+unpickled: ``PRICE_MANAGER_AUTHKEY`` when set, otherwise the contents of
+``AUTHKEY_FILE``, which the first ``serve`` creates with mode 0600. The server
+only listens on loopback interfaces unless ``allow_remote`` is set.
+"""
+
+from __future__ import annotations
+
+import io
+import ipaddress
+import os
+import secrets
+import socket
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from .output import OutputFormat
+
+if TYPE_CHECKING:
+    from .data_store import PriceDataset
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+SERVER_ENV = "PRICE_MANAGER_SERVER"
+AUTHKEY_ENV = "PRICE_MANAGER_AUTHKEY"
+AUTHKEY_FILE = Path.home() / ".config" / "price-manager" / "authkey"
+QUERY_COMMANDS = ("item", "year")
+
+
+def parse_address(text: str) -> Tuple[str, int]:
+    """Parse ``host:port`` (or just ``port``) into a socket address."""
+
+    host, _, port = text.rpartition(":")
+    return host or DEFAULT_HOST, int(port)
+
+
+def _authkey(*, create: bool = False) -> bytes:
+    """The shared key from ``AUTHKEY_ENV`` or ``AUTHKEY_FILE``.
+
+    With *create* a missing key file is generated. Raises ``ValueError`` when
+    no key is available or the key file is readable by other users.
+    """
+
+    from_env = os.environ.get(AUTHKEY_ENV, "").encode()
+    if from_env:
+        return from_env
+
+    if create and not AUTHKEY_FILE.exists():
+        AUTHKEY_FILE.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        try:
+            fd = os.open(AUTHKEY_FILE, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:  # another server created it first
+            pass
+        else:
+            with os.fdopen(fd, "w", encoding="ascii") as stream:
+                stream.write(secrets.token_hex(32))
+
+    try:
+        stat = AUTHKEY_FILE.stat()
+    except FileNotFoundError:
+        raise ValueError(f"No query server key: set {AUTHKEY_ENV} or start `serve` to create {AUTHKEY_FILE}") from None
+    if os.name == "posix" and stat.st_mode & 0o077:
+        raise ValueError(f"{AUTHKEY_FILE} must only be accessible by its owner (chmod 600)")
+    key = AUTHKEY_FILE.read_text(encoding="ascii").strip().encode()
+    if not key:
+        raise ValueError(f"{AUTHKEY_FILE} is empty")
+    return key
+
+
+def _is_loopback(host: str) -> bool:
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:  # a host name; every address it resolves to must be local
+        try:
+            infos = socket.getaddrinfo(host, None)
+        except socket.gaierror:
+            return False
+        return bool(infos) and all(ipaddress.ip_address(info[4][0]).is_loopback for info in infos)
+
+
+def query(address: Tuple[str, int], request: dict) -> str:
+    """Send *request* to a running server and return the rendered output.
+
+    Raises ``ConnectionError`` when no server listens at *address* or it
+    rejects the key, and ``ValueError`` when no key is configured or the
+    server rejects the request.
+    """
+    from multiprocessing import AuthenticationError
+    from multiprocessing.connection import Client
+
+    authkey = _authkey()
+    try:
+        with Client(address, authkey=authkey) as conn:
+            conn.send(request)
+            ok, text = conn.recv()
+    except AuthenticationError as exc:
+        raise ConnectionError(f"The server at {address[0]}:{address[1]} rejected the key ({AUTHKEY_ENV})") from exc
+    if not ok:
+        raise ValueError(text)
+    return text
+
+
+def run_query(dataset: PriceDataset, request: dict, console, stream) -> None:
+    """Print the result of an ``item`` or ``year`` *request* for *dataset*.
+
+    Tables go to *console*; csv/json are written to *stream*.
+    """
+    from .data_store import filter_by_item, filter_by_year
+    from .output import page, write_frame
+
+    command = request["command"]
+    if command == "item":
+        name = request["name"]
+        frame = filter_by_item(dataset, name)
+        title, missing = f"History for {name}", f"[yellow]No records found for item '{name}'."
+    elif command == "year":
+        value = request["value"]
+        frame = filter_by_year(dataset, value)
+        title, missing = f"Prices in {value}", f"[yellow]No records found for year {value}."
+    else:
+        raise ValueError(f"Unsupported query command: {command!r}")
+
+    if frame.empty:
+        console.print(missing)
+        return
+    frame = page(frame, offset=request.get("offset", 0), limit=request.get("limit"))
+    write_frame(frame, OutputFormat(request["format"]), stream=stream, console=console, title=title, cell_formats={})
+
+
+class _LoadedDataset:
+    """The served dataset, reloaded when its files change on disk."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._signature: Optional[tuple] = None
+        self._dataset: Optional[PriceDataset] = None
+
+    def get(self) -> PriceDataset:
+        from .data_store import load_dataset
+
+        signature = self._current_signature()
+        if self._dataset is None or signature != self._signature:
+            self._dataset = load_dataset(self.path, create_if_missing=True)
+            self._signature = signature
+        return self._dataset
+
+    def _current_signature(self) -> tuple:
+        parts = []
+        for candidate in (self.path, self.path.with_name(self.path.name + "-wal")):
+            try:
+                stat = candidate.stat()
+            except FileNotFoundError:
+                parts.append(None)
+            else:
+                parts.append((stat.st_size, stat.st_mtime_ns))
+        return tuple(parts)
+
+
+def serve(
+    path: Path,
+    address: Tuple[str, int] = (DEFAULT_HOST, DEFAULT_PORT),
+    *,
+    allow_remote: bool = False,
+    log=print,
+) -> None:
+    """Answer queries for *path* until interrupted, one connection at a time.
+
+    Raises ``ValueError`` for a non-loopback host without *allow_remote*, or
+    when no usable key is available.
+    """
+    from multiprocessing import AuthenticationError
+    from multiprocessing.connection import Listener
+
+    from rich.console import Console
+
+    if not allow_remote and not _is_loopback(address[0]):
+        raise ValueError(f"Refusing to listen on non-loopback host {address[0]!r} without --allow-remote")
+    authkey = _authkey(create=True)
+
+    loaded = _LoadedDataset(path.resolve())
+    loaded.get()
+    with Listener(address, authkey=authkey) as listener:
+        log(f"Serving {loaded.path} on {address[0]}:{address[1]}")
+        while True:
+            try:
+                conn = listener.accept()
+            except (AuthenticationError, OSError, EOFError):
+                continue  # failed handshake, e.g. wrong authkey
+            with conn:
+                try:
+                    request = conn.recv()
+                    if Path(request["path"]).resolve() != loaded.path:
+                        raise ValueError(f"This server serves {loaded.path}, not {request['path']}")
+                    buffer = io.StringIO()
+                    console = Console(file=buffer, width=request.get("width", 100), force_terminal=request.get("tty"))
+                    run_query(loaded.get(), request, console, buffer)
+                    conn.send((True, buffer.getvalue()))
+                except (EOFError, OSError):
+                    continue
+                except Exception as exc:  # Reported to the client, the server keeps running
+                    conn.send((False, str(exc)))
+
+
+__all__ = ["AUTHKEY_FILE", "QUERY_COMMANDS", "parse_address", "query", "run_query", "serve"]
@@ -0,0 +1,81 @@
+"""In-memory store shared by the stages of one pipeline run."""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+import pandas as pd
+
+
+class PriceRepository:
+    """Price data for one run, parsed at most once and written through to disk.
+
+    The cleaned/imputed CSVs (``date`` plus numeric columns) and JSON exports
+    are cached by path on first read. Writes go to disk and into the cache
+    together, so a later stage reads what an earlier one wrote without reading
+    the file back. The cached copy is parsed from the text that was written,
+    so it matches a disk read exactly (``to_csv`` output does not always
+    round-trip through ``read_csv``'s default float parser). Observed DA
+    prices are loaded from the daily PDFs on first use.
+
+    ``daily_price_sync`` passes one repository through every stage; a stage
+    called without one creates its own, which behaves like reading the files.
+    """
+
+    def __init__(self) -> None:
+        self._csv: Dict[str, pd.DataFrame] = {}
+        self._json: Dict[str, object] = {}
+        self._observed: Optional[pd.DataFrame] = None
+
+    def read_csv(self, path: Path | str) -> pd.DataFrame:
+        """The CSV at *path* with ``date`` parsed; callers get their own copy."""
+
+        key = _key(path)
+        frame = self._csv.get(key)
+        if frame is None:
+            frame = pd.read_csv(path, parse_dates=["date"])
+            self._csv[key] = frame
+        return frame.copy()
+
+    def write_csv(self, path: Path | str, frame: pd.DataFrame) -> None:
+        text = frame.to_csv(index=False)
+        with Path(path).open("w", encoding="utf-8", newline="") as stream:
+            stream.write(text)
+        self._csv[_key(path)] = pd.read_csv(io.StringIO(text), parse_dates=["date"])
+
+    def read_json(self, path: Path | str) -> object:
+        key = _key(path)
+        if key not in self._json:
+            self._json[key] = json.loads(Path(path).read_text(encoding="utf-8"))
+        return self._json[key]
+
+    def write_json(self, path: Path | str, payload: object, *, indent: Optional[int] = None) -> None:
+        text = json.dumps(payload, indent=indent)
+        Path(path).write_text(text, encoding="utf-8")
+        self._json[_key(path)] = json.loads(text)  # e.g. tuples come back as lists, int keys as strings
+
+    def observed(self) -> pd.DataFrame:
+        """DA daily index prices per item and date, parsed once per run."""
+
+        if self._observed is None:
+            from .impute_prices import _load_daily_index_records
+
+            self._observed = _load_daily_index_records()
+        return self._observed.copy()
+
+    def reload_observed(self) -> pd.DataFrame:
+        """Re-read the daily PDFs; only new or changed files are parsed again."""
+
+        self._observed = None
+        return self.observed()
+
+
+def _key(path: Path | str) -> str:
+    return os.path.abspath(path)
+
+
+__all__ = ["PriceRepository"]
@@ -0,0 +1,119 @@
+"""Binary columnar snapshots kept next to slow-to-parse source files."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+
+
+_HASH_CHUNK_BYTES = 1 << 20
+
+
+def snapshot_paths(source: Path, kind: str = "") -> tuple[Path, Path]:
+    """Return the ``(data, metadata)`` sidecar paths for *source*.
+
+    *kind* distinguishes several snapshots derived from the same source.
+    """
+
+    stem = f".{source.name}.{kind}" if kind else f".{source.name}"
+    return (
+        source.with_name(f"{stem}.feather"),
+        source.with_name(f"{stem}.snapshot.json"),
+    )
+
+
+def read_snapshot(source: Path, kind: str = "") -> Optional[pd.DataFrame]:
+    """Return the snapshot of *source* if it still matches the file, else ``None``.
+
+    A matching size and modification time is trusted as is. When only the
+    modification time moved (e.g. the file was copied or touched), the content
+    hash decides, and a match refreshes the stored timestamp.
+    """
+
+    data_path, meta_path = snapshot_paths(source, kind)
+    if not data_path.exists() or not meta_path.exists():
+        return None
+
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        stat = source.stat()
+    except (OSError, json.JSONDecodeError):
+        return None
+
+    if meta.get("size") != stat.st_size:
+        return None
+    if meta.get("mtime_ns") != stat.st_mtime_ns:
+        if meta.get("sha256") != _file_hash(source):
+            return None
+        meta["mtime_ns"] = stat.st_mtime_ns
+        _write_meta(meta_path, meta)
+
+    try:
+        return pd.read_feather(data_path)
+    except (ImportError, OSError, ValueError):
+        return None  # pyarrow missing or unreadable snapshot; reparse the source
+
+
+def source_signature(source: Path) -> Optional[dict]:
+    """Size, modification time and content hash of *source*, or ``None`` if unreadable.
+
+    Take it *before* parsing the source and pass it to :func:`write_snapshot`,
+    so a file replaced mid-parse is not recorded as matching the old rows.
+    """
+
+    try:
+        stat = source.stat()
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": _file_hash(source)}
+    except OSError:
+        return None
+
+
+def write_snapshot(source: Path, frame: pd.DataFrame, kind: str = "", *, signature: Optional[dict] = None) -> bool:
+    """Store *frame* as the snapshot of *source*; returns ``False`` if it could not be written.
+
+    *signature* describes the source as it was when *frame* was read from it
+    (see :func:`source_signature`); without it the source is described as it
+    is now. If the source no longer matches once the snapshot is written, the
+    snapshot is discarded.
+    """
+
+    data_path, meta_path = snapshot_paths(source, kind)
+    tmp_path = data_path.with_name(data_path.name + ".tmp")
+    signature = signature or source_signature(source)
+    if signature is None:
+        return False
+    try:
+        frame.reset_index(drop=True).to_feather(tmp_path)
+        os.replace(tmp_path, data_path)
+        _write_meta(meta_path, signature)
+        stat = source.stat()
+    except (ImportError, OSError, ValueError):
+        tmp_path.unlink(missing_ok=True)
+        return False
+    if (stat.st_size, stat.st_mtime_ns) != (signature["size"], signature["mtime_ns"]):
+        meta_path.unlink(missing_ok=True)  # the source changed while it was parsed
+        data_path.unlink(missing_ok=True)
+        return False
+    return True
+
+
+def _write_meta(meta_path: Path, meta: dict) -> None:
+    tmp_path = meta_path.with_name(meta_path.name + ".tmp")
+    tmp_path.write_text(json.dumps(meta), encoding="utf-8")
+    os.replace(tmp_path, meta_path)
+
+
+def _file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as stream:
+        for chunk in iter(lambda: stream.read(_HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+__all__ = ["read_snapshot", "snapshot_paths", "source_signature", "write_snapshot"]
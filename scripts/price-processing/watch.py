@@ -0,0 +1,272 @@
+"""
+Keep the pipeline warm and republish whenever its inputs change.
+
+The watcher polls ``DA_DAILY_DIR`` and ``RAW_WORKBOOK``. It keeps the cleaned
+workbook rows, the parsed PDF observations, the imputed rows, the latest
+forecast per item and each item's seasonal tables in memory.
+
+* A new, changed or removed PDF is parsed on its own (the parse cache covers
+  the rest). Only items whose observations changed are re-imputed and
+  re-forecast, unless the latest observed date moved; that shifts the future
+  cutoff for every item, so every item is rewritten and re-forecast (imputation
+  is still limited to the changed items). Re-forecasting only adds the newly
+  appended days to an item's seasonal tables; they are rebuilt for an item
+  whose earlier prices changed.
+* A changed workbook triggers a full rebuild.
+
+Each update rewrites the cleaned CSVs, ``prices.json``, ``forecasts.json`` and
+``current_prices.json``, then bumps ``PUBLISH_MARKER`` so running APIs
+reload. A file is only picked up once its size and modification time are
+unchanged for one poll, so half-downloaded PDFs are not parsed.
+
+Usage
+-----
+    python -m src.price_manager.watch
+
+Pair it with ``daily_price_sync --download-only`` on a schedule.
+
+Options
+-------
+    --interval SECONDS   Poll interval. Defaults to 2.
+    --model TYPE         Forecast model, as in ``forecast``. Defaults to
+                         seasonal_trend.
+    --shard              Also publish per-item mobile JSON shards.
+    --once               Build once and exit instead of watching.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import traceback
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+import pandas as pd
+
+from .clean_workbook import RAW_WORKBOOK, _safe_folder_name, clean_workbook
+from .export_current_prices import export_current_prices
+from .forecast import (
+    HORIZON_DAYS,
+    MODEL_TYPES,
+    ForecastResult,
+    _SeasonalHistory,
+    _write_mobile_forecast_json,
+    _write_summary_csv,
+    iter_forecasts,
+)
+from .impute_prices import (
+    DA_DAILY_DIR,
+    _apply_future_cutoff,
+    _build_dataset,
+    _export_mobile_json,
+    _impute_items,
+    _write_clean_csvs,
+)
+from .price_api import publish_version
+from .repository import PriceRepository
+
+
+POLL_SECONDS = 2.0
+
+_Signature = Tuple[Tuple[str, int, int], ...]
+
+
+class PriceWatcher:
+    """Warm pipeline state plus the file signatures it was built from."""
+
+    def __init__(self, *, model_type: str = "seasonal_trend", shard: bool = False) -> None:
+        self.model_type = model_type
+        self.shard = shard
+        self.repository = PriceRepository()
+        self.exports: Dict[str, Dict[str, Path]] = {}
+        self.combined: Optional[pd.DataFrame] = None
+        self.observed: Optional[pd.DataFrame] = None
+        self.uncut: Optional[pd.DataFrame] = None  # imputed rows before the future cutoff
+        self.forecasts: Dict[str, ForecastResult] = {}
+        self.histories: Dict[str, _SeasonalHistory] = {}  # seasonal tables per item folder
+        self._built: Tuple[Optional[_Signature], Optional[_Signature]] = (None, None)
+        self._pending: Tuple[Optional[_Signature], Optional[_Signature]] = (None, None)
+        self._failed: Optional[Tuple[Optional[_Signature], Optional[_Signature]]] = None
+
+    def poll(self) -> Optional[str]:
+        """Apply any settled change; returns a description of what was done."""
+
+        current = (_signature([RAW_WORKBOOK]), _pdf_signature())
+        settled, self._pending = current == self._pending, current
+        if not settled or current in (self._built, self._failed):
+            return None  # a failing input is retried only once it changes again
+
+        try:
+            if current[0] != self._built[0] or self.uncut is None:
+                outcome = self.rebuild()
+            else:
+                outcome = self.apply_pdfs()
+        except Exception:
+            self._failed = current
+            raise
+        self._built, self._failed = current, None
+        return outcome
+
+    def rebuild(self) -> str:
+        start = time.perf_counter()
+        repository = PriceRepository()
+        exports = clean_workbook(repository=repository)
+        combined = _build_dataset(exports, repository)
+        if combined.empty:
+            raise ValueError("No price observations were found to impute.")
+        observed = repository.observed()
+        uncut = _sorted(_impute_items(combined, observed))
+        histories: Dict[str, _SeasonalHistory] = {}
+        forecasts = self._publish(repository, exports, uncut, observed, {}, None, histories)
+
+        self.repository, self.exports, self.combined = repository, exports, combined
+        self.observed, self.uncut, self.forecasts = observed, uncut, forecasts
+        self.histories = histories
+        return f"rebuilt {len(exports)} items in {time.perf_counter() - start:.1f}s"
+
+    def apply_pdfs(self) -> str:
+        """Re-impute and republish the items whose PDF observations changed.
+
+        The warm state is only replaced once everything was published, so a
+        failed update is diffed against the last good state again next time.
+        The seasonal tables are the exception: they are extended in place, as
+        each entry is checked against the series it is reused for.
+        """
+
+        start = time.perf_counter()
+        observed = self.repository.reload_observed()
+        changed = _changed_items(self.observed, observed)
+        if not changed:
+            self.observed = observed
+            return "PDFs changed without new prices"
+
+        subset = self.combined[self.combined["item"].isin(changed)]
+        changed_observed = observed[observed["item"].isin(changed)]
+        kept = self.uncut[~self.uncut["item"].isin(changed)]
+        if subset.empty and changed_observed.empty:
+            uncut = kept
+        else:
+            uncut = _sorted(pd.concat([kept, _impute_items(subset, changed_observed)], ignore_index=True))
+
+        cutoff_moved = _latest_date(self.observed) != _latest_date(observed)
+        forecasts = self._publish(
+            self.repository,
+            self.exports,
+            uncut,
+            observed,
+            self.forecasts,
+            None if cutoff_moved else changed,
+            self.histories,
+        )
+
+        self.observed, self.uncut, self.forecasts = observed, uncut, forecasts
+        return (
+            f"re-imputed {len(changed)} items"
+            f"{' (latest date moved; all items republished)' if cutoff_moved else ''}"
+            f" in {time.perf_counter() - start:.1f}s"
+        )
+
+    def _publish(
+        self,
+        repository: PriceRepository,
+        exports: Dict[str, Dict[str, Path]],
+        uncut: pd.DataFrame,
+        observed: pd.DataFrame,
+        forecasts: Dict[str, ForecastResult],
+        items: Optional[Set[str]],
+        histories: Dict[str, _SeasonalHistory],
+    ) -> Dict[str, ForecastResult]:
+        """Write outputs for *items* (all when ``None``) and the full mobile payloads.
+
+        Returns *forecasts* updated with the new results, leaving *forecasts* itself untouched.
+        """
+
+        imputed = _apply_future_cutoff(uncut, observed)
+        selected = exports if items is None else {item: exports[item] for item in items if item in exports}
+        _write_clean_csvs(imputed, selected, repository)
+        _export_mobile_json(imputed, shard=self.shard, repository=repository)
+
+        forecasts = dict(forecasts)
+        folders = None if items is None else {_safe_folder_name(item) for item in items}
+        for result in iter_forecasts(
+            model_type=self.model_type, repository=repository, items=folders, histories=histories
+        ):
+            forecasts[result.item] = result
+        results = [forecasts[item] for item in sorted(forecasts)]  # directory order, as a full run
+        _write_mobile_forecast_json(results, HORIZON_DAYS, shard=self.shard)
+        if results:
+            _write_summary_csv(results)
+
+        export_current_prices(shard=self.shard, repository=repository)
+        publish_version()
+        return forecasts
+
+    def run_forever(self, interval: float = POLL_SECONDS) -> None:
+        import pdfplumber  # noqa: F401  # imported now rather than when the first PDF lands
+
+        print(f"Watching '{DA_DAILY_DIR}' and '{RAW_WORKBOOK}' every {interval:g}s...", flush=True)
+        while True:
+            try:
+                outcome = self.poll()
+            except Exception:  # keep the last good state; the next change to the inputs retries
+                traceback.print_exc()
+            else:
+                if outcome:
+                    print(f"[{time.strftime('%H:%M:%S')}] {outcome}", flush=True)
+            time.sleep(interval)
+
+
+def _signature(paths: Iterable[Path]) -> _Signature:
+    entries = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((path.name, stat.st_size, stat.st_mtime_ns))
+    return tuple(entries)
+
+
+def _pdf_signature() -> _Signature:
+    return _signature(sorted(DA_DAILY_DIR.glob("*.pdf"))) if DA_DAILY_DIR.exists() else ()
+
+
+def _changed_items(previous: Optional[pd.DataFrame], current: pd.DataFrame) -> Set[str]:
+    if previous is None or previous.empty:
+        return set(current["item"].astype(str))
+    merged = previous.merge(current, on=["item", "date"], how="outer", suffixes=("_old", "_new"), indicator=True)
+    differs = (merged["_merge"] != "both") | (merged["price_old"] != merged["price_new"])
+    return set(merged.loc[differs, "item"].astype(str))
+
+
+def _latest_date(observed: Optional[pd.DataFrame]) -> Optional[pd.Timestamp]:
+    if observed is None or observed.empty:
+        return None
+    return observed["date"].max()
+
+
+def _sorted(imputed: pd.DataFrame) -> pd.DataFrame:
+    return imputed.sort_values(by=["item", "year", "date"]).reset_index(drop=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--interval", type=float, default=POLL_SECONDS, help="Poll interval in seconds.")
+    parser.add_argument("--model", choices=MODEL_TYPES, default="seasonal_trend", help="Forecast model.")
+    parser.add_argument("--shard", action="store_true", help="Also publish per-item mobile JSON shards.")
+    parser.add_argument("--once", action="store_true", help="Build once and exit.")
+    args = parser.parse_args()
+
+    watcher = PriceWatcher(model_type=args.model, shard=args.shard)
+    if args.once:
+        print(watcher.rebuild(), flush=True)
+        return
+    watcher.run_forever(args.interval)
+
+
+if __name__ == "__main__":
+    main()
+
+
+__all__ = ["PriceWatcher", "main"]